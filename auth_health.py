@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Auth service health monitor for Bulk Customer Import
+Checks the authentication service on its own schedule so workers only read the result
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import logging
+
+# Error fragments that mean the auth service itself is unavailable (not bad credentials)
+SERVICE_DOWN_MARKERS = ('503', '502', '504', 'service unavailable', 'bad gateway', 'timeout', 'network error')
+
+
+def is_service_down_error(error: str) -> bool:
+    """Whether an authentication error means the auth service is unavailable"""
+    error = (error or "").lower()
+    return any(marker in error for marker in SERVICE_DOWN_MARKERS)
+
+
+class AuthHealthMonitor:
+    """
+    Background health monitor for the authentication service
+
+    A single thread runs probe() every interval seconds while healthy and every
+    recovery_interval seconds while degraded or down. Workers never probe; they read
+    state (a plain attribute, replaced atomically) and may report_failure() when a
+    token request fails, which switches the state at once and brings the next probe
+    forward. on_change(old_state, new_state, message) is called on every transition.
+
+    probe() returns a dict with 'healthy' and, for failures, 'error'.
+    """
+
+    HEALTHY = "healthy"
+    DEGRADED = "degraded"
+    DOWN = "down"
+
+    def __init__(self,
+                 probe: Callable[[], Dict[str, Any]],
+                 interval: float = 300.0,
+                 recovery_interval: float = 15.0,
+                 on_change=None):
+        """
+        Initialize the monitor (the thread starts with start())
+
+        Args:
+            probe: Checks the auth service and returns {'healthy': bool, 'error': str}
+            interval: Seconds between checks while healthy
+            recovery_interval: Seconds between checks while degraded or down
+            on_change: Optional callback(old_state, new_state, message)
+        """
+        self.probe = probe
+        self.interval = interval
+        self.recovery_interval = recovery_interval
+        self.on_change = on_change
+        self.logger = logging.getLogger(__name__)
+
+        self.state = self.HEALTHY
+        self.last_error: Optional[str] = None
+        self.last_check: Optional[float] = None
+        self.checks = 0
+        self._up = threading.Event()
+        self._up.set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _transition(self, state: str, message: str) -> None:
+        with self._lock:
+            old_state = self.state
+            if state == old_state:
+                return
+            self.state = state
+            if state == self.DOWN:
+                self._up.clear()
+            else:
+                self._up.set()
+        if self.on_change:
+            try:
+                self.on_change(old_state, state, message)
+            except Exception as e:
+                self.logger.warning(f"[AUTH HEALTH] State change callback failed: {e}")
+
+    def report_failure(self, error: str) -> None:
+        """Record a failed token request seen by a worker"""
+        self.last_error = error
+        self._transition(self.DOWN if is_service_down_error(error) else self.DEGRADED, error)
+        self._wake.set()
+
+    def check(self) -> str:
+        """Run the probe once and update the state"""
+        try:
+            result = self.probe()
+        except Exception as e:
+            result = {'healthy': False, 'error': str(e)}
+        self.checks += 1
+        self.last_check = time.time()
+
+        if result.get('healthy'):
+            self.last_error = None
+            self._transition(self.HEALTHY, result.get('message', 'Auth service is healthy'))
+        else:
+            error = result.get('error', 'unknown error')
+            self.last_error = error
+            self._transition(self.DOWN if is_service_down_error(error) else self.DEGRADED, error)
+        return self.state
+
+    def wait_until_up(self, timeout: Optional[float] = None) -> bool:
+        """Wait while the service is down; returns False if the timeout expired first"""
+        return self._up.wait(timeout)
+
+    def _run(self) -> None:
+        next_check = time.monotonic() + self.interval
+        while not self._stop.is_set():
+            if self._wake.wait(max(0.0, next_check - time.monotonic())):
+                self._wake.clear()
+                # A worker reported a failure - bring the check forward; further reports never push it back
+                next_check = min(next_check, time.monotonic() + self.recovery_interval)
+            if self._stop.is_set():
+                break
+            if time.monotonic() >= next_check:
+                self.check()
+                next_check = time.monotonic() + (self.interval if self.state == self.HEALTHY else self.recovery_interval)
+
+    def start(self) -> None:
+        """Start the checking thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="auth-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the checking thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Monitor state for progress reporting"""
+        return {
+            'state': self.state,
+            'last_error': self.last_error,
+            'last_check': self.last_check,
+            'checks': self.checks
+        }
@@ -10,11 +10,20 @@ import time
 import base64
 import threading
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import logging
+from token_cache import TokenCache
 
 class AuthenticationManager:
-    """Manages OAuth2 authentication with automatic token refresh"""
+    """
+    Manages OAuth2 authentication with automatic token refresh
+
+    The token and its expiry are published together as one tuple, so get_valid_token()
+    reads them without a lock. token_lock only guards refreshes (single flight). With
+    start_background_refresh() a thread renews the token refresh_buffer_seconds before
+    expiry while readers keep getting the current one; readers only wait for a refresh
+    when there is no token left with at least min_valid_seconds to live.
+    """
     
     def __init__(self,
                  mode: str = "C4R",  # "C4R" or "Engage"
@@ -24,7 +33,10 @@ class AuthenticationManager:
                  gk_passport: str = "1.1:CiMg46zV+88yKOOMxZPwMjIDMDAxOg5idXNpbmVzc1VuaXRJZBIKCAISBnVzZXJJZBoSCAIaCGNsaWVudElkIgR3c0lkIhoaGGI6Y3VzdC5jdXN0b21lci5pbXBvcnRlcg==",
                  auth_url: str = None,
                  basic_auth: str = "bGF1bmNocGFkOk5iV295MWxES3Y4N1JBQXdOUHJF",
-                 client_id: str = None):
+                 client_id: str = None,
+                 session_provider=None,
+                 token_cache: bool = False,
+                 token_cache_path: str = None):
         """
         Initialize the authentication manager
         
@@ -37,6 +49,10 @@ class AuthenticationManager:
             auth_url: OAuth token endpoint URL (optional, defaults based on mode)
             basic_auth: Base64 encoded basic auth credentials (C4R only)
             client_id: Client ID for Engage mode
+            session_provider: Optional callable returning a requests.Session to reuse
+                              pooled keep-alive connections for token requests
+            token_cache: Reuse tokens across runs and processes through an on-disk cache
+            token_cache_path: Cache file (defaults to ~/.customer_import/token_cache.json)
         """
         self.mode = mode.upper()
         self.environment = environment.lower()
@@ -66,20 +82,53 @@ class AuthenticationManager:
         else:
             raise ValueError(f"Invalid mode: {mode}. Must be 'C4R' or 'Engage'")
         
-        # Token management
-        self.current_token: Optional[str] = None
-        self.token_expires_at: Optional[datetime] = None
+        # HTTP session source (falls back to module-level requests)
+        self.session_provider = session_provider
+
+        # Token management - (token, expires_at) replaced as a whole; token_lock is held only while refreshing
+        self._token_state: Tuple[Optional[str], Optional[datetime]] = (None, None)
         self.token_lock = threading.Lock()
         
         # Buffer time before token expiry (refresh 50 minutes early = every 10 minutes)
         self.refresh_buffer_seconds = 3000
+
+        # Background refresh: readers keep the current token until it has less than
+        # min_valid_seconds left; failed or back-to-back refreshes wait refresh_retry_seconds
+        self.min_valid_seconds = 60
+        self.refresh_retry_seconds = 30
+        self.last_refresh_error: Optional[str] = None
+        self._last_refresh_attempt: Optional[float] = None
+        self._refresh_wake = threading.Event()
+        self._refresh_stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
         
+        # Optional on-disk token cache shared by runs and processes using the same credentials
+        self.token_cache = TokenCache(token_cache_path) if token_cache else None
+        self.token_cache_key = TokenCache.make_key(self.mode, self.environment, self.auth_url, self.username,
+                                                   client_id=self.client_id, password=self.password,
+                                                   basic_auth=self.basic_auth)
+
         # Setup logging
         self.logger = logging.getLogger(__name__)
         
+    @property
+    def current_token(self) -> Optional[str]:
+        return self._token_state[0]
+
+    @property
+    def token_expires_at(self) -> Optional[datetime]:
+        return self._token_state[1]
+
+    def _publish_token(self, token: Optional[str], expires_at: Optional[datetime]) -> None:
+        """Replace token and expiry in one assignment (readers see the old pair or the new one)"""
+        self._token_state = (token, expires_at)
+
     def get_valid_token(self) -> str:
         """
         Get a valid authentication token, refreshing if necessary
+
+        Without a lock while the current token is usable; otherwise waits for the
+        (single) refresh in progress or runs it.
         
         Returns:
             Valid authentication token
@@ -87,25 +136,142 @@ class AuthenticationManager:
         Raises:
             Exception: If token refresh fails
         """
+        token = self._usable_token()
+        if token:
+            return token
+
         with self.token_lock:
-            # Check if we need a new token
-            if self._needs_refresh():
-                self._refresh_token()
+            # Another thread may have refreshed while we waited
+            token = self._usable_token()
+            if token:
+                return token
+            self._refresh()
             
             if not self.current_token:
                 raise Exception("Failed to obtain authentication token")
                 
             return self.current_token
+
+    def _usable_token(self) -> Optional[str]:
+        """The current token if readers may use it without refreshing first"""
+        token, expires_at = self._token_state
+        if not token or not expires_at:
+            return None
+        if not self._expires_within(expires_at, self.refresh_buffer_seconds):
+            return token
+        # Due for renewal - the background refresher renews it while readers keep using it
+        if self.background_refresh_running and not self._expires_within(expires_at, self.min_valid_seconds):
+            return token
+        return None
+
+    @staticmethod
+    def _expires_within(expires_at: datetime, seconds: float) -> bool:
+        return datetime.now() + timedelta(seconds=seconds) >= expires_at
     
     def _needs_refresh(self) -> bool:
         """Check if token needs to be refreshed"""
-        if not self.current_token or not self.token_expires_at:
+        token, expires_at = self._token_state
+        if not token or not expires_at:
             return True
             
         # Refresh if token expires within buffer time
-        buffer_time = datetime.now() + timedelta(seconds=self.refresh_buffer_seconds)
-        return buffer_time >= self.token_expires_at
+        return self._expires_within(expires_at, self.refresh_buffer_seconds)
+
+    def _refresh(self, force: bool = False, rejected_token: Optional[str] = None) -> None:
+        """Get a new token through the disk cache when enabled (token_lock held)"""
+        if self.token_cache:
+            self._refresh_token_cached(force=force, rejected_token=rejected_token)
+        else:
+            self._refresh_token()
+
+    @property
+    def background_refresh_running(self) -> bool:
+        """Whether the background refresher thread is running"""
+        return self._refresher is not None and self._refresher.is_alive()
+
+    def _seconds_until_refresh(self) -> float:
+        token, expires_at = self._token_state
+        wait = 0.0
+        if token and expires_at:
+            wait = (expires_at - datetime.now()).total_seconds() - self.refresh_buffer_seconds
+        if self._last_refresh_attempt is not None:
+            # Never refresh more often than refresh_retry_seconds (failures, short-lived tokens)
+            wait = max(wait, self._last_refresh_attempt + self.refresh_retry_seconds - time.monotonic())
+        return max(0.0, wait)
+
+    def _background_refresh(self) -> None:
+        """One refresh attempt by the refresher; the current token stays in place if it fails"""
+        with self.token_lock:
+            if not self._needs_refresh():
+                return
+            self._last_refresh_attempt = time.monotonic()
+            try:
+                self._refresh()
+                self.last_refresh_error = None
+            except Exception as e:
+                self.last_refresh_error = str(e)
+                self.logger.warning(f"[AUTH] Background token refresh failed - keeping the current token, "
+                                    f"retrying in {self.refresh_retry_seconds:g}s: {e}")
+
+    def _run_refresher(self) -> None:
+        while not self._refresh_stop.is_set():
+            wait = self._seconds_until_refresh()
+            woken = self._refresh_wake.wait(wait) if wait > 0 else False
+            self._refresh_wake.clear()
+            if self._refresh_stop.is_set():
+                break
+            if woken:
+                # The token was replaced (e.g. force_refresh) - re-plan the wait
+                continue
+            self._background_refresh()
+
+    def start_background_refresh(self) -> None:
+        """Start renewing the token ahead of expiry on a background thread"""
+        if self.background_refresh_running:
+            return
+        self._refresh_stop.clear()
+        self._refresh_wake.clear()
+        self._refresher = threading.Thread(target=self._run_refresher, name="token-refresh", daemon=True)
+        self._refresher.start()
+        self.logger.info(f"[AUTH] Background token refresh started ({self.refresh_buffer_seconds}s before expiry)")
+
+    def stop_background_refresh(self) -> None:
+        """Stop the background refresher (a refresh in progress finishes first)"""
+        self._refresh_stop.set()
+        self._refresh_wake.set()
+        if self._refresher:
+            self._refresher.join(timeout=35)
+            self._refresher = None
     
+    def _refresh_token_cached(self, force: bool = False, rejected_token: Optional[str] = None) -> None:
+        """
+        Take a still-fresh token from the disk cache, or refresh and store it
+
+        The cache lock is held across the refresh so parallel processes wait for one
+        token request and then reuse its result. If the lock cannot be taken within the
+        cache's lock_timeout the token is refreshed without touching the cache.
+
+        Args:
+            force: The current token was rejected - drop it from the cache before refreshing
+            rejected_token: The rejected token; a different one another process cached
+                            meanwhile is reused instead of requesting yet another
+        """
+        with self.token_cache.locked() as acquired:
+            if not acquired:
+                self._refresh_token()
+                return
+            if force:
+                # Later runs and other processes must not pick the rejected token up again
+                self.token_cache.remove(self.token_cache_key, access_token=rejected_token)
+            cached = self.token_cache.get(self.token_cache_key, min_valid_seconds=self.refresh_buffer_seconds)
+            if cached:
+                self._publish_token(cached['access_token'], datetime.fromtimestamp(cached['expires_at']))
+                self.logger.info(f"[AUTH] Reusing cached token from {self.token_cache.path}. Expires at: {self.token_expires_at}")
+                return
+
+            self._refresh_token()
+            self.token_cache.put(self.token_cache_key, self.current_token, self.token_expires_at.timestamp())
+
     def _refresh_token(self) -> None:
         """Refresh the authentication token"""
         try:
@@ -133,7 +299,8 @@ class AuthenticationManager:
                     'client_id': self.client_id
                 }
             
-            response = requests.post(
+            http = self.session_provider() if self.session_provider else requests
+            response = http.post(
                 self.auth_url,
                 headers=headers,
                 data=data,
@@ -143,11 +310,10 @@ class AuthenticationManager:
             if response.status_code == 200:
                 token_data = response.json()
                 
-                self.current_token = token_data.get('access_token')
                 expires_in = token_data.get('expires_in', 3600)  # Default 1 hour
                 
-                # Calculate expiration time
-                self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+                # Calculate expiration time; readers switch to the new token in one step
+                self._publish_token(token_data.get('access_token'), datetime.now() + timedelta(seconds=expires_in))
                 
                 self.logger.info(f"[AUTH] Token refreshed successfully. Expires at: {self.token_expires_at}")
                 
@@ -219,34 +385,46 @@ class AuthenticationManager:
         Returns:
             Dictionary with token information
         """
-        with self.token_lock:
-            if not self.current_token:
-                return {
-                    'has_token': False,
-                    'message': 'No token available'
-                }
-            
-            time_until_expiry = None
-            needs_refresh = self._needs_refresh()
-            
-            if self.token_expires_at:
-                time_until_expiry = (self.token_expires_at - datetime.now()).total_seconds()
-            
+        token, expires_at = self._token_state
+        if not token:
             return {
-                'has_token': True,
-                'token_preview': f"{self.current_token[:20]}...",
-                'expires_at': self.token_expires_at.isoformat() if self.token_expires_at else None,
-                'time_until_expiry_seconds': time_until_expiry,
-                'needs_refresh': needs_refresh,
-                'refresh_buffer_seconds': self.refresh_buffer_seconds
+                'has_token': False,
+                'message': 'No token available'
             }
+        
+        time_until_expiry = None
+        needs_refresh = self._needs_refresh()
+        
+        if expires_at:
+            time_until_expiry = (expires_at - datetime.now()).total_seconds()
+        
+        return {
+            'has_token': True,
+            'token_preview': f"{token[:20]}...",
+            'expires_at': expires_at.isoformat() if expires_at else None,
+            'time_until_expiry_seconds': time_until_expiry,
+            'needs_refresh': needs_refresh,
+            'refresh_buffer_seconds': self.refresh_buffer_seconds,
+            'background_refresh': self.background_refresh_running,
+            'last_refresh_error': self.last_refresh_error
+        }
     
-    def force_refresh(self) -> None:
-        """Force an immediate token refresh"""
+    def force_refresh(self, rejected_token: Optional[str] = None) -> None:
+        """
+        Force an immediate token refresh
+
+        Args:
+            rejected_token: The token the API rejected; if another thread already replaced
+                            it, nothing is refreshed (callers hitting the same 401 share one refresh)
+        """
         with self.token_lock:
-            self.current_token = None
-            self.token_expires_at = None
-            self._refresh_token()
+            if rejected_token and self.current_token and self.current_token != rejected_token:
+                return
+            rejected_token = rejected_token or self.current_token
+            # The token was rejected - readers wait for the new one instead of reusing it
+            self._publish_token(None, None)
+            self._refresh(force=True, rejected_token=rejected_token)
+        self._refresh_wake.set()
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Batch identity index for Bulk Customer Import
+Resolves API failure results back to the original batch records in O(1)
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_DIGITS = re.compile(r'\d+')
+
+# Swedish personal numbers are 12 digits (YYYYMMDDNNNN) or 10 digits (YYMMDDNNNN)
+_PERSONAL_NUMBER_LENGTHS = (12, 10)
+
+
+def _digits(value: Any) -> str:
+    return "".join(_DIGITS.findall(str(value)))
+
+
+class BatchIdentityIndex:
+    """
+    Lookup tables from every identifying key of a batch to its record
+
+    Built once per batch. Customers are keyed by customerId, every card number
+    ('number' or 'cardNumber'), digits-only personalNumber and "FIRST LAST" name;
+    households by householdId. The first record wins when a key repeats.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], import_type: str = "customers"):
+        self.records = records
+        self.import_type = import_type
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_card: Dict[str, Dict[str, Any]] = {}
+        self.by_personal_number: Dict[str, Dict[str, Any]] = {}
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            if import_type == "households":
+                household_id = record.get('householdId')
+                if household_id is not None:
+                    self.by_id.setdefault(str(household_id), record)
+                continue
+
+            person = record.get('person', record)
+            if not isinstance(person, dict):
+                continue
+            customer_id = person.get('customerId')
+            if customer_id is not None:
+                self.by_id.setdefault(str(customer_id), record)
+
+            for card in person.get('customerCards') or []:
+                if isinstance(card, dict):
+                    card_number = card.get('number') or card.get('cardNumber')
+                    if card_number:
+                        self.by_card.setdefault(str(card_number), record)
+
+            personal_number = person.get('personalNumber')
+            if personal_number:
+                digits = _digits(personal_number)
+                if digits:
+                    self.by_personal_number.setdefault(digits, record)
+                    if len(digits) == 12:
+                        # Also reachable through the 10 digit form
+                        self.by_personal_number.setdefault(digits[2:], record)
+
+            first_name = person.get('firstName')
+            last_name = person.get('lastName')
+            if first_name and last_name:
+                self.by_name.setdefault(f"{first_name} {last_name}".upper(), record)
+
+    @property
+    def id_key(self) -> str:
+        return 'householdId' if self.import_type == "households" else 'customerId'
+
+    def _match_personal_number(self, username: str) -> Optional[Dict[str, Any]]:
+        # Usernames embed the personal number, e.g. "ANNA ANDERSSON-199001151234";
+        # digit runs may be split by dashes or glued to digits in the name
+        runs = _DIGITS.findall(username) + _DIGITS.findall(username.replace('-', ''))
+        for run in runs:
+            for candidate in (run,) + tuple(run[-length:] for length in _PERSONAL_NUMBER_LENGTHS if len(run) > length):
+                record = self.by_personal_number.get(candidate)
+                if record is not None:
+                    return record
+        return None
+
+    def _match_name(self, username: str) -> Optional[Dict[str, Any]]:
+        name = username.upper()
+        record = self.by_name.get(name)
+        if record is None and '-' in name:
+            record = self.by_name.get(name.split('-', 1)[0].strip())
+        return record
+
+    def match(self, identifier: Any = None, username: Optional[str] = None,
+              use_personal_number: bool = True, use_name: bool = False) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Find the record for an API result
+
+        Args:
+            identifier: customerId/householdId (or card number) reported by the API
+            username: Username reported by the API
+            use_personal_number: Also match the personal number embedded in username
+            use_name: Also match a "FIRST LAST" prefix of username
+
+        Returns:
+            (record, matched_by) where matched_by names the key that matched, or (None, None)
+        """
+        if identifier is not None:
+            key = str(identifier)
+            record = self.by_id.get(key)
+            if record is not None:
+                return record, self.id_key
+            record = self.by_card.get(key)
+            if record is not None:
+                return record, 'cardNumber'
+
+        if username and self.import_type != "households":
+            if use_personal_number:
+                record = self._match_personal_number(username)
+                if record is not None:
+                    return record, 'personalNumber'
+            if use_name:
+                record = self._match_name(username)
+                if record is not None:
+                    return record, 'name'
+
+        return None, None
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Batch prefetch pipeline for Bulk Customer Import
+Reads and encodes batches ahead of the network workers
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterator, Optional, Tuple
+import logging
+
+_END = object()
+
+
+class BatchPrefetcher:
+    """
+    Producer stage between the batch plan and the dispatcher
+
+    A single thread walks the plan, numbers the batches (1-based, in plan order)
+    and runs prepare() on each one, so reading and JSON encoding happen before a
+    network worker picks the batch up. The queue is bounded to depth prepared
+    batches; the producer blocks when it is full. Batches for which skip(batch_id)
+    is True are passed through unprepared.
+
+    Iterating yields (batch_id, item, prepared) tuples; prepared is None for
+    skipped batches and once preparation has been stopped.
+    """
+
+    def __init__(self, source: Iterator[Any], prepare: Callable[[Any], Any], depth: int = 4,
+                 skip: Optional[Callable[[int], bool]] = None, name: str = "prefetch"):
+        """
+        Start the producer thread
+
+        Args:
+            source: Iterator of planned batches
+            prepare: Turns a planned batch into its ready-to-send form
+            depth: Prepared batches that may wait in the queue
+            skip: Optional predicate for batch ids that need no preparation
+            name: Producer thread name
+        """
+        self.source = source
+        self.prepare = prepare
+        self.depth = max(1, depth)
+        self.skip = skip
+        self.prepared_count = 0
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: queue.Queue = queue.Queue(maxsize=self.depth)
+        self._preparing = True
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _put(self, entry) -> bool:
+        # Block while the queue is full, but give up once the consumer has closed
+        while not self._closed.is_set():
+            try:
+                self._queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        batch_id = 0
+        try:
+            for item in self.source:
+                batch_id += 1
+                prepared = None
+                if self._preparing and not (self.skip and self.skip(batch_id)):
+                    try:
+                        prepared = self.prepare(item)
+                        self.prepared_count += 1
+                    except Exception as e:
+                        # The worker prepares the batch itself and reports the error
+                        self.logger.warning(f"[PREFETCH] Could not prepare batch {batch_id}: {e}")
+                if not self._put((batch_id, item, prepared)):
+                    return
+            self._put((_END, None))
+        except Exception as e:
+            self._put((_END, e))
+
+    def __iter__(self) -> "BatchPrefetcher":
+        return self
+
+    def __next__(self) -> Tuple[int, Any, Any]:
+        entry = self._queue.get()
+        if entry[0] is _END:
+            # Leave the marker for any later call
+            self._queue.put(entry)
+            if entry[1] is not None:
+                raise entry[1]
+            raise StopIteration
+        return entry
+
+    def stop_preparing(self) -> None:
+        """Pass the rest of the plan through without reading or encoding it"""
+        self._preparing = False
+
+    def close(self) -> None:
+        """Stop the producer thread and drop whatever it has queued"""
+        self._closed.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join(timeout=5)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Stuck batch watchdog for Bulk Customer Import
+Flags request attempts that stay in flight far longer than the observed p99 latency
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+
+class BatchWatchdog:
+    """
+    Tracks in-flight request attempts and flags the ones that look stuck
+
+    Workers call begin() before an attempt and end() after it. A background thread
+    compares the age of every in-flight attempt with a threshold of multiplier times
+    the p99 of recent attempt durations (never below min_threshold; initial_threshold
+    until min_samples durations were seen). Each attempt is flagged at most once and
+    on_stuck(batch_id, attempt, elapsed, threshold) is called for it. Flag counts per
+    batch are kept so the caller can quarantine batches that keep getting stuck.
+    """
+
+    def __init__(self,
+                 min_threshold: float = 30.0,
+                 multiplier: float = 3.0,
+                 min_samples: int = 20,
+                 initial_threshold: float = 120.0,
+                 sample_size: int = 200,
+                 check_interval: float = 1.0,
+                 on_stuck=None):
+        """
+        Initialize the watchdog (the thread starts with start())
+
+        Args:
+            min_threshold: Lowest stuck threshold in seconds
+            multiplier: Threshold as a multiple of the p99 attempt duration
+            min_samples: Durations needed before the p99 is trusted
+            initial_threshold: Threshold used until min_samples durations were seen
+            sample_size: Recent durations kept for the p99
+            check_interval: Seconds between checks
+            on_stuck: Optional callback(batch_id, attempt, elapsed, threshold)
+        """
+        self.min_threshold = min_threshold
+        self.multiplier = multiplier
+        self.min_samples = max(1, int(min_samples))
+        self.initial_threshold = max(min_threshold, initial_threshold)
+        self.check_interval = check_interval
+        self.on_stuck = on_stuck
+        self.logger = logging.getLogger(__name__)
+
+        self.flagged_total = 0
+        self._durations = deque(maxlen=max(self.min_samples, int(sample_size)))
+        self._in_flight: Dict[int, Dict[str, Any]] = {}
+        self._stuck_counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self, batch_id: int, attempt: int) -> None:
+        """Record that an attempt for batch_id is now in flight"""
+        with self._lock:
+            self._in_flight[batch_id] = {'attempt': attempt, 'started': time.monotonic(), 'flagged': False}
+
+    def end(self, batch_id: int) -> bool:
+        """Record that the attempt finished; returns True if it had been flagged as stuck"""
+        with self._lock:
+            entry = self._in_flight.pop(batch_id, None)
+            if entry is None:
+                return False
+            self._durations.append(time.monotonic() - entry['started'])
+            return entry['flagged']
+
+    def stuck_count(self, batch_id: int) -> int:
+        """How many attempts of batch_id were flagged as stuck"""
+        with self._lock:
+            return self._stuck_counts.get(batch_id, 0)
+
+    def _p99(self) -> Optional[float]:
+        if len(self._durations) < self.min_samples:
+            return None
+        durations = sorted(self._durations)
+        return durations[min(len(durations) - 1, int(len(durations) * 0.99))]
+
+    def threshold(self) -> float:
+        """Current stuck threshold in seconds"""
+        with self._lock:
+            p99 = self._p99()
+        if p99 is None:
+            return self.initial_threshold
+        return max(self.min_threshold, p99 * self.multiplier)
+
+    def check(self) -> List[Tuple[int, int, float, float]]:
+        """Flag attempts older than the threshold; returns the newly flagged ones"""
+        threshold = self.threshold()
+        now = time.monotonic()
+        flagged = []
+        with self._lock:
+            for batch_id, entry in self._in_flight.items():
+                elapsed = now - entry['started']
+                if not entry['flagged'] and elapsed > threshold:
+                    entry['flagged'] = True
+                    self._stuck_counts[batch_id] = self._stuck_counts.get(batch_id, 0) + 1
+                    self.flagged_total += 1
+                    flagged.append((batch_id, entry['attempt'], elapsed, threshold))
+
+        if self.on_stuck:
+            for stuck in flagged:
+                try:
+                    self.on_stuck(*stuck)
+                except Exception as e:
+                    self.logger.warning(f"[WATCHDOG] Stuck batch callback failed: {e}")
+        return flagged
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            self.check()
+
+    def start(self) -> None:
+        """Start the checking thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="batch-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the checking thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Watchdog state for progress reporting"""
+        threshold = self.threshold()
+        with self._lock:
+            p99 = self._p99()
+            return {
+                'in_flight': len(self._in_flight),
+                'stuck_in_flight': sum(1 for entry in self._in_flight.values() if entry['flagged']),
+                'flagged_total': self.flagged_total,
+                'threshold_seconds': threshold,
+                'p99_seconds': p99
+            }
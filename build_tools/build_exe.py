@@ -25,7 +25,20 @@ def check_dependencies():
     required_files = [
         "bulk_import_gui.py",
         "bulk_import_multithreaded.py",
-        "auth_manager.py"
+        "auth_manager.py",
+        "json_stream.py",
+        "flow_control.py",
+        "import_journal.py",
+        "batch_identity.py",
+        "persistence.py",
+        "response_archive.py",
+        "batch_pipeline.py",
+        "json_codec.py",
+        "batch_watchdog.py",
+        "token_cache.py",
+        "auth_health.py",
+        "progress_stream.py",
+        "log_buffer.py"
     ]
     
     missing_files = []
@@ -54,6 +67,19 @@ a = Analysis(
     datas=[
         ('bulk_import_multithreaded.py', '.'),
         ('auth_manager.py', '.'),
+        ('json_stream.py', '.'),
+        ('flow_control.py', '.'),
+        ('import_journal.py', '.'),
+        ('batch_identity.py', '.'),
+        ('persistence.py', '.'),
+        ('response_archive.py', '.'),
+        ('batch_pipeline.py', '.'),
+        ('json_codec.py', '.'),
+        ('batch_watchdog.py', '.'),
+        ('token_cache.py', '.'),
+        ('auth_health.py', '.'),
+        ('progress_stream.py', '.'),
+        ('log_buffer.py', '.'),
     ],
     hiddenimports=[
         'tkinter',
@@ -63,6 +89,7 @@ a = Analysis(
         'tkinter.scrolledtext',
         'requests',
         'json',
+        'orjson',
         'threading',
         'queue',
         'datetime',
@@ -23,7 +23,8 @@ def check_pyinstaller():
 def check_dependencies():
     """Check if all required files exist"""
     required_files = [
-        "split_large_json.py"
+        "split_large_json.py",
+        "json_codec.py"
     ]
     
     missing_files = []
@@ -52,6 +53,8 @@ a = Analysis(
     datas=[],
     hiddenimports=[
         'json',
+        'json_codec',
+        'orjson',
         'os',
         'math',
         'sys',
@@ -4,9 +4,9 @@ A user-friendly interface for importing customers with multithreaded processing
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
 import threading
-import json
+import json_codec
 import os
 from datetime import datetime
 import queue
@@ -15,6 +15,23 @@ import time
 
 # Import our bulk importer
 from bulk_import_multithreaded import BulkCustomerImporter
+from flow_control import RATE_PRESETS
+from import_journal import FailedCustomerJournal
+from response_archive import ResponseArchiveReader, RESPONSE_POLICY_MODES
+from log_buffer import LogRingBuffer
+
+# Auto-refresh of the failed customers tab runs at most once per this many ms
+FAILED_REFRESH_DEBOUNCE_MS = 500
+
+# The importer publishes one progress snapshot per interval; each GUI tick handles a bounded number of messages
+PROGRESS_INTERVAL = 0.5
+PROGRESS_MESSAGES_PER_TICK = 200
+PROGRESS_DETAIL_LIMIT = 20
+
+# Log panes keep their newest entries in memory; every entry is also written to gui_logs/
+GUI_LOG_DIR = "gui_logs"
+LOG_PANE_ENTRIES = 2000
+API_PANE_ENTRIES = 500
 
 class BulkImportGUI:
     def __init__(self, root):
@@ -33,11 +50,25 @@ class BulkImportGUI:
         self.gk_passport = tk.StringVar(value="1.1:CiMg46zV+88yKOOMxZPwMjIDMDAxOg5idXNpbmVzc1VuaXRJZBIKCAISBnVzZXJJZBoSCAIaCGNsaWVudElkIgR3c0lkIhoaGGI6Y3VzdC5jdXN0b21lci5pbXBvcnRlcg==")
         self.batch_size = tk.IntVar(value=100)
         self.max_workers = tk.IntVar(value=10)
-        self.delay_between_requests = tk.DoubleVar(value=1.0)
+        self.requests_per_second = tk.DoubleVar(value=1.0)
+        self.records_per_second = tk.DoubleVar(value=0.0)  # 0 = unlimited
+        self.burst = tk.IntVar(value=1)
         self.max_retries = tk.IntVar(value=1)
+        self.adaptive_concurrency = tk.BooleanVar(value=False)
+        self.min_workers = tk.IntVar(value=1)
+        self.resume_from_ledger = tk.BooleanVar(value=True)
+        self.response_persistence = tk.StringVar(value="all")
+        self.response_sample_rate = tk.DoubleVar(value=0.1)
+        self.compress_requests = tk.BooleanVar(value=False)
+        self.compression_level = tk.IntVar(value=6)
+        self.connect_timeout = tk.DoubleVar(value=10.0)
+        self.read_timeout = tk.DoubleVar(value=300.0)
+        self.deferred_retry_passes = tk.IntVar(value=1)
+        self.deferred_retry_delay = tk.DoubleVar(value=30.0)
 
         # Authentication variables
         self.use_auto_auth = tk.BooleanVar(value=False)
+        self.use_token_cache = tk.BooleanVar(value=False)
         self.username = tk.StringVar(value="coop_sweden")
         self.password = tk.StringVar(value="coopsverige123")
         self.client_id = tk.StringVar(value="employee-hub")  # For Engage mode
@@ -51,6 +82,20 @@ class BulkImportGUI:
         self.progress_queue = queue.Queue()
         self.file_loading_queue = queue.Queue()
         self.current_importer = None
+        self.last_importer = None  # Kept after the run so late failures can still be pulled
+
+        # Failed customers view: rows are pulled incrementally and only the visible window is rendered
+        self.failed_rows = []  # (display values, failed customer record)
+        self.failed_cursor = 0
+        self.failed_source = None
+        self.failed_view_start = 0
+        self.failed_visible_rows = 20
+        self.failed_refresh_job = None
+
+        # Bounded log panes backed by session log files
+        session = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.log_buffer = LogRingBuffer(os.path.join(GUI_LOG_DIR, f"import_log_{session}.txt"), LOG_PANE_ENTRIES)
+        self.api_log_buffer = LogRingBuffer(os.path.join(GUI_LOG_DIR, f"api_responses_{session}.txt"), API_PANE_ENTRIES)
 
         # Cache for customer counts to avoid re-reading files
         self.customer_count_cache = {}
@@ -196,6 +241,9 @@ class BulkImportGUI:
         self.client_id_note = ttk.Label(self.auto_auth_frame, text="(Engage only)", foreground="gray")
         self.client_id_note.grid(row=3, column=2, padx=5)
 
+        ttk.Checkbutton(self.auto_auth_frame, text="Reuse a valid token across runs (cached in your user profile, owner-only)",
+                        variable=self.use_token_cache).grid(row=4, column=0, columnspan=3, sticky=tk.W, pady=2)
+
         # Configure column weights for proper resizing
         self.manual_auth_frame.columnconfigure(1, weight=1)
         self.auto_auth_frame.columnconfigure(1, weight=1)
@@ -221,13 +269,62 @@ class BulkImportGUI:
         ttk.Spinbox(settings_group, from_=1, to=10, textvariable=self.max_workers, width=10).grid(row=1, column=1, sticky=tk.W, pady=2)
         ttk.Label(settings_group, text="(concurrent requests)").grid(row=1, column=2, sticky=tk.W, pady=2)
         
-        ttk.Label(settings_group, text="Request Delay:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        ttk.Spinbox(settings_group, from_=0.1, to=5.0, increment=0.1, textvariable=self.delay_between_requests, width=10).grid(row=2, column=1, sticky=tk.W, pady=2)
-        ttk.Label(settings_group, text="(seconds between requests)").grid(row=2, column=2, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="Request Rate:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=0.1, to=50.0, increment=0.1, textvariable=self.requests_per_second, width=10).grid(row=2, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(requests per second)").grid(row=2, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Record Rate:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=0, to=5000, increment=10, textvariable=self.records_per_second, width=10).grid(row=3, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(customers per second, 0 = unlimited)").grid(row=3, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Burst:").grid(row=4, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=1, to=20, textvariable=self.burst, width=10).grid(row=4, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(requests allowed back-to-back)").grid(row=4, column=2, sticky=tk.W, pady=2)
         
-        ttk.Label(settings_group, text="Max Retries:").grid(row=3, column=0, sticky=tk.W, pady=2)
-        ttk.Spinbox(settings_group, from_=1, to=10, textvariable=self.max_retries, width=10).grid(row=3, column=1, sticky=tk.W, pady=2)
-        ttk.Label(settings_group, text="(retry attempts for failed batches)").grid(row=3, column=2, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="Max Retries:").grid(row=5, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=1, to=10, textvariable=self.max_retries, width=10).grid(row=5, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(retry attempts for failed batches)").grid(row=5, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Adaptive Workers:").grid(row=6, column=0, sticky=tk.W, pady=2)
+        ttk.Checkbutton(settings_group, text="Adjust concurrency to API latency/errors", variable=self.adaptive_concurrency).grid(row=6, column=1, columnspan=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Min Workers:").grid(row=7, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=1, to=10, textvariable=self.min_workers, width=10).grid(row=7, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(adaptive lower bound; starts at half of Worker Threads, the upper bound)").grid(row=7, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Resume:").grid(row=8, column=0, sticky=tk.W, pady=2)
+        ttk.Checkbutton(settings_group, text="Skip batches already finished for the same files (progress ledger)", variable=self.resume_from_ledger).grid(row=8, column=1, columnspan=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Keep Responses:").grid(row=9, column=0, sticky=tk.W, pady=2)
+        ttk.Combobox(settings_group, textvariable=self.response_persistence, values=RESPONSE_POLICY_MODES, state="readonly", width=10).grid(row=9, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(all / failures only / failures + sample of clean batches)").grid(row=9, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Sample Rate:").grid(row=10, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=0.0, to=1.0, increment=0.05, textvariable=self.response_sample_rate, width=10).grid(row=10, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(share of clean batches archived in 'sampled' mode)").grid(row=10, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Compress Requests:").grid(row=11, column=0, sticky=tk.W, pady=2)
+        ttk.Checkbutton(settings_group, text="gzip request bodies (falls back automatically if the API rejects it)", variable=self.compress_requests).grid(row=11, column=1, columnspan=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Compression Level:").grid(row=12, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=1, to=9, textvariable=self.compression_level, width=10).grid(row=12, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(1 = fastest, 9 = smallest)").grid(row=12, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Connect Timeout (s):").grid(row=13, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=0, to=120, increment=5, textvariable=self.connect_timeout, width=10).grid(row=13, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(0 = wait forever)").grid(row=13, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Read Timeout (s):").grid(row=14, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=0, to=3600, increment=30, textvariable=self.read_timeout, width=10).grid(row=14, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(per attempt; timed out attempts are retried, 0 = wait forever)").grid(row=14, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Deferred Passes:").grid(row=15, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=0, to=5, textvariable=self.deferred_retry_passes, width=10).grid(row=15, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(failed batches are retried again after fresh work, 0 = off)").grid(row=15, column=2, sticky=tk.W, pady=2)
+
+        ttk.Label(settings_group, text="Deferred Cool-down (s):").grid(row=16, column=0, sticky=tk.W, pady=2)
+        ttk.Spinbox(settings_group, from_=0, to=600, increment=10, textvariable=self.deferred_retry_delay, width=10).grid(row=16, column=1, sticky=tk.W, pady=2)
+        ttk.Label(settings_group, text="(wait before a deferred pass, doubled for the second pass)").grid(row=16, column=2, sticky=tk.W, pady=2)
         
         # Preset buttons
         presets_group = ttk.LabelFrame(parent, text="Presets", padding=10)
@@ -336,7 +433,9 @@ class BulkImportGUI:
             ("Failed:", "failed_batches"),
             ("Success Rate:", "success_rate"),
             ("Duration:", "duration"),
-            ("Customers/min:", "rate")
+            ("Customers/min:", "rate"),
+            ("API Circuit:", "circuit_state"),
+            ("Auth Service:", "auth_state")
         ]
         
         for i, (label, key) in enumerate(stats_items):
@@ -346,6 +445,8 @@ class BulkImportGUI:
             ttk.Label(stats_frame, text=label).grid(row=row, column=col, sticky=tk.W, padx=5, pady=2)
             self.stats_labels[key] = ttk.Label(stats_frame, text="0", font=("TkDefaultFont", 9, "bold"))
             self.stats_labels[key].grid(row=row, column=col+1, sticky=tk.W, padx=5, pady=2)
+        self.stats_labels['circuit_state'].config(text="closed")
+        self.stats_labels['auth_state'].config(text="-")
     
     def create_results_tab(self, parent):
         """Create results and logging tab"""
@@ -363,6 +464,8 @@ class BulkImportGUI:
         
         ttk.Button(log_controls, text="Clear Log", command=self.clear_log).pack(side=tk.LEFT, padx=5)
         ttk.Button(log_controls, text="Save Log", command=self.save_log).pack(side=tk.LEFT, padx=5)
+        ttk.Button(log_controls, text="Load Older…",
+                   command=lambda: self.show_older_entries(self.log_buffer, "Import Log")).pack(side=tk.LEFT, padx=5)
         ttk.Button(log_controls, text="Export Results", command=self.export_results).pack(side=tk.LEFT, padx=5)
     
     def toggle_password(self, entry_widget):
@@ -472,29 +575,29 @@ class BulkImportGUI:
             self.auto_auth_frame.grid_remove()
             self.manual_auth_frame.grid()
     
+    def apply_rate_preset(self, name):
+        """Apply one of the shared rate presets to the import settings"""
+        preset = RATE_PRESETS[name]
+        self.batch_size.set(preset['batch_size'])
+        self.max_workers.set(preset['max_workers'])
+        self.requests_per_second.set(preset['requests_per_second'])
+        self.records_per_second.set(preset['records_per_second'])
+        self.burst.set(preset['burst'])
+        self.max_retries.set(preset['max_retries'])
+        self.log_message(f"Applied {name.title()} preset: {preset['batch_size']} batch size, {preset['max_workers']} workers, "
+                         f"{preset['requests_per_second']:g} req/s, {preset['records_per_second']:g} customers/s, burst {preset['burst']}")
+
     def set_conservative_preset(self):
         """Set conservative import settings"""
-        self.batch_size.set(50)
-        self.max_workers.set(2)
-        self.delay_between_requests.set(1.0)
-        self.max_retries.set(5)
-        self.log_message("Applied Conservative preset: 50 batch size, 2 workers, 1.0s delay")
+        self.apply_rate_preset('conservative')
     
     def set_balanced_preset(self):
         """Set balanced import settings"""
-        self.batch_size.set(70)
-        self.max_workers.set(3)
-        self.delay_between_requests.set(0.5)
-        self.max_retries.set(3)
-        self.log_message("Applied Balanced preset: 70 batch size, 3 workers, 0.5s delay")
+        self.apply_rate_preset('balanced')
     
     def set_aggressive_preset(self):
         """Set aggressive import settings"""
-        self.batch_size.set(100)
-        self.max_workers.set(5)
-        self.delay_between_requests.set(0.2)
-        self.max_retries.set(2)
-        self.log_message("Applied Aggressive preset: 100 batch size, 5 workers, 0.2s delay")
+        self.apply_rate_preset('aggressive')
     
     def add_files(self):
         """Add individual files"""
@@ -631,7 +734,7 @@ class BulkImportGUI:
 
                     try:
                         with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
+                            data = json_codec.load(f)
                         
                         # Detect file type based on JSON structure
                         if 'data' in data:
@@ -772,7 +875,7 @@ class BulkImportGUI:
                 
                 try:
                     with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                        data = json_codec.load(f)
                     
                     # Detect file type based on JSON structure
                     if 'data' in data:
@@ -828,7 +931,7 @@ class BulkImportGUI:
         for file_path in self.selected_files:
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                    data = json_codec.load(f)
                 
                 customers = data.get('data', [])
                 if not customers:
@@ -880,7 +983,8 @@ class BulkImportGUI:
                     username=self.username.get(),
                     password=self.password.get(),
                     client_id=self.client_id.get(),
-                    use_auto_auth=True
+                    use_auto_auth=True,
+                    token_cache=self.use_token_cache.get()
                 )
             else:
                 # Test manual authentication
@@ -948,14 +1052,21 @@ class BulkImportGUI:
         # Confirm start
         total_customers = sum(self.count_customers_in_file(f) for f in self.selected_files)
         
+        compression_note = f"\n- gzip requests: level {self.compression_level.get()}" if self.compress_requests.get() else ""
         result = messagebox.askyesno(
             "Confirm Import",
             f"Start import of {total_customers:,} customers from {len(self.selected_files)} files?\n\n"
             f"Settings:\n"
             f"- Batch size: {self.batch_size.get()}\n"
-            f"- Worker threads: {self.max_workers.get()}\n"
-            f"- Request delay: {self.delay_between_requests.get()}s\n"
-            f"- Max retries: {self.max_retries.get()}"
+            f"- Worker threads: {self.max_workers.get()}"
+            f"{f' (adaptive, min {self.min_workers.get()})' if self.adaptive_concurrency.get() else ''}\n"
+            f"- Request rate: {self.requests_per_second.get():g} req/s (burst {self.burst.get()})\n"
+            f"- Record rate: {self.records_per_second.get():g} customers/s (0 = unlimited)\n"
+            f"- Max retries: {self.max_retries.get()} (+{self.deferred_retry_passes.get()} deferred passes)\n"
+            f"- Timeouts: connect {self.connect_timeout.get():g}s, read {self.read_timeout.get():g}s (0 = none)\n"
+            f"- Keep responses: {self.response_persistence.get()}"
+            f"{f' ({self.response_sample_rate.get():.0%} of clean batches)' if self.response_persistence.get() == 'sampled' else ''}"
+            f"{compression_note}"
         )
         
         if not result:
@@ -967,6 +1078,10 @@ class BulkImportGUI:
         self.pause_button.config(state=tk.NORMAL)
         self.resume_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
+        self.stats_labels['circuit_state'].config(text="closed")
+        self.stats_labels['auth_state'].config(text="healthy" if self.use_auto_auth.get() else "manual token")
+        self.last_importer = None
+        self.reset_failed_customers_view()
         
         self.import_thread = threading.Thread(target=self.run_import, daemon=True)
         self.import_thread.start()
@@ -1016,13 +1131,30 @@ class BulkImportGUI:
                     gk_passport=self.gk_passport.get(),
                     batch_size=self.batch_size.get(),
                     max_workers=self.max_workers.get(),
-                    delay_between_requests=self.delay_between_requests.get(),
+                    requests_per_second=self.requests_per_second.get(),
+                    records_per_second=self.records_per_second.get(),
+                    burst=self.burst.get(),
+                    adaptive_concurrency=self.adaptive_concurrency.get(),
+                    min_workers=self.min_workers.get(),
+                    resume_from_ledger=self.resume_from_ledger.get(),
+                    response_persistence=self.response_persistence.get(),
+                    response_sample_rate=self.response_sample_rate.get(),
+                    compress_requests=self.compress_requests.get(),
+                    compression_level=self.compression_level.get(),
+                    connect_timeout=self.connect_timeout.get(),
+                    read_timeout=self.read_timeout.get(),
+                    deferred_retry_passes=self.deferred_retry_passes.get(),
+                    deferred_retry_delay=self.deferred_retry_delay.get(),
                     max_retries=self.max_retries.get(),
                     progress_callback=self.handle_api_response,
+                    progress_interval=PROGRESS_INTERVAL,
+                    progress_details=self.show_batch_details.get(),
+                    progress_detail_limit=PROGRESS_DETAIL_LIMIT,
                     username=self.username.get(),
                     password=self.password.get(),
                     client_id=self.client_id.get(),
                     use_auto_auth=True,
+                    token_cache=self.use_token_cache.get(),
                     failed_customers_file=failed_customers_file
                 )
             else:
@@ -1035,14 +1167,31 @@ class BulkImportGUI:
                     gk_passport=self.gk_passport.get(),
                     batch_size=self.batch_size.get(),
                     max_workers=self.max_workers.get(),
-                    delay_between_requests=self.delay_between_requests.get(),
+                    requests_per_second=self.requests_per_second.get(),
+                    records_per_second=self.records_per_second.get(),
+                    burst=self.burst.get(),
+                    adaptive_concurrency=self.adaptive_concurrency.get(),
+                    min_workers=self.min_workers.get(),
+                    resume_from_ledger=self.resume_from_ledger.get(),
+                    response_persistence=self.response_persistence.get(),
+                    response_sample_rate=self.response_sample_rate.get(),
+                    compress_requests=self.compress_requests.get(),
+                    compression_level=self.compression_level.get(),
+                    connect_timeout=self.connect_timeout.get(),
+                    read_timeout=self.read_timeout.get(),
+                    deferred_retry_passes=self.deferred_retry_passes.get(),
+                    deferred_retry_delay=self.deferred_retry_delay.get(),
                     max_retries=self.max_retries.get(),
                     progress_callback=self.handle_api_response,
+                    progress_interval=PROGRESS_INTERVAL,
+                    progress_details=self.show_batch_details.get(),
+                    progress_detail_limit=PROGRESS_DETAIL_LIMIT,
                     use_auto_auth=False,
                     failed_customers_file=failed_customers_file
                 )
             
             self.current_importer = importer
+            self.last_importer = importer
             
             # Run import
             result = importer.import_customers(self.selected_files)
@@ -1058,9 +1207,18 @@ class BulkImportGUI:
     
     def check_progress_queue(self):
         """Check for progress updates from import thread"""
+        snapshots = []  # Rendered once per tick
         try:
-            while True:
+            for _ in range(PROGRESS_MESSAGES_PER_TICK):
                 message_type, data = self.progress_queue.get_nowait()
+
+                if message_type == "api_response" and data.get('type') == 'progress_snapshot':
+                    snapshots.append(data)
+                    continue
+                if message_type in ("complete", "error") and snapshots:
+                    # The final snapshot goes in before the completion dialog
+                    self.handle_progress_snapshots(snapshots)
+                    snapshots = []
                 
                 if message_type == "complete":
                     self.handle_import_complete(data)
@@ -1072,12 +1230,15 @@ class BulkImportGUI:
                     self.log_api_response(data)
                     # Auto-refresh failed customers tab if enabled
                     if hasattr(self, 'auto_refresh_failed') and self.auto_refresh_failed.get():
-                        self.refresh_failed_customers()
+                        self.schedule_failed_customers_refresh()
                 elif message_type == "retry_files_created":
                     self.handle_retry_files_created(data)
                 
         except queue.Empty:
             pass
+
+        if snapshots:
+            self.handle_progress_snapshots(snapshots)
         
         # Schedule next check
         self.root.after(100, self.check_progress_queue)
@@ -1108,6 +1269,12 @@ class BulkImportGUI:
                 self.stats_labels['rate'].config(text=f"{rate:.1f}")
             
             self.log_message(f"Import completed! {result.get('successful_customers', 0)} customers imported successfully")
+            if result.get('compression_ratio') and result.get('request_bytes_saved', 0) > 0:
+                self.log_message(f"Request compression: {result['compression_ratio']}x, "
+                                 f"{result.get('request_bytes_saved', 0):,} bytes saved")
+            if result.get('responses_skipped'):
+                self.log_message(f"Responses archived: {result.get('responses_archived', 0)} ({result.get('response_bytes_written', 0):,} bytes), "
+                                 f"skipped: {result['responses_skipped']} ({result.get('response_bytes_saved', 0):,} bytes saved)")
 
             # Get failed customers summary if available
             failed_summary = ""
@@ -1143,7 +1310,7 @@ class BulkImportGUI:
 
         # Final refresh of failed customers tab
         if hasattr(self, 'failed_customers_tree'):
-            self.refresh_failed_customers()
+            self.flush_failed_customers_refresh()
     
     def handle_import_error(self, error_msg):
         """Handle import error"""
@@ -1161,6 +1328,61 @@ class BulkImportGUI:
         # This would be called if we implement progress callbacks in the importer
         pass
 
+    def handle_progress_snapshots(self, snapshots):
+        """Render the progress snapshots that arrived during one tick as a single update"""
+        latest = snapshots[-1]
+        status = latest.get('status', {})
+
+        # Statistics and progress bar from the latest snapshot only
+        total = status.get('total_batches', 0)
+        completed = status.get('completed_batches', 0)
+        failed = status.get('failed_batches', 0)
+        self.stats_labels['total_batches'].config(text=str(total))
+        self.stats_labels['completed_batches'].config(text=str(completed))
+        self.stats_labels['failed_batches'].config(text=str(failed))
+        self.stats_labels['rate'].config(text=f"{latest['rates']['customers_per_minute']:.1f}")
+        if total:
+            self.progress_var.set(min(100.0, (completed + failed) * 100.0 / total))
+            paused = " (paused)" if status.get('is_paused') else ""
+            self.progress_label.config(text=f"Processed {completed + failed:,} of {total:,} batches{paused}")
+
+        # State events keep their own entries; per-batch details only when requested, capped per tick
+        for snapshot in snapshots:
+            for event in snapshot.get('events', []):
+                if event['type'] == 'retry_files_created':
+                    self.handle_retry_files_created(event)
+                else:
+                    self.log_api_response(event)
+        details = [detail for snapshot in snapshots for detail in snapshot.get('details', [])]
+        for detail in details[-PROGRESS_DETAIL_LIMIT:]:
+            self.log_api_response(detail)
+        hidden = max(0, len(details) - PROGRESS_DETAIL_LIMIT) + sum(snapshot.get('details_dropped', 0) for snapshot in snapshots)
+
+        # One summary entry for the batch activity of this tick
+        succeeded = sum(snapshot['counts'].get('batch_success', 0) for snapshot in snapshots)
+        errors = sum(snapshot['counts'].get('batch_error', 0) for snapshot in snapshots)
+        new_failed = sum(snapshot.get('new_failed_customers', 0) for snapshot in snapshots)
+        latest_errors = [error for snapshot in snapshots for error in snapshot.get('latest_errors', [])][-5:]
+        if succeeded or errors or latest_errors:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            summary = (f"[{timestamp}] 📊 +{succeeded} batches ok, +{errors} errors, "
+                       f"{latest['rates']['customers_per_minute']:.0f} customers/min")
+            if new_failed:
+                summary += f", +{new_failed} failed customers"
+            lines = [summary]
+            for error in latest_errors:
+                code = f" HTTP {error['status_code']}" if error.get('status_code') else ""
+                lines.append(f"   ❌ Batch {error['batch_id']} {error['type'].replace('batch_', '')}{code}: {error.get('error_summary', '')}")
+            if hidden:
+                lines.append(f"   … {hidden} per-batch entries not shown")
+            self.append_api_entry("\n".join(lines) + "\n")
+
+        # Pull new failed customers only when the importer's cursor moved
+        cursor = status.get('failed_customers_cursor')
+        if (cursor is not None and cursor != self.failed_cursor
+                and hasattr(self, 'auto_refresh_failed') and self.auto_refresh_failed.get()):
+            self.schedule_failed_customers_refresh()
+
     def handle_api_response(self, response_data):
         """Handle API response from importer (called from worker thread)"""
         # Put the response data in the queue to be processed by the main thread
@@ -1241,7 +1463,7 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
         # Fallback to reading file (slow, but safe)
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                data = json_codec.load(f)
             count = len(data.get('data', []))
             # Cache the result for next time
             self.customer_count_cache[file_path] = count
@@ -1254,11 +1476,30 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_entry = f"[{timestamp}] {message}\n"
         
-        self.log_text.insert(tk.END, log_entry)
+        self.append_to_pane(self.log_text, self.log_buffer, log_entry)
         self.log_text.see(tk.END)
+
+    def append_to_pane(self, widget, buffer, text):
+        """Append an entry to a bounded log pane, dropping the entries its buffer evicted"""
+        if not text.endswith("\n"):
+            text += "\n"
+        evicted = buffer.append(text)
+        if evicted:
+            lines = sum(entry.count("\n") for entry in evicted)
+            widget.delete("1.0", f"{lines + 1}.0")
+        widget.insert(tk.END, text)
+
+    def append_api_entry(self, text):
+        """Append one entry to the API responses pane"""
+        self.api_responses_text.config(state=tk.NORMAL)
+        self.append_to_pane(self.api_responses_text, self.api_log_buffer, text)
+        if self.auto_scroll_api.get():
+            self.api_responses_text.see(tk.END)
+        self.api_responses_text.config(state=tk.DISABLED)
     
     def clear_log(self):
         """Clear the log"""
+        self.log_buffer.clear()
         self.log_text.delete(1.0, tk.END)
     
     def save_log(self):
@@ -1271,12 +1512,73 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
         
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(self.log_text.get(1.0, tk.END))
+                # Streamed from the session file - includes entries no longer shown
+                self.log_buffer.copy_to(file_path)
                 messagebox.showinfo("Success", f"Log saved to {file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save log: {e}")
     
+    def show_older_entries(self, buffer, title):
+        """Show entries that dropped out of a pane (paged from its session file) and search the whole log"""
+        window = tk.Toplevel(self.root)
+        window.title(f"{title} - Older Entries")
+        window.geometry("800x600")
+        window.transient(self.root)
+
+        controls = ttk.Frame(window)
+        controls.pack(fill=tk.X, padx=10, pady=(10, 0))
+        query = tk.StringVar()
+        search_entry = ttk.Entry(controls, textvariable=query, width=40)
+        search_entry.pack(side=tk.LEFT, padx=(0, 5))
+
+        status_label = ttk.Label(controls, text="")
+        older_text = scrolledtext.ScrolledText(window, wrap=tk.WORD, font=('Consolas', 9))
+        view = {'start': None}  # File offset of the earliest text shown (None = nothing loaded yet)
+
+        def show(content):
+            older_text.config(state=tk.NORMAL)
+            older_text.delete(1.0, tk.END)
+            older_text.insert(tk.END, content)
+            older_text.config(state=tk.DISABLED)
+
+        def load_earlier():
+            if view['start'] is None and not buffer.has_older:
+                show("")
+                status_label.config(text="No older entries - everything since the last clear is still in the pane")
+                return
+            if view['start'] is not None and view['start'] <= buffer.start_offset:
+                return
+            chunk, start = buffer.read_older(end=view['start'])
+            older_text.config(state=tk.NORMAL)
+            if view['start'] is None:
+                older_text.delete(1.0, tk.END)
+            older_text.insert("1.0", chunk)
+            older_text.config(state=tk.DISABLED)
+            view['start'] = start
+            at_beginning = " (beginning of log)" if start <= buffer.start_offset else ""
+            status_label.config(text=f"Older entries from {buffer.path}{at_beginning}")
+
+        def search():
+            needle = query.get().strip()
+            view['start'] = None
+            if not needle:
+                load_earlier()
+                return
+            matches, truncated = buffer.search(needle)
+            show("\n".join(matches) + ("\n" if matches else ""))
+            status_label.config(text=f"{len(matches)} matching lines{' (first 1000 shown)' if truncated else ''}")
+
+        ttk.Button(controls, text="Search", command=search).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(controls, text="Load Earlier", command=load_earlier).pack(side=tk.LEFT, padx=(0, 10))
+        status_label.pack(side=tk.LEFT)
+        search_entry.bind("<Return>", lambda event: search())
+
+        older_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        ttk.Button(window, text="Close", command=window.destroy).pack(pady=(0, 10))
+
+        load_earlier()
+        older_text.see(tk.END)
+
     def export_results(self):
         """Export import results"""
         # This would export detailed results if available
@@ -1297,12 +1599,19 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
         button_frame.pack(fill=tk.X, pady=(0, 10))
 
         ttk.Button(button_frame, text="Clear Responses", command=self.clear_api_responses).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Button(button_frame, text="Save Responses", command=self.save_api_responses).pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="Save Responses", command=self.save_api_responses).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="View Archived Response", command=self.view_archived_response).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Load Older…",
+                   command=lambda: self.show_older_entries(self.api_log_buffer, "API Responses")).pack(side=tk.LEFT)
 
         # Auto-scroll checkbox
         self.auto_scroll_api = tk.BooleanVar(value=True)
         ttk.Checkbutton(button_frame, text="Auto-scroll", variable=self.auto_scroll_api).pack(side=tk.RIGHT)
 
+        # Per-batch entries are opt-in (taken when an import starts); otherwise one summary line per update
+        self.show_batch_details = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Per-batch details", variable=self.show_batch_details).pack(side=tk.RIGHT, padx=(0, 10))
+
         # API responses text area with scrollbar
         text_frame = ttk.Frame(main_frame)
         text_frame.pack(fill=tk.BOTH, expand=True)
@@ -1317,15 +1626,16 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
         self.api_responses_text.pack(fill=tk.BOTH, expand=True)
 
         # Add initial message
-        self.api_responses_text.insert(tk.END, "API responses will appear here during import...\n\n")
         self.api_responses_text.config(state=tk.DISABLED)
+        self.append_api_entry("API responses will appear here during import...\n\n")
 
     def clear_api_responses(self):
         """Clear API responses"""
+        self.api_log_buffer.clear()
         self.api_responses_text.config(state=tk.NORMAL)
         self.api_responses_text.delete(1.0, tk.END)
-        self.api_responses_text.insert(tk.END, "API responses cleared.\n\n")
         self.api_responses_text.config(state=tk.DISABLED)
+        self.append_api_entry("API responses cleared.\n\n")
 
     def save_api_responses(self):
         """Save API responses to file"""
@@ -1337,90 +1647,174 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
             )
 
             if file_path:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(self.api_responses_text.get(1.0, tk.END))
+                # Streamed from the session file - includes entries no longer shown
+                self.api_log_buffer.copy_to(file_path)
                 messagebox.showinfo("Success", f"API responses saved to {file_path}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save API responses: {e}")
 
+    def view_archived_response(self):
+        """Show one full API response from the response archive"""
+        reference = simpledialog.askstring(
+            "View Archived Response",
+            "Batch number (latest run) or Response File reference:",
+            parent=self.root
+        )
+        if not reference:
+            return
+        reference = reference.strip()
+
+        try:
+            if '/' in reference:
+                run_name = reference.split('/', 1)[0]
+                reader = ResponseArchiveReader(os.path.join("api_responses", run_name))
+                record = reader.read_reference(reference)
+            else:
+                reader = ResponseArchiveReader.latest("api_responses")
+                if reader is None:
+                    messagebox.showinfo("No Archive", "No archived API responses found")
+                    return
+                record = reader.get(int(reference))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read archived response: {e}")
+            return
+
+        if record is None:
+            messagebox.showinfo("Not Found", f"No archived response for {reference} in {reader.run_name}")
+            return
+
+        response_window = tk.Toplevel(self.root)
+        response_window.title(f"API Response - Batch {record.get('batch_id')} ({reader.run_name})")
+        response_window.geometry("700x550")
+        response_window.transient(self.root)
+
+        response_text = scrolledtext.ScrolledText(response_window, wrap=tk.WORD, font=('Consolas', 9))
+        response_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        response_text.insert(tk.END, json_codec.dumps(record, pretty=True))
+        response_text.config(state=tk.DISABLED)
+
+        ttk.Button(response_window, text="Close", command=response_window.destroy).pack(pady=10)
+
     def log_api_response(self, response_data):
         """Log API response to the API responses tab"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-
-        self.api_responses_text.config(state=tk.NORMAL)
+        entry = []  # Added to the pane as one entry
 
         if response_data['type'] == 'batch_success':
             failed_count = response_data.get('failed_customers_count', 0)
             status_icon = "⚠️" if failed_count > 0 else "✅"
 
-            self.api_responses_text.insert(tk.END, f"[{timestamp}] {status_icon} SUCCESS - Batch {response_data['batch_id']}\n")
-            self.api_responses_text.insert(tk.END, f"Status Code: {response_data['status_code']}\n")
-            self.api_responses_text.insert(tk.END, f"Customers: {response_data['customers_count']}\n")
+            entry.append(f"[{timestamp}] {status_icon} SUCCESS - Batch {response_data['batch_id']}\n")
+            entry.append(f"Status Code: {response_data['status_code']}\n")
+            entry.append(f"Customers: {response_data['customers_count']}\n")
+            if 'concurrency_limit' in response_data:
+                entry.append(f"Concurrency Target: {response_data['concurrency_limit']}\n")
             
             # Show response file location instead of full data
-            response_file = response_data.get('response_file', 'not_saved')
-            self.api_responses_text.insert(tk.END, f"Response File: {response_file}\n")
+            response_file = response_data.get('response_file') or 'not archived (counts only)'
+            entry.append(f"Response File: {response_file}\n")
             
             # Show response summary instead of full data
             response_summary = response_data.get('response_summary', {})
             if response_summary:
                 if 'total_customers' in response_summary:
-                    self.api_responses_text.insert(tk.END, f"API Processed: {response_summary['total_customers']} customers\n")
+                    entry.append(f"API Processed: {response_summary['total_customers']} customers\n")
                 if 'success_count' in response_summary:
-                    self.api_responses_text.insert(tk.END, f"API Success: {response_summary['success_count']}\n")
+                    entry.append(f"API Success: {response_summary['success_count']}\n")
                 if 'failure_count' in response_summary:
-                    self.api_responses_text.insert(tk.END, f"API Failures: {response_summary['failure_count']}\n")
+                    entry.append(f"API Failures: {response_summary['failure_count']}\n")
 
             if failed_count > 0:
-                self.api_responses_text.insert(tk.END, f"❌ Failed Customers: {failed_count}\n")
+                entry.append(f"❌ Failed Customers: {failed_count}\n")
                 failed_customers = response_data.get('failed_customers', [])
                 if failed_customers:
-                    self.api_responses_text.insert(tk.END, f"Failed Customer Details (first 3):\n")
+                    entry.append(f"Failed Customer Details (first 3):\n")
                     for i, customer in enumerate(failed_customers[:3], 1):
-                        self.api_responses_text.insert(tk.END, f"  {i}. ID: {customer.get('customerId', 'Unknown')}\n")
-                        self.api_responses_text.insert(tk.END, f"     Username: {customer.get('username', 'Unknown')}\n")
-                        self.api_responses_text.insert(tk.END, f"     Error: {customer.get('error', 'Unknown error')}\n")
+                        entry.append(f"  {i}. ID: {customer.get('customerId', 'Unknown')}\n")
+                        entry.append(f"     Username: {customer.get('username', 'Unknown')}\n")
+                        entry.append(f"     Error: {customer.get('error', 'Unknown error')}\n")
 
                         # Show enhanced batch information if available
                         if 'batch_number' in customer:
-                            self.api_responses_text.insert(tk.END, f"     Batch: {customer.get('batch_number', 'Unknown')} of {customer.get('total_batches', 'Unknown')}\n")
+                            entry.append(f"     Batch: {customer.get('batch_number', 'Unknown')} of {customer.get('total_batches', 'Unknown')}\n")
                         if 'batch_size' in customer:
-                            self.api_responses_text.insert(tk.END, f"     Batch Size: {customer.get('batch_size', 'Unknown')} customers\n")
+                            entry.append(f"     Batch Size: {customer.get('batch_size', 'Unknown')} customers\n")
                         if 'source_file' in customer and customer.get('source_file') != 'unknown':
-                            self.api_responses_text.insert(tk.END, f"     Source File: {customer.get('source_file', 'Unknown')}\n")
+                            entry.append(f"     Source File: {customer.get('source_file', 'Unknown')}\n")
 
             # Show lightweight headers instead of full headers
             headers = response_data.get('response_headers', {})
             if headers:
-                self.api_responses_text.insert(tk.END, f"Headers: Content-Type: {headers.get('content-type', 'unknown')}, ")
-                self.api_responses_text.insert(tk.END, f"Size: {headers.get('content-length', 'unknown')}\n")
+                entry.append(f"Headers: Content-Type: {headers.get('content-type', 'unknown')}, ")
+                entry.append(f"Size: {headers.get('content-length', 'unknown')}\n")
             
-            self.api_responses_text.insert(tk.END, "-" * 80 + "\n\n")
+            entry.append("-" * 80 + "\n\n")
 
         elif response_data['type'] == 'batch_error':
-            self.api_responses_text.insert(tk.END, f"[{timestamp}] ❌ ERROR - Batch {response_data['batch_id']}\n")
-            self.api_responses_text.insert(tk.END, f"Status Code: {response_data['status_code']}\n")
-            self.api_responses_text.insert(tk.END, f"Customers: {response_data['customers_count']}\n")
-            self.api_responses_text.insert(tk.END, f"Attempt: {response_data['attempt']}/{response_data['max_retries']}\n")
+            entry.append(f"[{timestamp}] ❌ ERROR - Batch {response_data['batch_id']}\n")
+            entry.append(f"Status Code: {response_data['status_code']}\n")
+            entry.append(f"Customers: {response_data['customers_count']}\n")
+            entry.append(f"Attempt: {response_data['attempt']}/{response_data['max_retries']}\n")
+            if 'concurrency_limit' in response_data:
+                entry.append(f"Concurrency Target: {response_data['concurrency_limit']}\n")
             
             # Show response file and error summary instead of full error data
             response_file = response_data.get('response_file', 'not_saved')
-            self.api_responses_text.insert(tk.END, f"Response File: {response_file}\n")
+            entry.append(f"Response File: {response_file}\n")
             
             error_summary = response_data.get('error_summary', 'Unknown error')
-            self.api_responses_text.insert(tk.END, f"Error Summary: {error_summary}\n")
+            entry.append(f"Error Summary: {error_summary}\n")
             
             # Show lightweight headers
             headers = response_data.get('response_headers', {})
             if headers:
-                self.api_responses_text.insert(tk.END, f"Content-Type: {headers.get('content-type', 'unknown')}\n")
+                entry.append(f"Content-Type: {headers.get('content-type', 'unknown')}\n")
             
-            self.api_responses_text.insert(tk.END, "-" * 80 + "\n\n")
-
-        if self.auto_scroll_api.get():
-            self.api_responses_text.see(tk.END)
-
-        self.api_responses_text.config(state=tk.DISABLED)
+            entry.append("-" * 80 + "\n\n")
+
+        elif response_data['type'] == 'batch_deferred':
+            entry.append(f"[{timestamp}] 🔁 DEFERRED - Batch {response_data['batch_id']}\n")
+            entry.append(f"Customers: {response_data['customers_count']}\n")
+            entry.append(f"Deferred Pass: {response_data['deferred_pass']}/{response_data['deferred_passes']} "
+                                                   f"after {response_data['cool_down_seconds']:g}s\n")
+            entry.append(f"Error Summary: {response_data.get('error_summary', 'Unknown error')}\n")
+            entry.append("-" * 80 + "\n\n")
+
+        elif response_data['type'] == 'batch_stuck':
+            entry.append(f"[{timestamp}] ⏳ STUCK - Batch {response_data['batch_id']} attempt {response_data['attempt']}\n")
+            entry.append(f"In flight: {response_data['elapsed_seconds']:.0f}s (threshold {response_data['threshold_seconds']:.0f}s), "
+                                                   f"stuck {response_data['stuck_count']}x\n")
+            entry.append("-" * 80 + "\n\n")
+            self.log_message(f"⏳ Batch {response_data['batch_id']} has been in flight for {response_data['elapsed_seconds']:.0f}s - watchdog flagged it")
+
+        elif response_data['type'] == 'auth_health':
+            state = response_data['auth_state']
+            state_icon = {"down": "🔴", "degraded": "🟡"}.get(state, "🟢")
+            self.stats_labels['auth_state'].config(text=state)
+            entry.append(f"[{timestamp}] {state_icon} AUTH SERVICE {state.upper()} - {response_data['message']}\n")
+            entry.append("-" * 80 + "\n\n")
+            if state == "down":
+                self.log_message(f"🔴 Auth service down ({response_data['message']}) - import auto-paused until it recovers")
+            elif response_data.get('previous_state') == "down":
+                self.log_message("🟢 Auth service recovered - import auto-resumed")
+            # Keep the buttons in step with the engine's auto-pause/resume
+            if self.import_running:
+                self.pause_button.config(state=tk.DISABLED if response_data.get('is_paused') else tk.NORMAL)
+                self.resume_button.config(state=tk.NORMAL if response_data.get('is_paused') else tk.DISABLED)
+
+        elif response_data['type'] == 'circuit_state':
+            state = response_data['circuit_state']
+            state_icon = {"open": "🔴", "half_open": "🟡"}.get(state, "🟢")
+            self.stats_labels['circuit_state'].config(text=state.replace('_', '-'))
+            entry.append(f"[{timestamp}] {state_icon} CIRCUIT {state.replace('_', '-').upper()} - {response_data['reason']}\n")
+            entry.append("-" * 80 + "\n\n")
+            if state == "open":
+                self.log_message(f"🔴 Import endpoint failing ({response_data['reason']}) - dispatch paused until it recovers")
+            elif state == "closed" and response_data.get('previous_state') != "closed":
+                self.log_message("🟢 Import endpoint recovered - dispatch resumed")
+
+        if entry:
+            self.append_api_entry("".join(entry))
 
     def create_failed_customers_tab(self, parent):
         """Create failed customers tab"""
@@ -1457,7 +1851,8 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
 
         # Create Treeview for failed customers
         columns = ("Customer ID", "Username", "Error", "Timestamp", "Batch Info")
-        self.failed_customers_tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=20)
+        self.failed_customers_tree = ttk.Treeview(table_frame, columns=columns, show="headings",
+                                                  height=self.failed_visible_rows, selectmode="browse")
 
         # Configure column headings and widths
         self.failed_customers_tree.heading("Customer ID", text="Customer ID")
@@ -1472,43 +1867,191 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
         self.failed_customers_tree.column("Timestamp", width=150, minwidth=120)
         self.failed_customers_tree.column("Batch Info", width=200, minwidth=150)
 
-        # Add scrollbars
-        v_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.failed_customers_tree.yview)
+        # Add scrollbars - the vertical one scrolls failed_rows, the tree only holds the visible window
+        self.failed_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.scroll_failed_customers)
         h_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.failed_customers_tree.xview)
-        self.failed_customers_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.failed_customers_tree.configure(xscrollcommand=h_scrollbar.set)
 
         # Pack table and scrollbars
         self.failed_customers_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.failed_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
 
         # Add initial message
-        self.failed_customers_tree.insert("", tk.END, values=("No failed customers yet", "", "", "", ""))
+        self.failed_customers_tree.insert("", tk.END, iid="empty", values=("No failed customers yet", "", "", "", ""))
 
         # Bind double-click to show details
         self.failed_customers_tree.bind("<Double-1>", self.show_failed_customer_details)
 
+        # Scrolling and resizing move or resize the rendered window
+        self.failed_customers_tree.bind("<MouseWheel>", self.on_failed_customers_wheel)
+        self.failed_customers_tree.bind("<Button-4>", self.on_failed_customers_wheel)
+        self.failed_customers_tree.bind("<Button-5>", self.on_failed_customers_wheel)
+        self.failed_customers_tree.bind("<Configure>", self.on_failed_customers_resize)
+
+    def format_failed_customer_row(self, customer, import_type):
+        """Display values for one failed customer record"""
+        customer_id = customer.get('customerId', 'Unknown')
+        username = customer.get('username', 'Unknown')
+
+        # If API didn't provide ID, try to get it from originalData
+        if customer_id in ['Unknown', 'None', None]:
+            original_data = customer.get('originalData')
+            if original_data:
+                if import_type == "households":
+                    customer_id = original_data.get('householdId', 'Unknown')
+                else:
+                    person_data = original_data.get('person', original_data)
+                    customer_id = person_data.get('customerId', 'Unknown')
+
+        error = customer.get('error', 'Unknown error')
+        timestamp = customer.get('timestamp', 'Unknown')
+        batch_info = customer.get('batchInfo', 'Unknown')
+
+        # Truncate long error messages for display
+        if len(error) > 50:
+            error = error[:47] + "..."
+
+        # Format timestamp for display
+        if timestamp != 'Unknown':
+            try:
+                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                timestamp = dt.strftime('%Y-%m-%d %H:%M:%S')
+            except:
+                pass  # Keep original timestamp if parsing fails
+
+        return (customer_id, username, error, timestamp, batch_info)
+
+    def append_failed_customers(self, failed_customers):
+        """Add failed customer records to the view model, following the tail if it was in view"""
+        if not failed_customers:
+            return
+        at_end = self.failed_view_start + self.failed_visible_rows >= len(self.failed_rows)
+        import_type = self.import_type.get()
+        self.failed_rows.extend((self.format_failed_customer_row(customer, import_type), customer)
+                                for customer in failed_customers)
+        if at_end:
+            self.failed_view_start = max(0, len(self.failed_rows) - self.failed_visible_rows)
+
+    def reset_failed_customers_view(self):
+        """Empty the view model and forget the importer it was following"""
+        if self.failed_refresh_job is not None:
+            self.root.after_cancel(self.failed_refresh_job)
+            self.failed_refresh_job = None
+        self.failed_rows = []
+        self.failed_cursor = 0
+        self.failed_source = None
+        self.failed_view_start = 0
+        if hasattr(self, 'failed_customers_tree'):
+            self.render_failed_customers()
+
+    def pull_failed_customers(self):
+        """
+        Append the failures recorded since the last pull
+
+        Returns:
+            Number of new failed customers
+        """
+        importer = self.current_importer or self.last_importer
+        if importer is None:
+            return 0
+        if importer is not self.failed_source:
+            self.reset_failed_customers_view()
+            self.failed_source = importer
+        new_failed, self.failed_cursor = importer.get_failed_customers_since(self.failed_cursor)
+        self.append_failed_customers(new_failed)
+        return len(new_failed)
+
+    def schedule_failed_customers_refresh(self):
+        """Debounced auto-refresh - API responses arriving in between share one pull"""
+        if self.failed_refresh_job is None:
+            self.failed_refresh_job = self.root.after(FAILED_REFRESH_DEBOUNCE_MS, self.flush_failed_customers_refresh)
+
+    def flush_failed_customers_refresh(self):
+        """Pull new failures now and redraw the visible window"""
+        if self.failed_refresh_job is not None:
+            self.root.after_cancel(self.failed_refresh_job)
+            self.failed_refresh_job = None
+        try:
+            if self.pull_failed_customers():
+                self.render_failed_customers()
+        except Exception as e:
+            self.log_message(f"Error updating failed customers: {e}")
+
+    def render_failed_customers(self):
+        """Show the visible window of the view model in the tree"""
+        tree = self.failed_customers_tree
+        total = len(self.failed_rows)
+        self.failed_count_label.config(text=f"Total: {total}")
+
+        if total == 0:
+            tree.delete(*tree.get_children())
+            tree.insert("", tk.END, iid="empty", values=("No failed customers", "", "", "", ""))
+            self.failed_scrollbar.set(0.0, 1.0)
+            return
+
+        start = max(0, min(self.failed_view_start, total - self.failed_visible_rows))
+        self.failed_view_start = start
+        end = min(total, start + self.failed_visible_rows)
+
+        # Reuse the row items - only values change while scrolling
+        rows = [iid for iid in tree.get_children() if iid != "empty"]
+        if tree.exists("empty"):
+            tree.delete("empty")
+        for index in range(len(rows), end - start):
+            tree.insert("", tk.END, iid=f"row{index}")
+        if len(rows) > end - start:
+            tree.delete(*rows[end - start:])
+        for index in range(end - start):
+            tree.item(f"row{index}", values=self.failed_rows[start + index][0])
+
+        self.failed_scrollbar.set(start / total, end / total)
+
+    def scroll_failed_customers(self, action, amount, unit=None):
+        """Scrollbar command for the virtual rows (moveto fraction / scroll n units|pages)"""
+        total = len(self.failed_rows)
+        if action == "moveto":
+            start = int(float(amount) * total)
+        else:
+            step = self.failed_visible_rows if unit == "pages" else 1
+            start = self.failed_view_start + int(amount) * step
+        start = max(0, min(start, total - self.failed_visible_rows))
+        if start != self.failed_view_start:
+            self.failed_view_start = start
+            self.failed_customers_tree.selection_set(())
+            self.render_failed_customers()
+
+    def on_failed_customers_wheel(self, event):
+        """Mouse wheel scrolls the virtual rows"""
+        direction = -1 if event.num == 4 or getattr(event, 'delta', 0) > 0 else 1
+        self.scroll_failed_customers("scroll", direction * 3, "units")
+        return "break"
+
+    def on_failed_customers_resize(self, event):
+        """Match the number of rendered rows to the tree height"""
+        try:
+            row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        except (tk.TclError, ValueError):
+            row_height = 20
+        visible = max(1, event.height // row_height - 1)  # minus the heading row
+        if visible != self.failed_visible_rows:
+            self.failed_visible_rows = visible
+            if self.failed_rows:
+                self.render_failed_customers()
+
     def refresh_failed_customers(self):
-        """Refresh the failed customers display"""
+        """Reload the failed customers display (from the running import, else the latest saved file)"""
         try:
-            # Clear existing items
-            for item in self.failed_customers_tree.get_children():
-                self.failed_customers_tree.delete(item)
+            self.reset_failed_customers_view()
 
-            # Get failed customers from current importer
-            failed_customers = []
             if self.current_importer:
                 try:
-                    failed_info = self.current_importer.get_failed_customers_summary()
-                    if failed_info['total_failed'] > 0:
-                        # Get the actual failed customers list
-                        with self.current_importer.failed_customers_lock:
-                            failed_customers = self.current_importer.failed_customers.copy()
+                    self.pull_failed_customers()
                 except Exception as e:
                     self.log_message(f"Error getting failed customers from importer: {e}")
 
             # Also try to load from failed items file
-            if not failed_customers:
+            if not self.failed_rows and not self.current_importer:
                 # Look for both timestamped and non-timestamped failed items files
                 # Determine directory based on import type
                 import_type = self.import_type.get()
@@ -1519,9 +2062,9 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
 
                 if os.path.exists(failed_items_dir):
                     try:
-                        # Find all failed items JSON files
+                        # Find all failed items JSON files and in-progress JSONL journals
                         for filename in os.listdir(failed_items_dir):
-                            if filename.startswith(f'failed_{item_name}') and filename.endswith('.json'):
+                            if filename.startswith(f'failed_{item_name}') and filename.endswith(('.json', '.jsonl')):
                                 filepath = os.path.join(failed_items_dir, filename)
                                 if os.path.isfile(filepath):
                                     failed_customers_files.append(filepath)
@@ -1533,57 +2076,19 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
                         if failed_customers_files:
                             failed_customers_file = failed_customers_files[0]
                             self.log_message(f"Loading failed customers from: {failed_customers_file}")
-                            with open(failed_customers_file, 'r', encoding='utf-8') as f:
-                                failed_customers = json.load(f)
+                            if failed_customers_file.endswith('.jsonl'):
+                                failed_customers = FailedCustomerJournal.read_entries(failed_customers_file)
+                            else:
+                                with open(failed_customers_file, 'r', encoding='utf-8') as f:
+                                    failed_customers = json_codec.load(f)
+                            self.append_failed_customers(failed_customers)
 
                     except Exception as e:
                         self.log_message(f"Error loading failed customers file: {e}")
 
-            # Update count label
-            total_failed = len(failed_customers)
-            self.failed_count_label.config(text=f"Total: {total_failed}")
-
-            if total_failed == 0:
-                self.failed_customers_tree.insert("", tk.END, values=("No failed customers", "", "", "", ""))
-            else:
-                # Add failed customers to tree
-                import_type = self.import_type.get()
-                for customer in failed_customers:
-                    customer_id = customer.get('customerId', 'Unknown')
-                    username = customer.get('username', 'Unknown')
-                    
-                    # If API didn't provide ID, try to get it from originalData
-                    if customer_id in ['Unknown', 'None', None]:
-                        original_data = customer.get('originalData')
-                        if original_data:
-                            if import_type == "households":
-                                customer_id = original_data.get('householdId', 'Unknown')
-                            else:
-                                person_data = original_data.get('person', original_data)
-                                customer_id = person_data.get('customerId', 'Unknown')
-                    
-                    error = customer.get('error', 'Unknown error')
-                    timestamp = customer.get('timestamp', 'Unknown')
-                    batch_info = customer.get('batchInfo', 'Unknown')
-
-                    # Truncate long error messages for display
-                    if len(error) > 50:
-                        error = error[:47] + "..."
-
-                    # Format timestamp for display
-                    if timestamp != 'Unknown':
-                        try:
-                            from datetime import datetime
-                            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                            timestamp = dt.strftime('%Y-%m-%d %H:%M:%S')
-                        except:
-                            pass  # Keep original timestamp if parsing fails
-
-                    self.failed_customers_tree.insert("", tk.END, values=(
-                        customer_id, username, error, timestamp, batch_info
-                    ))
-
-            self.log_message(f"Refreshed failed customers display: {total_failed} failed customers")
+            self.failed_view_start = 0
+            self.render_failed_customers()
+            self.log_message(f"Refreshed failed customers display: {len(self.failed_rows)} failed customers")
 
         except Exception as e:
             self.log_message(f"Error refreshing failed customers: {e}")
@@ -1604,10 +2109,15 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
             # Also try to load from file if no current importer data
             if not failed_customers:
                 failed_customers_file = "failed_customers/failed_customers.json"
-                if os.path.exists(failed_customers_file):
+                journal_file = "failed_customers/failed_customers.jsonl"
+                if os.path.exists(failed_customers_file) or os.path.exists(journal_file):
                     try:
-                        with open(failed_customers_file, 'r', encoding='utf-8') as f:
-                            failed_customers = json.load(f)
+                        if not os.path.exists(failed_customers_file):
+                            # Run still in progress - read the journal directly
+                            failed_customers = FailedCustomerJournal.read_entries(journal_file)
+                        else:
+                            with open(failed_customers_file, 'r', encoding='utf-8') as f:
+                                failed_customers = json_codec.load(f)
                     except Exception as e:
                         self.log_message(f"Error loading failed customers file: {e}")
 
@@ -1640,7 +2150,7 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
                 else:
                     # Export as JSON
                     with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(failed_customers, f, indent=2, ensure_ascii=False)
+                        json_codec.dump(failed_customers, f, pretty=True)
 
                 messagebox.showinfo("Success", f"Failed customers exported to {file_path}")
                 self.log_message(f"Exported {len(failed_customers)} failed customers to {file_path}")
@@ -1660,15 +2170,12 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
             try:
                 # Clear from current importer
                 if self.current_importer:
-                    with self.current_importer.failed_customers_lock:
-                        self.current_importer.failed_customers.clear()
+                    self.current_importer.clear_failed_customers()
 
-                # Clear the display
-                for item in self.failed_customers_tree.get_children():
-                    self.failed_customers_tree.delete(item)
-
-                self.failed_customers_tree.insert("", tk.END, values=("No failed customers", "", "", "", ""))
-                self.failed_count_label.config(text="Total: 0")
+                # Clear the display (keep following the importer from its now empty list)
+                source = self.failed_source
+                self.reset_failed_customers_view()
+                self.failed_source = source
 
                 self.log_message("Cleared failed customers data")
                 messagebox.showinfo("Success", "Failed customers data cleared")
@@ -1683,26 +2190,16 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
         if not selection:
             return
 
-        item = self.failed_customers_tree.item(selection[0])
-        values = item['values']
-
-        if len(values) < 5 or values[0] == "No failed customers":
+        if not selection[0].startswith("row"):
             return
 
+        # Rendered rows map onto the view model through the window offset
+        index = self.failed_view_start + int(selection[0][3:])
+        if index >= len(self.failed_rows):
+            return
+        values, failed_customer = self.failed_rows[index]
         customer_id = values[0]
 
-        # Find the full customer data
-        failed_customer = None
-        if self.current_importer:
-            try:
-                with self.current_importer.failed_customers_lock:
-                    for customer in self.current_importer.failed_customers:
-                        if customer.get('customerId') == customer_id:
-                            failed_customer = customer
-                            break
-            except Exception as e:
-                self.log_message(f"Error getting customer details: {e}")
-
         if not failed_customer:
             messagebox.showinfo("No Details", f"No detailed information available for customer {customer_id}")
             return
@@ -1731,7 +2228,7 @@ Check the RETRY_INSTRUCTIONS.md file in the retry directory for detailed instruc
         if failed_customer.get('originalData'):
             details += "ORIGINAL CUSTOMER DATA:\n"
             details += "-" * 30 + "\n"
-            details += json.dumps(failed_customer['originalData'], indent=2, ensure_ascii=False)
+            details += json_codec.dumps(failed_customer['originalData'], pretty=True)
 
         details_text.insert(tk.END, details)
         details_text.config(state=tk.DISABLED)
@@ -1,15 +1,31 @@
-import json
+import json_codec
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 import os
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import queue
 import gc
+import gzip
+import heapq
+import re
+from collections import deque
+from itertools import islice
 from auth_manager import AuthenticationManager
+from json_stream import RecordIndexCache
+from flow_control import TokenBucketRateLimiter, AdaptiveConcurrencyController, RetryPolicy, CircuitBreaker
+from import_journal import ProgressLedger, FailedCustomerJournal
+from batch_identity import BatchIdentityIndex
+from persistence import PersistenceWriter
+from response_archive import ResponseArchive, ResponsePersistencePolicy
+from batch_pipeline import BatchPrefetcher
+from batch_watchdog import BatchWatchdog
+from auth_health import AuthHealthMonitor, is_service_down_error
+from progress_stream import ProgressStream
 
 class BulkCustomerImporter:
     def __init__(self,
@@ -29,7 +45,52 @@ class BulkCustomerImporter:
                  password: str = None,
                  use_auto_auth: bool = False,
                  client_id: str = None,
-                 failed_customers_file: str = "failed_customers.json"):
+                 failed_customers_file: str = "failed_customers.json",
+                 use_index_sidecar: bool = True,
+                 planning_workers: int = 4,
+                 http_pool_connections: int = 2,
+                 http_pool_maxsize: int = 2,
+                 prewarm_connections: bool = True,
+                 requests_per_second: float = None,
+                 records_per_second: float = None,
+                 burst: int = 1,
+                 rate_limiter: TokenBucketRateLimiter = None,
+                 adaptive_concurrency: bool = False,
+                 min_workers: int = 1,
+                 initial_workers: int = None,
+                 latency_target_ms: float = None,
+                 dispatch_window: int = None,
+                 progress_ledger: bool = True,
+                 resume_from_ledger: bool = True,
+                 write_behind: bool = True,
+                 persistence_queue_size: int = 256,
+                 response_persistence: str = "all",
+                 response_sample_rate: float = 0.1,
+                 prefetch_batches: int = None,
+                 compress_requests: bool = False,
+                 compression_level: int = 6,
+                 retry_base_delay: float = 1.0,
+                 retry_max_delay: float = 60.0,
+                 retry_budget_ratio: float = 0.2,
+                 retry_policy: RetryPolicy = None,
+                 circuit_breaker: bool = True,
+                 circuit_failure_rate: float = 0.5,
+                 circuit_min_requests: int = 10,
+                 circuit_open_seconds: float = 30.0,
+                 connect_timeout: float = 10.0,
+                 read_timeout: float = 300.0,
+                 stuck_batch_watchdog: bool = True,
+                 stuck_threshold_seconds: float = 30.0,
+                 quarantine_after_stuck: int = 2,
+                 deferred_retry_passes: int = 1,
+                 deferred_retry_delay: float = 30.0,
+                 token_cache: bool = False,
+                 token_cache_path: str = None,
+                 auth_check_interval: float = 300.0,
+                 auth_recovery_interval: float = 15.0,
+                 progress_interval: float = 0.0,
+                 progress_details: bool = False,
+                 progress_detail_limit: int = 20):
         
         self.mode = mode.upper()
         self.environment = environment.lower()  # "dev" or "prod"
@@ -37,7 +98,10 @@ class BulkCustomerImporter:
         
         # Determine data key based on import type
         self.data_key = "households" if self.import_type == "households" else "data"
-        
+
+        # Byte-offset record indexes so lazy batches decode only their own slice
+        self.record_indexes = RecordIndexCache(self.data_key, use_sidecar=use_index_sidecar)
+
         # Set API URL default based on mode, environment, and import type if not provided
         if api_url is None:
             if self.mode == "C4R":
@@ -59,10 +123,101 @@ class BulkCustomerImporter:
             
         self.batch_size = batch_size
         self.max_workers = max_workers
+        self.planning_workers = planning_workers
+        # Batches queued or in flight at once (bounds memory and stop/pause latency)
+        self.dispatch_window = max(1, dispatch_window or max_workers * 2)
+        # Batches read and encoded ahead of the workers (0 = workers load their own batches)
+        self.prefetch_batches = max_workers if prefetch_batches is None else max(0, prefetch_batches)
+
+        # Optional gzip request bodies (Content-Encoding: gzip), switched off if the server answers 415
+        self.compress_requests = compress_requests
+        self.compression_level = min(9, max(1, int(compression_level)))
+        # requests/gzip_requests count POSTs; raw_bytes is JSON delivered, sent_bytes everything put on the wire
+        self.compression_stats = {'requests': 0, 'gzip_requests': 0, 'raw_bytes': 0, 'sent_bytes': 0}
+        self.compression_lock = threading.Lock()
         self.delay_between_requests = delay_between_requests
         self.max_retries = max_retries
         self.progress_callback = progress_callback
 
+        # Coalesced progress - with progress_interval the callback receives one snapshot per interval
+        # instead of one call per event; per-batch events ride along only with progress_details
+        self.progress_stream = None
+        if progress_callback and progress_interval and progress_interval > 0:
+            self.progress_stream = ProgressStream(
+                progress_callback,
+                status_provider=self.get_progress_status,
+                interval=progress_interval,
+                include_details=progress_details,
+                detail_limit=progress_detail_limit
+            )
+
+        # Rate limiting - token bucket shared by all workers (requests/s and records/s)
+        if rate_limiter is None:
+            if requests_per_second is None and delay_between_requests and delay_between_requests > 0:
+                # Legacy setting: one request every delay_between_requests seconds
+                requests_per_second = 1.0 / delay_between_requests
+            rate_limiter = TokenBucketRateLimiter(
+                requests_per_second=requests_per_second,
+                records_per_second=records_per_second,
+                burst=burst
+            )
+        self.rate_limiter = rate_limiter
+
+        # Retry policy - status classification, Retry-After, jittered backoff and a retry budget shared by all workers
+        if retry_policy is None:
+            retry_policy = RetryPolicy(
+                base_delay=retry_base_delay,
+                max_delay=retry_max_delay,
+                budget_ratio=retry_budget_ratio
+            )
+        self.retry_policy = retry_policy
+
+        # Adaptive concurrency (AIMD) - max_workers becomes the upper bound on in-flight batches;
+        # the limit slow-starts at initial_workers (default half of max_workers) and grows while healthy
+        self.adaptive_concurrency = adaptive_concurrency
+        self.concurrency = None
+        if adaptive_concurrency:
+            self.concurrency = AdaptiveConcurrencyController(
+                min_limit=min_workers,
+                max_limit=max_workers,
+                initial_limit=initial_workers,
+                latency_target_ms=latency_target_ms,
+                on_change=self._on_concurrency_change
+            )
+
+        # Circuit breaker - waits out sustained 5xx/transport failures instead of burning every batch's retries
+        self.circuit = None
+        if circuit_breaker:
+            self.circuit = CircuitBreaker(
+                failure_rate=circuit_failure_rate,
+                min_requests=circuit_min_requests,
+                window_size=max(20, circuit_min_requests),
+                open_seconds=circuit_open_seconds,
+                on_change=self._on_circuit_change
+            )
+
+        # Per-attempt deadlines (None = wait forever); a timed out attempt is retried like any transport error
+        self.connect_timeout = connect_timeout or None
+        self.read_timeout = read_timeout or None
+        self.request_timeout = (self.connect_timeout, self.read_timeout) if (self.connect_timeout or self.read_timeout) else None
+
+        # Watchdog for attempts in flight far longer than the p99; batches stuck quarantine_after_stuck times are quarantined
+        self.quarantine_after_stuck = max(1, int(quarantine_after_stuck))
+        self.quarantined_batches = 0
+        self.watchdog = None
+        if stuck_batch_watchdog:
+            self.watchdog = BatchWatchdog(
+                min_threshold=stuck_threshold_seconds,
+                initial_threshold=max(120.0, stuck_threshold_seconds),
+                on_stuck=self._on_batch_stuck
+            )
+
+        # In-run deferred retries - batches that exhaust max_retries are re-queued behind fresh work after a cool-down
+        self.deferred_retry_passes = max(0, int(deferred_retry_passes))
+        self.deferred_retry_delay = max(0.0, deferred_retry_delay)
+        self.deferred_passes = {}  # batch_id -> deferred passes used
+        self.deferred_stats = {'deferred': 0, 'recovered': 0}
+
         # Create failed items directory based on import type
         item_name = "households" if self.import_type == "households" else "customers"
         self.failed_items_dir = f"failed_{item_name}"
@@ -77,14 +232,38 @@ class BulkCustomerImporter:
             # If directory already specified, use as-is
             self.failed_customers_file = failed_customers_file
 
-        # Failed customers tracking
+        # Durable per-plan progress ledger for crash-safe resume
+        self.progress_ledger = progress_ledger
+        self.resume_from_ledger = resume_from_ledger
+        self.ledger_dir = os.path.join(self.failed_items_dir, "progress_ledgers")
+        self.ledger = None
+
+        # Failed customers tracking - appended to a JSONL journal, consolidated JSON written on demand
         self.failed_customers = []
         self.failed_customers_lock = threading.Lock()
+        self.failed_customers_journal = FailedCustomerJournal(self.failed_customers_file)
+        self.single_failures_lock = threading.Lock()
         
         # API response logging to files
         self.api_responses_dir = "api_responses"
         os.makedirs(self.api_responses_dir, exist_ok=True)
-        self.response_file_lock = threading.Lock()
+        # Compressed per-run archive (api_responses/run_<timestamp>/), opened on the first response
+        self.response_archive: Optional[ResponseArchive] = None
+        self.response_archive_lock = threading.Lock()
+        self.response_archive_stats = {'records': 0, 'bytes': 0}
+        # Which responses are archived in full: "all", "failures" or "sampled" (failures + sample of clean successes)
+        self.response_policy = ResponsePersistencePolicy(response_persistence, response_sample_rate)
+
+        # Write-behind persistence for responses and failure artifacts (runs during import_customers)
+        self.write_behind = write_behind
+        self.persistence = PersistenceWriter(max_queue=persistence_queue_size)
+
+        # Keep-alive HTTP sessions, one per worker thread (shared with token refresh)
+        self.http_pool_connections = http_pool_connections
+        self.http_pool_maxsize = http_pool_maxsize
+        self.prewarm_connections = prewarm_connections
+        self.http_sessions = {}
+        self.http_sessions_lock = threading.Lock()
 
         # Authentication setup
         if use_auto_auth:
@@ -96,7 +275,10 @@ class BulkCustomerImporter:
                 password=password,
                 gk_passport=gk_passport,
                 auth_url=auth_url,  # Pass configurable auth URL
-                client_id=client_id
+                client_id=client_id,
+                session_provider=self._get_http_session,  # Reuse the worker's pooled session
+                token_cache=token_cache,  # Share tokens with earlier runs and parallel processes
+                token_cache_path=token_cache_path
             )
             self.auth_token = None  # Will be managed automatically
             self.gk_passport = gk_passport if self.mode == "C4R" else None
@@ -106,11 +288,19 @@ class BulkCustomerImporter:
             self.auth_token = auth_token
             self.gk_passport = gk_passport if self.mode == "C4R" else None
 
-        # Authentication monitoring
+        # Authentication monitoring - one background monitor checks the auth service; workers only read its state
         self.auth_failures = []
         self.auth_service_down = False
-        self.last_auth_check = None
-        self.auth_check_interval = 300  # Check auth service every 5 minutes
+        self.auth_outages = 0
+        self.auth_auto_paused = False
+        self.auth_monitor = None
+        if self.auth_manager:
+            self.auth_monitor = AuthHealthMonitor(
+                probe=self.check_auth_service_health,
+                interval=auth_check_interval,
+                recovery_interval=auth_recovery_interval,
+                on_change=self._on_auth_health_change
+            )
 
         # Import control
         self.should_stop = False
@@ -118,7 +308,7 @@ class BulkCustomerImporter:
         self.pause_event = threading.Event()
         self.pause_event.set()  # Start unpaused
         self.processed_batches = 0
-        self.remaining_batches = []
+        self.remaining_batches = {}  # batch_id -> lazy batch not yet completed
 
         # Setup logging FIRST (before any methods that use self.logger)
         # Configure handlers with UTF-8 encoding to handle emoji characters
@@ -209,10 +399,37 @@ The structure helps organize failures by type for easier handling and retry.
         self.completed_batches = 0
         self.failed_batches = []
         self.lock = threading.Lock()
-        
-        # Rate limiting
-        self.last_request_time = 0
-        self.rate_limit_lock = threading.Lock()
+
+    def _get_http_session(self) -> requests.Session:
+        """Return the calling thread's keep-alive session, creating it on first use"""
+        thread_id = threading.get_ident()
+        with self.http_sessions_lock:
+            session = self.http_sessions.get(thread_id)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.http_pool_connections,
+                    pool_maxsize=self.http_pool_maxsize
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.http_sessions[thread_id] = session
+            return session
+
+    def _prewarm_http_session(self):
+        """Open the TCP/TLS connection for this worker thread before the first batch"""
+        try:
+            self._get_http_session().head(self.api_url, timeout=10)
+        except requests.exceptions.RequestException as e:
+            self.logger.debug(f"[HTTP] Connection pre-warm failed (will connect on first batch): {e}")
+
+    def close_http_sessions(self):
+        """Close all pooled sessions and their connections"""
+        with self.http_sessions_lock:
+            sessions = list(self.http_sessions.values())
+            self.http_sessions.clear()
+        for session in sessions:
+            session.close()
 
     def test_authentication(self) -> Dict[str, Any]:
         """Test authentication (works with both manual and automatic modes)"""
@@ -263,7 +480,7 @@ The structure helps organize failures by type for easier handling and retry.
             }
 
     def check_auth_service_health(self) -> Dict[str, Any]:
-        """Check if authentication service is healthy"""
+        """Check if authentication service is healthy (the probe run by the auth health monitor)"""
         if not self.auth_manager:
             return {'healthy': True, 'message': 'Manual auth mode - no service check needed'}
 
@@ -272,8 +489,6 @@ The structure helps organize failures by type for easier handling and retry.
             result = self.auth_manager.test_authentication()
 
             if result['success']:
-                self.auth_service_down = False
-                self.last_auth_check = datetime.now()
                 return {
                     'healthy': True,
                     'message': 'Auth service is healthy',
@@ -281,26 +496,15 @@ The structure helps organize failures by type for easier handling and retry.
                 }
             else:
                 # Check if it's a service down error (503, 502, 504)
-                error_msg = result.get('error', '').lower()
-                if any(code in error_msg for code in ['503', '502', '504', 'service unavailable', 'bad gateway', 'timeout']):
-                    self.auth_service_down = True
-                    self.logger.error(f"[AUTH SERVICE DOWN] {result.get('error')}")
-                    return {
-                        'healthy': False,
-                        'service_down': True,
-                        'message': f"Auth service is down: {result.get('error')}",
-                        'error': result.get('error')
-                    }
-                else:
-                    return {
-                        'healthy': False,
-                        'service_down': False,
-                        'message': f"Auth service error: {result.get('error')}",
-                        'error': result.get('error')
-                    }
+                service_down = is_service_down_error(result.get('error', ''))
+                return {
+                    'healthy': False,
+                    'service_down': service_down,
+                    'message': f"Auth service {'is down' if service_down else 'error'}: {result.get('error')}",
+                    'error': result.get('error')
+                }
 
         except Exception as e:
-            self.auth_service_down = True
             self.logger.error(f"[AUTH SERVICE CHECK FAILED] {e}")
             return {
                 'healthy': False,
@@ -309,20 +513,55 @@ The structure helps organize failures by type for easier handling and retry.
                 'error': str(e)
             }
 
-    def should_check_auth_service(self) -> bool:
-        """Check if we should perform an auth service health check"""
-        if not self.auth_manager:
-            return False
+    def _on_auth_health_change(self, old_state: str, new_state: str, message: str):
+        """Drive the auth_service_down auto-pause and auto-resume from monitor transitions"""
+        if new_state == AuthHealthMonitor.DOWN:
+            self.auth_service_down = True
+            self.auth_outages += 1
+            self.logger.error(f"[AUTH SERVICE DOWN] {message}")
+            if not self.is_paused and not self.should_stop:
+                self.logger.error("[ALERT] AUTO-PAUSING due to auth service being down")
+                self.auth_auto_paused = True
+                self.pause_import()
+        elif new_state == AuthHealthMonitor.DEGRADED:
+            self.logger.warning(f"[AUTH HEALTH] Auth service degraded: {message}")
+        else:
+            self.logger.info(f"[AUTH HEALTH] Auth service healthy again ({message})")
 
-        if not self.last_auth_check:
-            return True
+        if new_state != AuthHealthMonitor.DOWN and self.auth_service_down:
+            self.auth_service_down = False
+            if self.auth_auto_paused:
+                self.auth_auto_paused = False
+                if self.is_paused and not self.should_stop:
+                    self.logger.info("[ALERT] AUTO-RESUMING - auth service recovered")
+                    self.resume_import()
 
-        time_since_check = (datetime.now() - self.last_auth_check).total_seconds()
-        return time_since_check >= self.auth_check_interval
+        if hasattr(self, 'progress_callback') and self.progress_callback:
+            self._emit_progress({
+                'type': 'auth_health',
+                'auth_state': new_state,
+                'previous_state': old_state,
+                'message': str(message)[:200],
+                'is_paused': self.is_paused
+            })
+
+    def _wait_for_auth_service(self, batch_id: int) -> bool:
+        """Hold a batch while the auth service is down; False if the import was stopped meanwhile"""
+        if not self.auth_monitor:
+            return True
+        logged = False
+        while not self.auth_monitor.wait_until_up(timeout=0.5):
+            if self.should_stop:
+                return False
+            if not logged:
+                self.logger.info(f"[AUTH SERVICE DOWN] Batch {batch_id} waiting for the auth service to recover...")
+                logged = True
+        return True
 
     def stop_import(self):
         """Stop the import process gracefully"""
         self.should_stop = True
+        self.pause_event.set()  # Wake paused workers so they can return as stopped
         self.logger.info("[STOP] STOP REQUESTED - Import will stop after current batches complete")
 
     def pause_import(self):
@@ -333,6 +572,7 @@ The structure helps organize failures by type for easier handling and retry.
 
     def resume_import(self):
         """Resume the paused import process"""
+        self.auth_auto_paused = False  # A manual resume hands pause control back to the user
         if self.is_paused:
             self.is_paused = False
             self.pause_event.set()
@@ -345,14 +585,38 @@ The structure helps organize failures by type for easier handling and retry.
             'is_paused': self.is_paused,
             'processed_batches': self.processed_batches,
             'remaining_batches': len(self.remaining_batches),
-            'auth_service_down': self.auth_service_down
+            'auth_service_down': self.auth_service_down,
+            'auth_state': self.auth_monitor.state if self.auth_monitor else "manual",
+            'concurrency_limit': self.get_concurrency_limit(),
+            'circuit_state': self.get_circuit_state(),
+            'stuck_batches': self.watchdog.snapshot()['stuck_in_flight'] if self.watchdog else 0
         }
     
+    def get_progress_status(self) -> Dict[str, Any]:
+        """Import status plus the counters progress snapshots report"""
+        status = self.get_import_status()
+        with self.failed_customers_lock:
+            failed_customers_cursor = len(self.failed_customers)
+        status.update({
+            'total_batches': self.total_batches,
+            'completed_batches': self.completed_batches,
+            'failed_batches': len(self.failed_batches),
+            'failed_customers_cursor': failed_customers_cursor
+        })
+        return status
+
+    def _emit_progress(self, event: Dict[str, Any]) -> None:
+        """Hand an event to the progress stream, or straight to the callback without one"""
+        if self.progress_stream and self.progress_stream.running:
+            self.progress_stream.record(event)
+        elif self.progress_callback:
+            self.progress_callback(event)
+
     def load_customer_data(self, file_path: str) -> List[Dict[Any, Any]]:
         """Load customer/household data from JSON file"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                data = json_codec.load(f)
                 return data.get(self.data_key, [])
         except Exception as e:
             self.logger.error(f"Error loading file {file_path}: {e}")
@@ -373,39 +637,142 @@ The structure helps organize failures by type for easier handling and retry.
             start_idx = lazy_batch_info['start_idx']
             end_idx = lazy_batch_info['end_idx']
 
-            # Load only the items we need for this batch (customers or households)
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                all_items = data.get(self.data_key, [])
+            # Read and decode only this batch's byte range using the record index
+            try:
+                record_index = self.record_indexes.get(file_path)
+                return record_index.read_records(start_idx, end_idx)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"[INDEX] Could not index {file_path} ({e}) - falling back to full file parse")
 
-                # Extract only the slice we need
-                batch_items = all_items[start_idx:end_idx]
-                return batch_items
+            return self._load_lazy_batch_full_parse(lazy_batch_info)
 
         except Exception as e:
             self.logger.error(f"Error loading lazy batch from {lazy_batch_info.get('file_path', 'unknown')}: {e}")
             return []
 
+    def _load_lazy_batch_full_parse(self, lazy_batch_info: Dict[str, Any]) -> List[Dict[Any, Any]]:
+        """Fallback: load the whole file and slice the items we need (customers or households)"""
+        with open(lazy_batch_info['file_path'], 'r', encoding='utf-8') as f:
+            data = json_codec.load(f)
+        all_items = data.get(self.data_key, [])
+
+        # Extract only the slice we need
+        return all_items[lazy_batch_info['start_idx']:lazy_batch_info['end_idx']]
+
+    def _encode_payload(self, batch: List[Dict[Any, Any]]) -> bytes:
+        """Request body for already decoded records"""
+        return json_codec.dumps_bytes({self.data_key: batch})
+
+    def _compress_body(self, body: bytes) -> bytes:
+        """gzip a request body (mtime fixed so identical bodies compress identically)"""
+        return gzip.compress(body, compresslevel=self.compression_level, mtime=0)
+
+    def _prepared(self, records: List[Dict[Any, Any]], body: bytes) -> Dict[str, Any]:
+        prepared = {'records': records, 'body': body}
+        if self.compress_requests:
+            prepared['gzip_body'] = self._compress_body(body)
+        return prepared
+
+    def prepare_lazy_batch(self, lazy_batch_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Load a lazy batch and build its request body once
+
+        With a record index the body wraps the records' raw bytes from the source file,
+        so nothing is re-encoded; the records are still decoded for failure matching.
+        With compress_requests the gzip body is built here too, so retries never recompress.
+
+        Returns:
+            {'records': [...], 'body': bytes[, 'gzip_body': bytes]}, or None if the batch could not be loaded
+        """
+        file_path = lazy_batch_info['file_path']
+        try:
+            raw = self.record_indexes.get(file_path).read_raw(lazy_batch_info['start_idx'], lazy_batch_info['end_idx'])
+            if raw:
+                return self._prepared(
+                    json_codec.loads(b'[' + raw + b']'),
+                    b'{"' + self.data_key.encode('utf-8') + b'":[' + raw + b']}'
+                )
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"[INDEX] Could not index {file_path} ({e}) - falling back to full file parse")
+
+        try:
+            batch = self._load_lazy_batch_full_parse(lazy_batch_info)
+        except Exception as e:
+            self.logger.error(f"Error loading lazy batch from {file_path}: {e}")
+            return None
+        if not batch:
+            return None
+        return self._prepared(batch, self._encode_payload(batch))
+
+    # Per-item results the API reports as imported
+    SUCCESS_RESULTS = ('SUCCESS', 'OK', 'IMPORTED', 'ACCEPTED')
+    # customerId/username/result triples inside raw (non-JSON) response text
+    REGEX_FAILURE_PATTERN = re.compile(r'"customerId":\s*"([^"]+)"[^}]*"username":\s*"([^"]+)"[^}]*"result":\s*"(FAILED|ERROR|CONFLICT)"')
+    # Per-item results counted as failures in the GUI summary
+    FAILURE_RESULTS = ('FAILED', 'ERROR', 'CONFLICT')
+
     def _parse_api_response_for_failures(self, response_data, batch_customers):
         """Parse API response to extract failed customers - ROBUST VERSION"""
-        failed_customers = []
+        if isinstance(response_data, (str, bytes)):
+            return self._process_api_response(response_data, batch_customers)['failed_customers']
+        try:
+            return self._classify_response(response_data, batch_customers)[0]
+        except Exception as e:
+            self.logger.error(f"[ERROR] Error parsing API response for failures: {e}")
+            self.logger.error(f"Response data type: {type(response_data)}")
+            return []
+
+    def _process_api_response(self, body, batch_customers) -> Dict[str, Any]:
+        """
+        Decode a batch response body once and classify it in a single walk
 
+        Returns:
+            Dictionary with response_data (decoded JSON, or {'raw_response': text} when the
+            body is not JSON), failed_customers, gui_summary and data_size (body length)
+        """
+        failed_customers = []
+        gui_summary = {}
+        response_data = {}
         try:
-            # Convert response to JSON if it's a string, handle log files gracefully
-            if isinstance(response_data, str):
-                response_text = response_data
-                try:
-                    response_json = json.loads(response_data)
-                except json.JSONDecodeError:
-                    # This might be a log file with multiple JSON blocks, not a single JSON
-                    self.logger.debug(f"[PARSE] Response is not valid JSON, treating as log file or raw text")
-                    response_json = {"raw_response": response_data}
+            try:
+                response_data = json_codec.loads(body) if body else {}
+                is_json = True
+            except ValueError:
+                is_json = False
+
+            if is_json:
+                failed_customers, gui_summary = self._classify_response(response_data, batch_customers)
             else:
-                response_json = response_data
-                response_text = json.dumps(response_data) if response_data else ""
+                # This might be a log file with multiple JSON blocks, not a single JSON
+                self.logger.debug(f"[PARSE] Response is not valid JSON, treating as log file or raw text")
+                response_text = body.decode('utf-8', errors='replace') if isinstance(body, bytes) else body
+                response_data = {'raw_response': response_text}
+                failed_customers = self._extract_regex_failures(response_text, batch_customers)
+                gui_summary = {'parsed_failed_count': len(failed_customers)}
+                self._log_failure_total(failed_customers)
+
+        except Exception as e:
+            self.logger.error(f"[ERROR] Error parsing API response for failures: {e}")
+            self.logger.error(f"Response data type: {type(body)}")
+            if hasattr(body, '__len__'):
+                self.logger.error(f"Response data length: {len(body)}")
 
-            self.logger.debug(f"[PARSE] Parsing response for failures. Response keys: {list(response_json.keys()) if isinstance(response_json, dict) else 'Not a dict'}")
+        return {
+            'response_data': response_data,
+            'failed_customers': failed_customers,
+            'gui_summary': gui_summary,
+            'data_size': len(body) if body else 0
+        }
+
+    def _classify_response(self, response_json, batch_customers):
+        """Walk decoded response results once, collecting failed items and the GUI summary counts"""
+        failed_customers = []
+        summary = {}
 
+        self.logger.debug(f"[PARSE] Parsing response for failures. Response keys: {list(response_json.keys()) if isinstance(response_json, dict) else 'Not a dict'}")
+
+        if isinstance(response_json, dict):
             # METHOD 1: Look for customer results in structured data
             customer_results = []
 
@@ -417,181 +784,139 @@ The structure helps organize failures by type for easier handling and retry.
                     self.logger.debug(f"[PARSE] Found customer data in '{key}' with {len(customer_results)} entries")
                     break
 
-            # Parse structured customer results
-            for customer_result in customer_results:
+            identity_index = None
+            success_count = 0
+            failure_count = 0
+            for failure_index, customer_result in enumerate(customer_results):
+                if not isinstance(customer_result, dict):
+                    continue
+
                 # Check if result is not a success type (catch any failure)
-                result = customer_result.get('result', '').upper() if isinstance(customer_result, dict) else ''
-                if result and result not in ['SUCCESS', 'OK', 'IMPORTED', 'ACCEPTED']:
+                result = str(customer_result.get('result') or '').upper()
+                if (result or 'SUCCESS') in self.FAILURE_RESULTS:
+                    failure_count += 1
+                else:
+                    success_count += 1
+
+                if result and result not in self.SUCCESS_RESULTS:
                     self.logger.info(f"[FAILED] FOUND FAILED CUSTOMER: {customer_result.get('customerId')} - {customer_result.get('username')} - Result: {result}")
 
                     # Find the original customer data
                     customer_id = customer_result.get('customerId')
                     username = customer_result.get('username')
 
-                    # Try to match with original batch data
-                    original_customer = None
-                    
-                    # Skip matching if ID is None/null
-                    if customer_id is not None:
-                        for customer in batch_customers:
-                            # For households: check householdId directly
-                            if self.import_type == "households":
-                                if customer.get('householdId') == str(customer_id):
-                                    original_customer = customer
-                                    break
-                            else:
-                                # For customers: Handle nested person structure
-                                person_data = customer.get('person', customer)
-
-                                # Match by customer ID directly
-                                if person_data.get('customerId') == str(customer_id):
-                                    original_customer = customer
-                                    break
-
-                                # Match by card number (check both 'number' and 'cardNumber' fields)
-                                if person_data.get('customerCards') and len(person_data['customerCards']) > 0:
-                                    card_data = person_data['customerCards'][0]
-                                    card_number = card_data.get('number') or card_data.get('cardNumber')
-                                    if card_number and str(card_number) == str(customer_id):
-                                        original_customer = customer
-                                        break
-
-                                # Match by personal number in username
-                                if username and person_data.get('personalNumber'):
-                                    personal_num = person_data['personalNumber'].replace('-', '')
-                                    if personal_num in username.replace('-', ''):
-                                        original_customer = customer
-                                        break
-                    
+                    # Resolve the original record through the batch identity index
+                    if identity_index is None:
+                        identity_index = BatchIdentityIndex(batch_customers, self.import_type)
+                    original_customer, matched_by = identity_index.match(customer_id, username)
+
                     # FALLBACK 1: If no match found and batch has only 1 item, assume it's the failed one
                     if original_customer is None and len(batch_customers) == 1:
                         original_customer = batch_customers[0]
+                        matched_by = 'singleItemBatch'
                         self.logger.warning(f"[FALLBACK] Could not match failed item by ID (ID was {customer_id}), but batch has only 1 item - assuming match")
-                    
+
                     # FALLBACK 2: If ALL items failed and we're processing them in order, match by position
                     # This handles the case where API returns failures without IDs
                     if original_customer is None and len(customer_results) == len(batch_customers):
-                        # Calculate which position this failure is at
-                        failure_index = customer_results.index(customer_result)
                         if failure_index < len(batch_customers):
                             original_customer = batch_customers[failure_index]
+                            matched_by = 'position'
                             self.logger.warning(f"[FALLBACK] All {len(customer_results)} items failed - matching by position {failure_index}")
 
-                    failed_customer = {
+                    failed_customers.append({
                         'customerId': customer_id,
                         'username': username,
                         'result': customer_result.get('result'),
                         'error': customer_result.get('error', customer_result.get('errorMessage', 'Unknown error')),
                         'timestamp': datetime.now().isoformat(),
                         'originalData': original_customer,
+                        'matchedBy': matched_by,
                         'batchInfo': f"Found in structured response data"
-                    }
-                    failed_customers.append(failed_customer)
-
-            # METHOD 2: ENHANCED Fallback - Search raw response text for "FAILED", "ERROR", or "CONFLICT" pattern
-            # This handles both single responses and log files with multiple JSON blocks
-            if ('"result": "FAILED"' in response_text or '"result":"FAILED"' in response_text or
-                '"result": "ERROR"' in response_text or '"result":"ERROR"' in response_text or
-                '"result": "CONFLICT"' in response_text or '"result":"CONFLICT"' in response_text):
-                self.logger.warning(f"[FALLBACK] Found 'FAILED', 'ERROR', or 'CONFLICT' in raw response text, extracting all failures...")
-
-                # Enhanced regex to extract failed customers from log files or single responses
-                import re
-                failed_pattern = r'"customerId":\s*"([^"]+)"[^}]*"username":\s*"([^"]+)"[^}]*"result":\s*"(FAILED|ERROR|CONFLICT)"'
-                matches = re.findall(failed_pattern, response_text)
-
-                self.logger.info(f"[REGEX] Found {len(matches)} failed customer matches in response text")
-
-                for customer_id, username, result_type in matches:
-                    # Check if we already found this customer via structured parsing
-                    already_found = any(fc['customerId'] == customer_id for fc in failed_customers)
-                    if not already_found:
-                        self.logger.info(f"[REGEX] NEW FAILED CUSTOMER: {customer_id} - {username}")
-
-                        # Try to match with original batch data
-                        original_customer = None
-                        
-                        # Skip matching if ID is None/null
-                        if customer_id is not None:
-                            for customer in batch_customers:
-                                # For households: check householdId directly
-                                if self.import_type == "households":
-                                    if customer.get('householdId') == str(customer_id):
-                                        original_customer = customer
-                                        break
-                                else:
-                                    # For customers: Handle nested person structure
-                                    person_data = customer.get('person', customer)
-
-                                    # Match by customer ID directly
-                                    if person_data.get('customerId') == str(customer_id):
-                                        original_customer = customer
-                                        break
-
-                                    # Match by card number (check both 'number' and 'cardNumber' fields)
-                                    if person_data.get('customerCards') and len(person_data['customerCards']) > 0:
-                                        card_data = person_data['customerCards'][0]
-                                        card_number = card_data.get('number') or card_data.get('cardNumber')
-                                        if card_number and str(card_number) == str(customer_id):
-                                            original_customer = customer
-                                            break
-
-                                    # Match by username pattern (firstName lastName-personalNumber)
-                                    if username and person_data.get('firstName') and person_data.get('lastName'):
-                                        expected_username_start = f"{person_data['firstName']} {person_data['lastName']}"
-                                        if username.upper().startswith(expected_username_start.upper().replace(' ', ' ')):
-                                            original_customer = customer
-                                            break
-                        
-                        # FALLBACK: If no match found and batch has only 1 item, assume it's the failed one
-                        if original_customer is None and len(batch_customers) == 1:
-                            original_customer = batch_customers[0]
-                            self.logger.warning(f"[FALLBACK] Could not match failed item by ID (ID was {customer_id}), but batch has only 1 item - assuming match")
-
-                        failed_customer = {
-                            'customerId': customer_id,
-                            'username': username,
-                            'result': result_type,  # Use the captured result type (FAILED, ERROR, or CONFLICT)
-                            'error': 'Detected via regex fallback - no specific error message',
-                            'timestamp': datetime.now().isoformat(),
-                            'originalData': original_customer,
-                            'batchInfo': f"Found via regex fallback in raw response"
-                        }
-                        failed_customers.append(failed_customer)
-                    else:
-                        self.logger.debug(f"[REGEX] DUPLICATE: {customer_id} already found via structured parsing")
+                    })
+
+            if customer_results:
+                summary['total_customers'] = len(customer_results)
+                summary['success_count'] = success_count
+                summary['failure_count'] = failure_count
 
             # METHOD 3: Check for other failure indicators
             if 'errors' in response_json and isinstance(response_json['errors'], list):
                 for error in response_json['errors']:
                     # Ensure error is a dict before calling .get()
                     if isinstance(error, dict):
-                        failed_customer = {
+                        failed_customers.append({
                             'customerId': error.get('customerId', 'Unknown'),
                             'username': error.get('username', 'Unknown'),
                             'result': 'FAILED',
                             'error': error.get('message', error.get('errorMessage', str(error))),
                             'timestamp': datetime.now().isoformat(),
                             'originalData': None,
+                            'matchedBy': None,
                             'batchInfo': f"Found in errors array"
-                        }
-                        failed_customers.append(failed_customer)
+                        })
 
-            if failed_customers:
-                item_name = "households" if self.import_type == "households" else "customers"
-                self.logger.warning(f"[FAILED] TOTAL FAILED {item_name.upper()} DETECTED: {len(failed_customers)}")
-            else:
-                item_name = "households" if self.import_type == "households" else "customers"
-                self.logger.debug(f"[PARSE] No failed {item_name} detected in this batch")
+            # Include error messages but not full data
+            if 'error' in response_json:
+                summary['api_error'] = str(response_json['error'])[:200]
+            if 'message' in response_json:
+                summary['api_message'] = str(response_json['message'])[:100]
 
-        except Exception as e:
-            self.logger.error(f"[ERROR] Error parsing API response for failures: {e}")
-            self.logger.error(f"Response data type: {type(response_data)}")
-            if hasattr(response_data, '__len__'):
-                self.logger.error(f"Response data length: {len(response_data)}")
+        summary['parsed_failed_count'] = len(failed_customers)
+        self._log_failure_total(failed_customers)
+        return failed_customers, summary
+
+    def _extract_regex_failures(self, response_text: str, batch_customers):
+        """METHOD 2: Regex fallback for bodies that are not a single JSON document (e.g. log files)"""
+        failed_customers = []
+        if not re.search(r'"result":\s?"(?:FAILED|ERROR|CONFLICT)"', response_text):
+            return failed_customers
+
+        self.logger.warning(f"[FALLBACK] Found 'FAILED', 'ERROR', or 'CONFLICT' in raw response text, extracting all failures...")
+        matches = self.REGEX_FAILURE_PATTERN.findall(response_text)
+        self.logger.info(f"[REGEX] Found {len(matches)} failed customer matches in response text")
+
+        identity_index = None
+        found_ids = set()
+        for customer_id, username, result_type in matches:
+            if customer_id in found_ids:
+                self.logger.debug(f"[REGEX] DUPLICATE: {customer_id} already found")
+                continue
+            found_ids.add(customer_id)
+            self.logger.info(f"[REGEX] NEW FAILED CUSTOMER: {customer_id} - {username}")
+
+            # Resolve the original record through the batch identity index
+            if identity_index is None:
+                identity_index = BatchIdentityIndex(batch_customers, self.import_type)
+            original_customer, matched_by = identity_index.match(
+                customer_id, username, use_personal_number=False, use_name=True
+            )
 
+            # FALLBACK: If no match found and batch has only 1 item, assume it's the failed one
+            if original_customer is None and len(batch_customers) == 1:
+                original_customer = batch_customers[0]
+                matched_by = 'singleItemBatch'
+                self.logger.warning(f"[FALLBACK] Could not match failed item by ID (ID was {customer_id}), but batch has only 1 item - assuming match")
+
+            failed_customers.append({
+                'customerId': customer_id,
+                'username': username,
+                'result': result_type,  # Use the captured result type (FAILED, ERROR, or CONFLICT)
+                'error': 'Detected via regex fallback - no specific error message',
+                'timestamp': datetime.now().isoformat(),
+                'originalData': original_customer,
+                'matchedBy': matched_by,
+                'batchInfo': f"Found via regex fallback in raw response"
+            })
         return failed_customers
 
+    def _log_failure_total(self, failed_customers):
+        item_name = "households" if self.import_type == "households" else "customers"
+        if failed_customers:
+            self.logger.warning(f"[FAILED] TOTAL FAILED {item_name.upper()} DETECTED: {len(failed_customers)}")
+        else:
+            self.logger.debug(f"[PARSE] No failed {item_name} detected in this batch")
+
     def _save_failed_customers(self, failed_customers):
         """Save failed customers to file and organize by failure reason"""
         if not failed_customers:
@@ -600,17 +925,30 @@ The structure helps organize failures by type for easier handling and retry.
         with self.failed_customers_lock:
             self.failed_customers.extend(failed_customers)
 
-            # Save to main file (existing functionality)
-            try:
-                with open(self.failed_customers_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.failed_customers, f, indent=2, ensure_ascii=False)
-                logging.info(f"Saved {len(failed_customers)} failed customers to {self.failed_customers_file}")
-            except Exception as e:
-                logging.error(f"Error saving failed customers to file: {e}")
+        # Append this batch's failures to the journal (consolidated file is written at the end of the run)
+        try:
+            self.failed_customers_journal.append(failed_customers)
+            logging.info(f"Saved {len(failed_customers)} failed customers to {self.failed_customers_journal.path}")
+        except Exception as e:
+            logging.error(f"Error saving failed customers to file: {e}")
 
-            # NEW: Save individual customers organized by failure reason
+        # Save individual customers organized by failure reason (on the persistence thread when running)
+        self.persistence.call(self._save_individual_failed_customers_by_reason_locked, failed_customers)
+
+    def _save_individual_failed_customers_by_reason_locked(self, failed_customers: List[Dict[str, Any]]):
+        with self.single_failures_lock:
             self._save_individual_failed_customers_by_reason(failed_customers)
 
+    def materialize_failed_customers(self) -> Optional[str]:
+        """Write the consolidated failed customers JSON from the journal; returns its path"""
+        try:
+            path = self.failed_customers_journal.materialize()
+            self.logger.info(f"[FAILURES] Wrote {self.failed_customers_journal.materialized_count} failed entries to {path}")
+            return path
+        except Exception as e:
+            self.logger.error(f"[ERROR] Error writing failed customers file: {e}")
+            return None
+
     def _save_individual_failed_customers_by_reason(self, failed_customers: List[Dict[str, Any]]):
         """Save individual failed items (customers/households) organized by failure reason (CONFLICT, FAILED, ERROR)"""
         if not failed_customers:
@@ -700,9 +1038,9 @@ The structure helps organize failures by type for easier handling and retry.
                             self.data_key: [original_data]
                         }
                         
-                        # Save individual item file
-                        with open(item_filepath, 'w', encoding='utf-8') as f:
-                            json.dump(item_data, f, indent=2, ensure_ascii=False)
+                        # Save individual item file (compact - consumed by the importer)
+                        with open(item_filepath, 'wb') as f:
+                            json_codec.dump(item_data, f)
                         
                         saved_count += 1
                     else:
@@ -731,101 +1069,112 @@ The structure helps organize failures by type for easier handling and retry.
                     ]
                 }
 
-                with open(summary_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(summary_data, f, indent=2, ensure_ascii=False)
+                with open(summary_filepath, 'wb') as f:
+                    json_codec.dump(summary_data, f, pretty=True)
 
         except Exception as e:
             self.logger.error(f"[ERROR] Error saving individual failed customers by reason: {e}")
 
     def _save_failed_batch(self, batch: List[Dict[Any, Any]], batch_id: int):
         """Save entire batch that contains failed items to batches_to_retry directory"""
-        with self.failed_customers_lock:
-            # Create timestamped retry directory to avoid overwriting
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            retry_dir = os.path.join(self.failed_items_dir, f"batches_to_retry_{timestamp}")
-            os.makedirs(retry_dir, exist_ok=True)
+        # Create timestamped retry directory to avoid overwriting
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        retry_dir = os.path.join(self.failed_items_dir, f"batches_to_retry_{timestamp}")
 
-            # Create filename with batch number (5 digits for 50K+ files)
-            batch_filename = f"batch_{batch_id:05d}.json"
-            batch_filepath = os.path.join(retry_dir, batch_filename)
+        # Create filename with batch number (5 digits for 50K+ files)
+        batch_filename = f"batch_{batch_id:05d}.json"
+        batch_filepath = os.path.join(retry_dir, batch_filename)
 
-            # Save the batch in the same format as the original API call using correct data key
-            batch_data = {
-                self.data_key: batch
-            }
+        # Save the batch in the same format as the original API call using correct data key
+        batch_data = {
+            self.data_key: batch
+        }
 
-            try:
-                with open(batch_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(batch_data, f, indent=2, ensure_ascii=False)
-                self.logger.info(f"[SAVE] Saved failed batch {batch_id} to {batch_filepath} ({len(batch)} customers)")
-            except Exception as e:
-                self.logger.error(f"[ERROR] Error saving failed batch {batch_id}: {e}")
+        self.persistence.write_json(
+            batch_filepath, batch_data,
+            log_message=f"[SAVE] Saved failed batch {batch_id} to {batch_filepath} ({len(batch)} customers)",
+            error_message=f"[ERROR] Error saving failed batch {batch_id}"
+        )
 
     def _save_response_nok_batch(self, batch: List[Dict[Any, Any]], batch_id: int, status_code: int, response_text: str):
         """Save batch that failed with non-200 HTTP response to response_nok directory"""
-        with self.failed_customers_lock:
-            # Create timestamped response_nok directory
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            response_nok_dir = os.path.join(self.failed_items_dir, f"response_nok_{timestamp}")
-            os.makedirs(response_nok_dir, exist_ok=True)
-
-            # Create filename with batch number and status code (5 digits for 50K+ files)
-            batch_filename = f"batch_{batch_id:05d}_status_{status_code}.json"
-            batch_filepath = os.path.join(response_nok_dir, batch_filename)
-
-            # Save the batch in the same format as the original API call using correct data key
-            batch_data = {
-                self.data_key: batch,
-                "error_info": {
-                    "batch_id": batch_id,
-                    "status_code": status_code,
-                    "response_text": response_text[:500],  # Limit response text length
-                    "timestamp": datetime.now().isoformat(),
-                    "customer_count": len(batch)
-                }
+        # Create timestamped response_nok directory
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        response_nok_dir = os.path.join(self.failed_items_dir, f"response_nok_{timestamp}")
+
+        # Create filename with batch number and status code (5 digits for 50K+ files)
+        batch_filename = f"batch_{batch_id:05d}_status_{status_code}.json"
+        batch_filepath = os.path.join(response_nok_dir, batch_filename)
+
+        # Save the batch in the same format as the original API call using correct data key
+        batch_data = {
+            self.data_key: batch,
+            "error_info": {
+                "batch_id": batch_id,
+                "status_code": status_code,
+                "response_text": response_text[:500],  # Limit response text length
+                "timestamp": datetime.now().isoformat(),
+                "customer_count": len(batch)
             }
+        }
 
-            try:
-                with open(batch_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(batch_data, f, indent=2, ensure_ascii=False)
-                self.logger.info(f"[RESPONSE_NOK] Saved non-200 batch {batch_id} (HTTP {status_code}) to {batch_filepath}")
-            except Exception as e:
-                self.logger.error(f"[ERROR] Error saving response_nok batch {batch_id}: {e}")
+        self.persistence.write_json(
+            batch_filepath, batch_data,
+            log_message=f"[RESPONSE_NOK] Saved non-200 batch {batch_id} (HTTP {status_code}) to {batch_filepath}",
+            error_message=f"[ERROR] Error saving response_nok batch {batch_id}"
+        )
+
+    def _save_quarantined_batch(self, batch: List[Dict[Any, Any]], batch_id: int, stuck_count: int, error: str):
+        """Save a batch that kept getting stuck to the quarantine directory"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        quarantine_dir = os.path.join(self.failed_items_dir, f"quarantine_{timestamp}")
+        batch_filepath = os.path.join(quarantine_dir, f"batch_{batch_id:05d}_stuck.json")
+
+        batch_data = {
+            self.data_key: batch,
+            "quarantine_info": {
+                "batch_id": batch_id,
+                "stuck_attempts": stuck_count,
+                "last_error": error[:500],
+                "timestamp": datetime.now().isoformat(),
+                "customer_count": len(batch)
+            }
+        }
+
+        self.persistence.write_json(
+            batch_filepath, batch_data,
+            log_message=f"[QUARANTINE] Batch {batch_id} got stuck {stuck_count} times - saved to {batch_filepath}",
+            error_message=f"[ERROR] Error saving quarantined batch {batch_id}"
+        )
 
     def _save_auth_service_failure_batch(self, batch: List[Dict[Any, Any]], batch_id: int, error_message: str):
         """Save batch that failed due to auth service being down to auth_service_down directory"""
-        with self.failed_customers_lock:
-            # Create timestamped auth_service_down directory
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            auth_down_dir = os.path.join(self.failed_items_dir, f"auth_service_down_{timestamp}")
-            os.makedirs(auth_down_dir, exist_ok=True)
-
-            # Create filename with batch number
-            batch_filename = f"batch_{batch_id:05d}_auth_service_down.json"
-            batch_filepath = os.path.join(auth_down_dir, batch_filename)
-
-            # Save the batch with auth service error info using correct data key
-            batch_data = {
-                self.data_key: batch,
-                "auth_service_error": {
-                    "batch_id": batch_id,
-                    "error_message": error_message,
-                    "timestamp": datetime.now().isoformat(),
-                    "customer_count": len(batch),
-                    "error_type": "auth_service_down",
-                    "retry_instructions": "Wait for auth service to be restored, then retry this batch"
-                }
+        # Create timestamped auth_service_down directory
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        auth_down_dir = os.path.join(self.failed_items_dir, f"auth_service_down_{timestamp}")
+
+        # Create filename with batch number
+        batch_filename = f"batch_{batch_id:05d}_auth_service_down.json"
+        batch_filepath = os.path.join(auth_down_dir, batch_filename)
+
+        # Save the batch with auth service error info using correct data key
+        batch_data = {
+            self.data_key: batch,
+            "auth_service_error": {
+                "batch_id": batch_id,
+                "error_message": error_message,
+                "timestamp": datetime.now().isoformat(),
+                "customer_count": len(batch),
+                "error_type": "auth_service_down",
+                "retry_instructions": "Wait for auth service to be restored, then retry this batch"
             }
+        }
 
-            try:
-                with open(batch_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(batch_data, f, indent=2, ensure_ascii=False)
-                self.logger.error(f"[AUTH_SERVICE_DOWN] Saved batch {batch_id} to {batch_filepath}")
-            except Exception as e:
-                self.logger.error(f"[ERROR] Error saving auth service failure batch {batch_id}: {e}")
+        self.logger.error(f"[AUTH_SERVICE_DOWN] Saving batch {batch_id} to {batch_filepath}")
+        self.persistence.write_json(
+            batch_filepath, batch_data,
+            error_message=f"[ERROR] Error saving auth service failure batch {batch_id}"
+        )
 
     def save_remaining_work(self, reason: str = "stopped"):
         """Save remaining work for resume functionality"""
@@ -847,13 +1196,13 @@ The structure helps organize failures by type for easier handling and retry.
                 "timestamp": datetime.now().isoformat(),
                 "processed_batches": self.processed_batches,
                 "total_batches": self.total_batches,
-                "remaining_batches": self.remaining_batches,
+                "remaining_batches": list(self.remaining_batches.values()),
                 "auth_service_down": self.auth_service_down,
                 "resume_instructions": "Use this file to resume the import from where it left off"
             }
 
             with open(resume_filepath, 'w', encoding='utf-8') as f:
-                json.dump(resume_data, f, indent=2, ensure_ascii=False)
+                json_codec.dump(resume_data, f)
 
             self.logger.info(f"[SAVE] SAVED REMAINING WORK: {len(self.remaining_batches)} batches saved to {resume_filepath}")
             return resume_filepath
@@ -862,6 +1211,28 @@ The structure helps organize failures by type for easier handling and retry.
             self.logger.error(f"[ERROR] Error saving remaining work: {e}")
             return None
 
+    def get_failed_customers_since(self, cursor: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Failed customers recorded after cursor, for incremental views
+
+        Args:
+            cursor: Value returned by the previous call (0 for everything)
+
+        Returns:
+            (new failed customers, cursor for the next call). A cursor beyond the list
+            (it was cleared) starts over from the beginning.
+        """
+        with self.failed_customers_lock:
+            total = len(self.failed_customers)
+            if cursor > total:
+                cursor = 0
+            return self.failed_customers[cursor:], total
+
+    def clear_failed_customers(self):
+        """Forget the failed customers collected so far (saved files are kept)"""
+        with self.failed_customers_lock:
+            self.failed_customers.clear()
+
     def get_failed_customers_summary(self):
         """Get summary of failed customers"""
         with self.failed_customers_lock:
@@ -888,35 +1259,242 @@ The structure helps organize failures by type for easier handling and retry.
                 'recent_failures': self.failed_customers[-5:] if total_failed > 0 else []
             }
     
-    def rate_limit(self):
-        """Implement rate limiting between requests"""
-        with self.rate_limit_lock:
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.delay_between_requests:
-                sleep_time = self.delay_between_requests - time_since_last
-                time.sleep(sleep_time)
-            self.last_request_time = time.time()
+    def rate_limit(self, records: int = 0):
+        """Wait for a token-bucket slot for one request carrying `records` items"""
+        self.rate_limiter.acquire(records)
     
-    def send_batch(self, batch: List[Dict[Any, Any]], batch_id: int) -> Dict[str, Any]:
-        """Send a single batch to the API"""
+    def _on_concurrency_change(self, old_limit: int, new_limit: int, reason: str):
+        """Log adaptive concurrency adjustments"""
+        direction = "increased" if new_limit > old_limit else "decreased"
+        self.logger.info(f"[ADAPTIVE] Concurrency {direction} {old_limit} -> {new_limit} ({reason})")
+
+    def _on_circuit_change(self, old_state: str, new_state: str, reason: str):
+        """Log circuit breaker transitions and report them to the GUI"""
+        if new_state == CircuitBreaker.OPEN:
+            self.logger.warning(f"[CIRCUIT] Import endpoint circuit OPEN ({reason}) - holding batches for {self.circuit.open_seconds:g}s")
+        elif new_state == CircuitBreaker.HALF_OPEN:
+            self.logger.info(f"[CIRCUIT] Circuit half-open - {reason}")
+        else:
+            self.logger.info(f"[CIRCUIT] Circuit closed ({reason}) - resuming at full rate")
+
+        if hasattr(self, 'progress_callback') and self.progress_callback:
+            self._emit_progress({
+                'type': 'circuit_state',
+                'circuit_state': new_state,
+                'previous_state': old_state,
+                'reason': reason,
+                'concurrency_limit': self.get_concurrency_limit()
+            })
+
+    def get_circuit_state(self) -> str:
+        """Current endpoint circuit state ("closed", "open", "half_open" or "disabled")"""
+        return self.circuit.state if self.circuit else "disabled"
+
+    def _wait_for_circuit(self, batch_id: int):
+        """
+        Block while the endpoint circuit is open
+
+        Returns:
+            The circuit ticket for the attempt (True without a circuit), or False if the import was stopped meanwhile
+        """
+        if not self.circuit:
+            return True
+        logged = False
+        while True:
+            ticket = self.circuit.acquire(timeout=0.5)
+            if ticket:
+                return ticket
+            if self.should_stop:
+                return False
+            if not logged:
+                self.logger.info(f"[CIRCUIT] Batch {batch_id} waiting for the endpoint circuit to close...")
+                logged = True
+
+    def _post_attempt(self, headers: Dict[str, str], body: bytes, gzip_body: Optional[bytes],
+                      batch_id: int, attempt: int, circuit_ticket=None) -> requests.Response:
+        """POST one attempt under the watchdog and report its outcome to the circuit breaker with its ticket"""
+        if self.watchdog:
+            self.watchdog.begin(batch_id, attempt)
+        status_code = None
+        try:
+            response = self._post_encoded(headers, body, gzip_body, batch_id)
+            status_code = response.status_code
+            return response
+        finally:
+            if self.watchdog:
+                self.watchdog.end(batch_id)
+            if self.circuit:
+                self.circuit.record(status_code, circuit_ticket)
+
+    def _on_batch_stuck(self, batch_id: int, attempt: int, elapsed: float, threshold: float):
+        """Report an attempt the watchdog flagged as stuck"""
+        stuck_count = self.watchdog.stuck_count(batch_id)
+        self.logger.warning(f"[WATCHDOG] Batch {batch_id} attempt {attempt + 1} in flight for {elapsed:.0f}s "
+                            f"(threshold {threshold:.0f}s, stuck {stuck_count}x) - "
+                            f"{'will be quarantined' if stuck_count >= self.quarantine_after_stuck else 'will be retried'} if it fails")
+        if hasattr(self, 'progress_callback') and self.progress_callback:
+            self._emit_progress({
+                'type': 'batch_stuck',
+                'batch_id': batch_id,
+                'attempt': attempt + 1,
+                'elapsed_seconds': round(elapsed, 1),
+                'threshold_seconds': round(threshold, 1),
+                'stuck_count': stuck_count,
+                'concurrency_limit': self.get_concurrency_limit()
+            })
+
+    def _quarantine_stuck_batch(self, batch: List[Dict[Any, Any]], batch_id: int, error: str) -> Optional[Dict[str, Any]]:
+        """Fail a batch without further retries once it got stuck quarantine_after_stuck times"""
+        if not self.watchdog:
+            return None
+        stuck_count = self.watchdog.stuck_count(batch_id)
+        if stuck_count < self.quarantine_after_stuck:
+            return None
+
+        with self.lock:
+            self.quarantined_batches += 1
+            self.failed_batches.append({
+                'batch_id': batch_id,
+                'customers': batch,
+                'error': f"Quarantined after {stuck_count} stuck attempts: {error}"
+            })
+        self._save_quarantined_batch(batch, batch_id, stuck_count, error)
+        return {
+            'batch_id': batch_id,
+            'status': 'failed',
+            'error': f"Quarantined after {stuck_count} stuck attempts: {error}",
+            'error_type': 'quarantined'
+        }
+
+    def get_concurrency_limit(self) -> int:
+        """Current target number of in-flight batches"""
+        return self.concurrency.limit if self.concurrency else self.max_workers
+
+    def _disable_compression(self, batch_id: int) -> None:
+        """Fall back to uncompressed bodies for the rest of the run"""
+        with self.compression_lock:
+            if not self.compress_requests:
+                return
+            self.compress_requests = False
+        self.logger.warning(f"[GZIP] Server rejected gzip request body for batch {batch_id} (HTTP 415) - sending uncompressed from now on")
+
+    def _post_encoded(self, headers: Dict[str, str], body: bytes, gzip_body: Optional[bytes], batch_id: int) -> requests.Response:
+        """POST the gzip body when compression is on, resending uncompressed if the server answers 415"""
+        if self.compress_requests and gzip_body is not None:
+            response = self._post_batch({**headers, 'Content-Encoding': 'gzip'}, gzip_body)
+            if response.status_code != 415:
+                self._count_request_bytes(len(body), len(gzip_body), gzip=True)
+                return response
+            # The rejected body still went over the wire
+            self._count_request_bytes(0, len(gzip_body), gzip=True)
+            self._disable_compression(batch_id)
+
+        response = self._post_batch(headers, body)
+        self._count_request_bytes(len(body), len(body))
+        return response
+
+    def _count_request_bytes(self, raw_bytes: int, sent_bytes: int, gzip: bool = False) -> None:
+        with self.compression_lock:
+            self.compression_stats['requests'] += 1
+            if gzip:
+                self.compression_stats['gzip_requests'] += 1
+            self.compression_stats['raw_bytes'] += raw_bytes
+            self.compression_stats['sent_bytes'] += sent_bytes
+
+    def _post_batch(self, headers: Dict[str, str], body: bytes) -> requests.Response:
+        """POST one attempt, holding an adaptive concurrency slot and reporting its latency/status"""
+        if not self.concurrency:
+            return self._get_http_session().post(self.api_url, headers=headers, data=body, timeout=self.request_timeout)
+
+        self.concurrency.acquire()
+        started = time.monotonic()
+        status_code = None
+        try:
+            response = self._get_http_session().post(self.api_url, headers=headers, data=body, timeout=self.request_timeout)
+            status_code = response.status_code
+            return response
+        finally:
+            self.concurrency.release(time.monotonic() - started, status_code)
+
+    def _next_retry_delay(self, batch_id: int, attempt: int, status_code: Optional[int],
+                          retry_after: Optional[str], previous_delay: Optional[float]) -> Optional[float]:
+        """
+        Seconds to wait before retrying a failed attempt, or None if the batch should fail now
+
+        Args:
+            batch_id: Batch number (for logging)
+            attempt: Zero-based attempt that just failed
+            status_code: HTTP status of the attempt (None for a transport error)
+            retry_after: Retry-After header value, if any
+            previous_delay: Delay used before this attempt (None on the first attempt)
+        """
+        policy = self.retry_policy
+        status_class = policy.classify(status_code)
+        if status_class == RetryPolicy.NON_RETRYABLE:
+            self.logger.warning(f"[RETRY] Batch {batch_id} - HTTP {status_code} is not retryable")
+            return None
+        if attempt >= self.max_retries - 1:
+            return None
+        if not policy.try_acquire_retry():
+            self.logger.warning(f"[RETRY] Batch {batch_id} - retry budget exhausted, failing without retry")
+            return None
+
+        server_delay = policy.parse_retry_after(retry_after)
+        delay = policy.next_delay(previous_delay, server_delay)
+        reason = f"Retry-After {server_delay:.1f}s" if server_delay is not None else status_class
+        self.logger.info(f"[RETRY] Batch {batch_id} - retrying in {delay:.2f}s ({reason})")
+        return delay
+
+    def _renew_auth_headers(self, batch_id: int, headers: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """
+        Replace a token the API rejected with HTTP 401
+
+        Workers that got a 401 for the same token share one refresh.
+
+        Returns:
+            Headers with the new token, or None if the token could not be renewed
+        """
+        rejected_token = headers.get('Authorization', '').replace('Bearer ', '', 1)
+        self.logger.warning(f"[AUTH] Batch {batch_id} - HTTP 401, renewing the token and retrying once")
+        try:
+            self.auth_manager.force_refresh(rejected_token=rejected_token)
+            return self.auth_manager.get_auth_headers()
+        except Exception as e:
+            self.logger.error(f"[AUTH ERROR] Token renewal after HTTP 401 failed for batch {batch_id}: {e}")
+            if self.auth_monitor:
+                self.auth_monitor.report_failure(str(e))
+            return None
+
+    def _defer_failed_batch(self, batch_id: int, status_code: Optional[int]) -> bool:
+        """Whether a batch that exhausted its retries gets a deferred pass instead of failing now"""
+        if self.retry_policy.classify(status_code) == RetryPolicy.NON_RETRYABLE:
+            return False
+        with self.lock:
+            return self.deferred_passes.get(batch_id, 0) < self.deferred_retry_passes
+
+    def send_batch(self, batch: List[Dict[Any, Any]], batch_id: int, body: bytes = None,
+                   gzip_body: bytes = None) -> Dict[str, Any]:
+        """
+        Send a single batch to the API
+
+        Args:
+            batch: Decoded records (used for failure matching and artifacts)
+            batch_id: Batch number
+            body: Pre-encoded request body; encoded here once if not given
+            gzip_body: Pre-compressed body; compressed here once if compression is on and it is not given
+        """
 
         # Rate limiting
-        self.rate_limit()
-
-        # Check auth service health periodically
-        if self.should_check_auth_service():
-            health_check = self.check_auth_service_health()
-            if not health_check['healthy'] and health_check.get('service_down'):
-                self.logger.error(f"[AUTH SERVICE DOWN] Aborting batch {batch_id}")
-                # Save this as an auth service failure
-                self._save_auth_service_failure_batch(batch, batch_id, health_check['error'])
-                return {
-                    'batch_id': batch_id,
-                    'status': 'failed',
-                    'error': f'Auth service down: {health_check["error"]}',
-                    'error_type': 'auth_service_down'
-                }
+        self.rate_limit(len(batch))
+
+        # Hold while the auth health monitor reports the service down (it pauses and resumes the import)
+        if not self._wait_for_auth_service(batch_id):
+            self.logger.info(f"[STOP] STOPPING - Batch {batch_id} not sent (stopped while auth service down)")
+            return {
+                'batch_id': batch_id,
+                'status': 'stopped',
+                'error': 'Import stopped by user request'
+            }
 
         # Get authentication headers (with automatic refresh if needed)
         if self.auth_manager:
@@ -925,10 +1503,9 @@ The structure helps organize failures by type for easier handling and retry.
             except Exception as e:
                 self.logger.error(f"[ERROR] Authentication failed for batch {batch_id}: {e}")
 
-                # Check if this is an auth service down error
-                error_msg = str(e).lower()
-                if any(code in error_msg for code in ['503', '502', '504', 'service unavailable', 'bad gateway']):
-                    self.auth_service_down = True
+                # Let the monitor switch state (auto-pause) and check for recovery on its schedule
+                self.auth_monitor.report_failure(str(e))
+                if is_service_down_error(str(e)):
                     self._save_auth_service_failure_batch(batch, batch_id, str(e))
                     return {
                         'batch_id': batch_id,
@@ -951,42 +1528,55 @@ The structure helps organize failures by type for easier handling and retry.
                 'Content-Type': 'application/json'
             }
         
-        # Use the correct data key based on import type (data for customers, households for households)
-        payload = {self.data_key: batch}
+        # Encoded once and reused by every attempt (data key is "data" for customers, "households" for households)
+        if body is None:
+            body = self._encode_payload(batch)
+        if self.compress_requests and gzip_body is None:
+            gzip_body = self._compress_body(body)
 
         item_name = "households" if self.import_type == "households" else "customers"
         
+        retry_delay = None
+        token_renewed = False
         for attempt in range(self.max_retries):
             try:
                 self.logger.info(f"Sending batch {batch_id} (attempt {attempt + 1}/{self.max_retries}) - {len(batch)} {item_name}")
                 
-                response = requests.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload
-                    # No timeout - let API handle its own timeout logic
-                )
+                response = None
+                while response is None:
+                    # Hold the attempt while the endpoint circuit is open
+                    circuit_ticket = self._wait_for_circuit(batch_id)
+                    if not circuit_ticket:
+                        self.logger.info(f"[STOP] STOPPING - Batch {batch_id} not sent (stopped while circuit open)")
+                        return {
+                            'batch_id': batch_id,
+                            'status': 'stopped',
+                            'error': 'Import stopped by user request'
+                        }
+
+                    # Deadlines come from connect_timeout/read_timeout; the watchdog flags attempts far beyond the p99
+                    self.retry_policy.record_request()
+                    response = self._post_attempt(headers, body, gzip_body, batch_id, attempt, circuit_ticket)
+
+                    # A rejected token (revoked, or stale from the token cache) is renewed and the attempt repeated once
+                    if response.status_code == 401 and self.auth_manager and not token_renewed:
+                        token_renewed = True
+                        renewed_headers = self._renew_auth_headers(batch_id, headers)
+                        if renewed_headers:
+                            headers = renewed_headers
+                            response = None
                 
                 if response.status_code == 200:
                     with self.lock:
                         self.completed_batches += 1
 
-                    # Parse response - ROBUST VERSION
-                    response_data = {}
-                    response_text = ""
-                    try:
-                        if response.content:
-                            response_text = response.text
-                            response_data = response.json()
-                            self.logger.debug(f"📥 Batch {batch_id} response parsed successfully. Keys: {list(response_data.keys()) if isinstance(response_data, dict) else 'Not a dict'}")
-                    except json.JSONDecodeError as e:
-                        self.logger.warning(f"⚠️ Batch {batch_id} - JSON decode error: {e}")
-                        response_data = {'raw_response': response_text}
-
-                    # ALWAYS check for failed items within successful response
+                    # ALWAYS check for failed items within successful response - decode and classify once
                     self.logger.info(f"[CHECK] Batch {batch_id} - Checking for failed {item_name} in response...")
-
-                    failed_customers = self._parse_api_response_for_failures(response_data, batch)
+                    processed = self._process_api_response(response.content, batch)
+                    response_data = processed['response_data']
+                    failed_customers = processed['failed_customers']
+                    if 'raw_response' in response_data:
+                        self.logger.warning(f"⚠️ Batch {batch_id} - response is not valid JSON")
 
                     if failed_customers:
                         self._save_failed_customers(failed_customers)
@@ -1004,15 +1594,16 @@ The structure helps organize failures by type for easier handling and retry.
 
                     # Save full API response to file and get summary
                     response_summary = self._save_api_response_to_file(
-                        batch_id, response_data, response.status_code, dict(response.headers), "success"
+                        batch_id, response_data, response.status_code, dict(response.headers), "success",
+                        data_size=processed['data_size'], failure_count=len(failed_customers)
                     )
                     
-                    # Create memory-efficient summary for GUI
-                    gui_summary = self._create_response_summary_for_gui(response_data, failed_customers)
+                    # Memory-efficient summary for GUI (computed during classification)
+                    gui_summary = processed['gui_summary']
 
                     # Send progress update with lightweight data
                     if hasattr(self, 'progress_callback') and self.progress_callback:
-                        self.progress_callback({
+                        self._emit_progress({
                             'type': 'batch_success',
                             'batch_id': batch_id,
                             'customers_count': len(batch),
@@ -1024,12 +1615,10 @@ The structure helps organize failures by type for easier handling and retry.
                                 'content-type': dict(response.headers).get('content-type', 'unknown'),
                                 'content-length': dict(response.headers).get('content-length', 'unknown')
                             },
-                            'failed_customers': failed_customers[:3] if failed_customers else []  # Only first 3 for GUI
+                            'failed_customers': failed_customers[:3] if failed_customers else [],  # Only first 3 for GUI
+                            'concurrency_limit': self.get_concurrency_limit()
                         })
 
-                    # Save API response to file
-                    response_summary = self._save_api_response_to_file(batch_id, response_data, response.status_code, dict(response.headers), response_type="success")
-                    
                     return {
                         'batch_id': batch_id,
                         'status': 'success',
@@ -1042,24 +1631,26 @@ The structure helps organize failures by type for easier handling and retry.
                         'has_data': response_summary.get('has_data')
                     }
                 else:
-                    # Parse error response
+                    # Parse error response (decode the body once)
+                    response_text = response.content.decode('utf-8', errors='replace')
                     error_data = {}
                     try:
-                        if response.content:
-                            error_data = response.json()
-                    except json.JSONDecodeError:
-                        error_data = {'raw_response': response.text}
+                        if response_text:
+                            error_data = json_codec.loads(response_text)
+                    except json_codec.JSONDecodeError:
+                        error_data = {'raw_response': response_text}
 
-                    self.logger.warning(f"⚠️ Batch {batch_id} failed with status {response.status_code}: {response.text}")
+                    self.logger.warning(f"⚠️ Batch {batch_id} failed with status {response.status_code}: {response_text}")
 
                     # Save error response to file
                     error_summary = self._save_api_response_to_file(
-                        batch_id, error_data, response.status_code, dict(response.headers), "error"
+                        batch_id, error_data, response.status_code, dict(response.headers), "error",
+                        data_size=len(response.content)
                     )
 
                     # Send progress update with API error details
                     if hasattr(self, 'progress_callback') and self.progress_callback:
-                        self.progress_callback({
+                        self._emit_progress({
                             'type': 'batch_error',
                             'batch_id': batch_id,
                             'customers_count': len(batch),
@@ -1070,37 +1661,64 @@ The structure helps organize failures by type for easier handling and retry.
                                 'content-type': dict(response.headers).get('content-type', 'unknown')
                             },
                             'attempt': attempt + 1,
-                            'max_retries': self.max_retries
+                            'max_retries': self.max_retries,
+                            'concurrency_limit': self.get_concurrency_limit()
                         })
 
-                    if attempt == self.max_retries - 1:  # Last attempt
+                    quarantined = self._quarantine_stuck_batch(batch, batch_id, f"HTTP {response.status_code}")
+                    if quarantined:
+                        return quarantined
+
+                    retry_delay = self._next_retry_delay(batch_id, attempt, response.status_code,
+                                                         response.headers.get('Retry-After'), retry_delay)
+                    if retry_delay is None and self._defer_failed_batch(batch_id, response.status_code):
+                        # Failure artifacts are only written once the deferred passes are used up
+                        return {
+                            'batch_id': batch_id,
+                            'status': 'failed',
+                            'deferred': True,
+                            'error': f"HTTP {response.status_code}: {response_text}",
+                            'status_code': response.status_code
+                        }
+                    if retry_delay is None:  # Last attempt, not retryable or over the retry budget
                         with self.lock:
                             self.failed_batches.append({
                                 'batch_id': batch_id,
                                 'customers': batch,
-                                'error': f"HTTP {response.status_code}: {response.text}",
+                                'error': f"HTTP {response.status_code}: {response_text}",
                                 'error_data': error_data,
                                 'status_code': response.status_code
                             })
 
                         # Save non-200 response batch to response_nok folder
-                        self._save_response_nok_batch(batch, batch_id, response.status_code, response.text)
+                        self._save_response_nok_batch(batch, batch_id, response.status_code, response_text)
                         return {
                             'batch_id': batch_id,
                             'status': 'failed',
-                            'error': f"HTTP {response.status_code}: {response.text}",
+                            'error': f"HTTP {response.status_code}: {response_text}",
                             'error_data': error_data,
                             'status_code': response.status_code,
                             'response_headers': dict(response.headers)
                         }
                     else:
                         # Wait before retry
-                        time.sleep(2 ** attempt)  # Exponential backoff
+                        time.sleep(retry_delay)
                         
-            # Timeout exception handling removed - API handles its own timeouts
+            # Timeouts (connect_timeout/read_timeout) end up here and are retried like other transport errors
             except Exception as e:
                 self.logger.error(f"[ERROR] Batch {batch_id} error (attempt {attempt + 1}): {e}")
-                if attempt == self.max_retries - 1:
+                quarantined = self._quarantine_stuck_batch(batch, batch_id, str(e))
+                if quarantined:
+                    return quarantined
+                retry_delay = self._next_retry_delay(batch_id, attempt, None, None, retry_delay)
+                if retry_delay is None and self._defer_failed_batch(batch_id, None):
+                    return {
+                        'batch_id': batch_id,
+                        'status': 'failed',
+                        'deferred': True,
+                        'error': str(e)
+                    }
+                if retry_delay is None:
                     with self.lock:
                         self.failed_batches.append({
                             'batch_id': batch_id,
@@ -1113,7 +1731,7 @@ The structure helps organize failures by type for easier handling and retry.
                         'error': str(e)
                     }
                 else:
-                    time.sleep(2 ** attempt)
+                    time.sleep(retry_delay)
 
         # This should never be reached, but added for type safety
         return {
@@ -1122,7 +1740,8 @@ The structure helps organize failures by type for easier handling and retry.
             'error': 'Unexpected end of method - all retries exhausted'
         }
 
-    def send_lazy_batch(self, lazy_batch_info: Dict[str, Any], batch_id: int) -> Dict[str, Any]:
+    def send_lazy_batch(self, lazy_batch_info: Dict[str, Any], batch_id: int,
+                        prepared: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Load and send a lazy batch to the API - MEMORY EFFICIENT WITH STOP/PAUSE SUPPORT"""
         batch = None
         try:
@@ -1151,8 +1770,10 @@ The structure helps organize failures by type for easier handling and retry.
 
                 self.logger.info(f"▶️ RESUMED - Batch {batch_id} continuing...")
 
-            # Load the actual batch data just-in-time
-            batch = self.load_lazy_batch(lazy_batch_info)
+            # Use the prefetched batch, or load and encode it just-in-time
+            if prepared is None:
+                prepared = self.prepare_lazy_batch(lazy_batch_info)
+            batch = prepared['records'] if prepared else None
             if not batch:
                 return {
                     'batch_id': batch_id,
@@ -1164,7 +1785,7 @@ The structure helps organize failures by type for easier handling and retry.
             self.logger.info(f"Loading batch {batch_id} from {lazy_batch_info['file_path']} (customers {lazy_batch_info['start_idx']}-{lazy_batch_info['end_idx']}) - {len(batch)} customers")
 
             # Send the batch using existing method
-            result = self.send_batch(batch, batch_id)
+            result = self.send_batch(batch, batch_id, body=prepared['body'], gzip_body=prepared.get('gzip_body'))
 
             # Update processed count
             self.processed_batches += 1
@@ -1172,6 +1793,7 @@ The structure helps organize failures by type for easier handling and retry.
             # Explicitly free batch memory immediately after sending
             del batch
             batch = None
+            prepared = None
 
             return result
 
@@ -1187,127 +1809,307 @@ The structure helps organize failures by type for easier handling and retry.
             if batch is not None:
                 del batch
     
-    def import_customers(self, file_paths: List[str]) -> Dict[str, Any]:
-        """Import customers from multiple files using multithreading - TRUE LAZY LOADING"""
+    def _iter_file_record_counts(self, file_paths: List[str]):
+        """
+        Count items per file in parallel and yield (file_path, count) in input order
+
+        Counting builds each file's record index (byte spans only, no customer objects)
+        and caches it for the batch loaders. At most
+        2 x planning_workers files are counted ahead of the consumer.
+        """
+        planner = ThreadPoolExecutor(max_workers=max(1, self.planning_workers), thread_name_prefix="planner")
+        pending = deque()
+        paths = iter(file_paths)
+        try:
+            for file_path in islice(paths, max(1, self.planning_workers) * 2):
+                pending.append((file_path, planner.submit(self.record_indexes.count, file_path)))
 
-        start_time = datetime.now()
-        self.logger.info(f"[IMPORT] Starting bulk import from {len(file_paths)} files")
+            while pending:
+                file_path, future = pending.popleft()
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append((next_path, planner.submit(self.record_indexes.count, next_path)))
 
-        # Create lazy batch references without loading any data
-        lazy_batches = []
-        total_customers = 0
+                try:
+                    customers_count = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error reading file {file_path}: {e}")
+                    continue
 
-        for file_path in file_paths:
-            # Only count items, don't load them yet
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    customers_count = len(data.get(self.data_key, []))
+                if self.ledger:
+                    self.ledger.record_plan(file_path, customers_count)
 
                 if customers_count > 0:
-                    # Calculate how many batches this file will create
-                    num_batches = (customers_count + self.batch_size - 1) // self.batch_size
-
-                    # Create lazy batch references
-                    for batch_index in range(num_batches):
-                        start_idx = batch_index * self.batch_size
-                        end_idx = min(start_idx + self.batch_size, customers_count)
-
-                        lazy_batches.append({
-                            'file_path': file_path,
-                            'start_idx': start_idx,
-                            'end_idx': end_idx,
-                            'expected_size': end_idx - start_idx
-                        })
-
-                    total_customers += customers_count
-                    item_name = "households" if self.import_type == "households" else "customers"
-                    self.logger.info(f"Planned {customers_count} {item_name} from {file_path} -> {num_batches} batches (not loaded yet)")
+                    yield file_path, customers_count
                 else:
                     item_name = "households" if self.import_type == "households" else "customers"
                     self.logger.warning(f"No {item_name} found in {file_path}")
+        finally:
+            planner.shutdown(wait=False, cancel_futures=True)
 
-            except Exception as e:
-                self.logger.error(f"Error reading file {file_path}: {e}")
+    def _iter_lazy_batches(self, file_paths: List[str], plan_stats: Dict[str, int]):
+        """
+        Yield lazy batch references (no customer data) in file order
+
+        Each file's batch count is added to total_batches as soon as the file has been
+        counted, so progress totals stay ahead of dispatch.
+        """
+        item_name = "households" if self.import_type == "households" else "customers"
+        file_counts = self._iter_file_record_counts(file_paths)
+        if self.ledger and all(path in self.ledger.planned_counts for path in file_paths):
+            # Resuming - the ledger already knows every file's record count
+            self.logger.info("[RESUME] Reusing planned record counts from the progress ledger")
+            file_counts = ((path, self.ledger.planned_counts[path]) for path in file_paths
+                           if self.ledger.planned_counts[path] > 0)
+
+        for file_path, customers_count in file_counts:
+            # Calculate how many batches this file will create
+            num_batches = (customers_count + self.batch_size - 1) // self.batch_size
+            plan_stats['total_customers'] += customers_count
+            self.total_batches += num_batches
+            self.logger.info(f"Planned {customers_count} {item_name} from {file_path} -> {num_batches} batches (not loaded yet)")
+
+            for batch_index in range(num_batches):
+                start_idx = batch_index * self.batch_size
+                end_idx = min(start_idx + self.batch_size, customers_count)
+                yield {
+                    'file_path': file_path,
+                    'start_idx': start_idx,
+                    'end_idx': end_idx,
+                    'expected_size': end_idx - start_idx
+                }
+
+    def import_customers(self, file_paths: List[str]) -> Dict[str, Any]:
+        """Import customers from multiple files using multithreading - TRUE LAZY LOADING"""
 
-        if not lazy_batches:
-            item_name = "household" if self.import_type == "households" else "customer"
-            self.logger.error(f"No {item_name} data found!")
-            return {'status': 'error', 'message': f'No {item_name} data found'}
+        start_time = datetime.now()
+        self.logger.info(f"[IMPORT] Starting bulk import from {len(file_paths)} files")
 
-        self.total_batches = len(lazy_batches)
-        self.remaining_batches = lazy_batches.copy()  # Track remaining work
+        # Lazy batch references are created on demand; only the dispatch window is held in memory
+        plan_stats = {'total_customers': 0}
+        self.total_batches = 0
+        self.remaining_batches = {}
         item_name = "households" if self.import_type == "households" else "customers"
-        self.logger.info(f"[STATS] Total {item_name} to import: {total_customers}")
-        self.logger.info(f"[STATS] Planned {len(lazy_batches)} batches (lazy loading - files will be loaded during processing)")
+        self.logger.info(f"[STATS] Using {self.max_workers} worker threads, {self.planning_workers} planning threads, "
+                         f"dispatch window {self.dispatch_window}")
+        self.logger.info(f"[STATS] Rate limit: {self.rate_limiter.describe()}")
+        self.logger.info(f"[STATS] Retry policy: {self.retry_policy.describe()}")
+        if self.circuit:
+            self.logger.info(f"[STATS] Circuit breaker: {self.circuit.describe()}")
+        if self.deferred_retry_passes:
+            self.logger.info(f"[STATS] Deferred retries: {self.deferred_retry_passes} pass(es) after a {self.deferred_retry_delay:g}s cool-down")
+        self.logger.info(f"[STATS] Request deadlines: connect {self.connect_timeout or 'unlimited'}s, read {self.read_timeout or 'unlimited'}s")
+        if self.concurrency:
+            self.logger.info(f"[STATS] Adaptive concurrency: {self.concurrency.min_limit}-{self.concurrency.max_limit} in-flight batches, starting at {self.concurrency.limit}")
+
+        # Outcome tallies (no per-batch result list is kept)
+        tally = {
+            'success': 0, 'failed': 0, 'stopped': 0,
+            'success_customers': 0, 'failed_customers': 0, 'stopped_customers': 0,
+            'auth_failures': 0, 'resumed': 0, 'resumed_customers': 0
+        }
+
+        # Open (or resume) the progress ledger for this exact plan
+        self.ledger = None
+        if self.progress_ledger:
+            try:
+                ledger = ProgressLedger.for_plan(self.ledger_dir, file_paths, self.batch_size, self.data_key, self.api_url)
+                already_finished = ledger.open(resume=self.resume_from_ledger)
+                self.ledger = ledger
+                if already_finished:
+                    self.logger.info(f"[RESUME] {already_finished} batches already finished according to {ledger.path} - skipping them")
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"[LEDGER] Progress ledger disabled for this run: {e}")
+
+        lazy_plan = self._iter_lazy_batches(file_paths, plan_stats)
+        if self.prefetch_batches:
+            # Producer stage: read and encode batches ahead of the network workers
+            plan = BatchPrefetcher(lazy_plan, self.prepare_lazy_batch, depth=self.prefetch_batches,
+                                   skip=self.ledger.is_finished if self.ledger else None)
+        else:
+            plan = ((batch_id, lazy_batch, None) for batch_id, lazy_batch in enumerate(lazy_plan, 1))
+        plan_exhausted = False
+        planned_batches = 0
+        in_flight = {}  # future -> batch_id
+        deferred = []  # heap of (ready_at, batch_id) - failed batches waiting for a deferred pass
+
+        # Artifacts are written by the persistence thread while workers keep sending
+        if self.write_behind:
+            self.persistence.start()
+        if self.watchdog:
+            self.watchdog.start()
+        if self.auth_monitor:
+            self.auth_monitor.start()
+        if self.auth_manager:
+            # Renew the token ahead of expiry so workers never wait for a token request
+            self.auth_manager.start_background_refresh()
+        if self.progress_stream:
+            self.progress_stream.start()
 
-        self.logger.info(f"[STATS] Created {self.total_batches} batches of {self.batch_size} {item_name} each")
-        self.logger.info(f"[STATS] Using {self.max_workers} worker threads")
-        
-        # Process lazy batches with thread pool
-        results = []
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all lazy batches
-            future_to_batch = {
-                executor.submit(self.send_lazy_batch, lazy_batch, i): i
-                for i, lazy_batch in enumerate(lazy_batches, 1)
-            }
-            
-            # Process completed batches with memory cleanup
-            stopped_batches = []
-            for future in as_completed(future_to_batch):
-                batch_id = future_to_batch[future]
-                try:
-                    result = future.result()
-                    results.append(result)
+            # Open each worker's keep-alive connection while planning starts
+            if self.prewarm_connections:
+                for _ in range(self.max_workers):
+                    executor.submit(self._prewarm_http_session)
+
+            while True:
+                # Top the window up from the plan; nothing new is dispatched while paused or stopping
+                while (not plan_exhausted and len(in_flight) < self.dispatch_window
+                       and not self.should_stop and not self.is_paused):
+                    planned = next(plan, None)
+                    if planned is None:
+                        plan_exhausted = True
+                        self.logger.info(f"[STATS] Total {item_name} to import: {plan_stats['total_customers']}")
+                        self.logger.info(f"[STATS] Planned {self.total_batches} batches of {self.batch_size} {item_name} each (lazy loading - files are loaded during processing)")
+                        break
+                    planned_batches, lazy_batch, prepared = planned
+                    if self.ledger and self.ledger.is_finished(planned_batches):
+                        tally['resumed'] += 1
+                        tally['resumed_customers'] += lazy_batch['expected_size']
+                        continue
+                    self.remaining_batches[planned_batches] = lazy_batch  # Track remaining work
+                    in_flight[executor.submit(self.send_lazy_batch, lazy_batch, planned_batches, prepared)] = planned_batches
+
+                # Deferred retries only use slots fresh work leaves free
+                while (plan_exhausted and deferred and deferred[0][0] <= time.monotonic()
+                       and len(in_flight) < self.dispatch_window and not self.should_stop and not self.is_paused):
+                    _, deferred_id = heapq.heappop(deferred)
+                    self.logger.info(f"[DEFERRED] Retrying batch {deferred_id} (deferred pass {self.deferred_passes[deferred_id]}/{self.deferred_retry_passes})")
+                    in_flight[executor.submit(self.send_lazy_batch, self.remaining_batches[deferred_id], deferred_id)] = deferred_id
+
+                if not in_flight:
+                    if self.should_stop or (plan_exhausted and not deferred):
+                        break
+                    if plan_exhausted and not self.is_paused:
+                        # Only deferred retries left - sleep until the next cool-down ends
+                        time.sleep(min(0.5, max(0.0, deferred[0][0] - time.monotonic())))
+                        continue
+                    # Paused with nothing in flight - wait for resume or stop
+                    self.pause_event.wait(timeout=0.5)
+                    continue
 
-                    # Track stopped batches for resume functionality
-                    if result.get('status') == 'stopped':
-                        stopped_batches.append(batch_id)
+                done, _ = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch_id = in_flight.pop(future)
+                    lazy_batch = self.remaining_batches.get(batch_id)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.logger.error(f"[ERROR] Batch {batch_id} failed with exception: {e}")
+                        result = {'batch_id': batch_id, 'status': 'failed', 'error': str(e)}
+
+                    status = result.get('status', 'unknown')
+                    if status == 'stopped':
+                        # Keep in remaining batches for resume functionality
+                        tally['stopped'] += 1
+                        tally['stopped_customers'] += lazy_batch['expected_size'] if lazy_batch else 0
                         self.logger.info(f"[STOP] Batch {batch_id} stopped - can be resumed later")
+                    elif status == 'failed' and result.get('deferred'):
+                        # Stays in remaining batches (saved for resume if the run stops first)
+                        with self.lock:
+                            passes = self.deferred_passes.get(batch_id, 0) + 1
+                            self.deferred_passes[batch_id] = passes
+                        self.deferred_stats['deferred'] += 1
+                        cool_down = self.deferred_retry_delay * passes
+                        heapq.heappush(deferred, (time.monotonic() + cool_down, batch_id))
+                        self.logger.warning(f"[DEFERRED] Batch {batch_id} exhausted its retries ({result.get('error', '')[:100]}) - "
+                                            f"retrying after {cool_down:g}s once fresh work is sent")
+                        if hasattr(self, 'progress_callback') and self.progress_callback:
+                            self._emit_progress({
+                                'type': 'batch_deferred',
+                                'batch_id': batch_id,
+                                'customers_count': lazy_batch['expected_size'] if lazy_batch else 0,
+                                'deferred_pass': passes,
+                                'deferred_passes': self.deferred_retry_passes,
+                                'cool_down_seconds': cool_down,
+                                'error_summary': result.get('error', '')[:200],
+                                'concurrency_limit': self.get_concurrency_limit()
+                            })
                     else:
                         # Remove from remaining batches (completed or failed)
-                        self.remaining_batches = [b for b in self.remaining_batches if lazy_batches[batch_id-1] != b]
+                        self.remaining_batches.pop(batch_id, None)
+                        if self.ledger and status == 'success':
+                            # Queued behind the batch's own artifacts; failed batches are recorded
+                            # by save_failed_batches once their retry file is on disk
+                            self.persistence.call(self.ledger.mark_finished, batch_id, status)
+                        if status == 'success':
+                            tally['success'] += 1
+                            tally['success_customers'] += result.get('customers_count', 0)
+                            if batch_id in self.deferred_passes:
+                                self.deferred_stats['recovered'] += 1
+                        elif status == 'failed':
+                            tally['failed'] += 1
+                            tally['failed_customers'] += result.get('customers_count', 0)
+                            if result.get('error_type') == 'auth_service_down':
+                                tally['auth_failures'] += 1
 
                     # Log memory-efficient completion
-                    status = result.get('status', 'unknown')
-                    customers_count = result.get('customers_count', 0)
-                    item_name = "households" if self.import_type == "households" else "customers"
-                    self.logger.debug(f"[COMPLETE] Batch {batch_id} completed ({status}) - {customers_count} {item_name} processed and freed from memory")
-
-                except Exception as e:
-                    self.logger.error(f"[ERROR] Batch {batch_id} failed with exception: {e}")
-                    results.append({
-                        'batch_id': batch_id,
-                        'status': 'failed',
-                        'error': str(e)
-                    })
-                finally:
-                    # Clean up future reference to help garbage collection
-                    future_to_batch.pop(future, None)
+                    self.logger.debug(f"[COMPLETE] Batch {batch_id} completed ({status}) - {result.get('customers_count', 0)} {item_name} processed and freed from memory")
 
                     # Trigger garbage collection every 10 batches to free memory
                     if batch_id % 10 == 0:
                         gc.collect()
                         self.logger.debug(f"[CLEANUP] Memory cleanup triggered after batch {batch_id}")
 
-                    # Check if we should auto-pause due to auth service issues
-                    if self.auth_service_down and not self.is_paused and not self.should_stop:
-                        self.logger.error("[ALERT] AUTO-PAUSING due to auth service being down")
-                        self.pause_import()
-        
+            if self.should_stop and not plan_exhausted:
+                # Record undispatched work so it can be resumed
+                if isinstance(plan, BatchPrefetcher):
+                    plan.stop_preparing()
+                for planned_batches, lazy_batch, _ in plan:
+                    if self.ledger and self.ledger.is_finished(planned_batches):
+                        continue
+                    self.remaining_batches[planned_batches] = lazy_batch
+                    tally['stopped_customers'] += lazy_batch['expected_size']
+                self.logger.info(f"[STOP] {len(self.remaining_batches)} batches not sent - saved for resume")
+
+            if deferred:
+                # Stopped before the deferred passes ran - they stay in the resume work
+                for _, deferred_id in deferred:
+                    tally['stopped_customers'] += self.remaining_batches[deferred_id]['expected_size']
+                self.logger.info(f"[STOP] {len(deferred)} deferred batches not retried - saved for resume")
+
+        if self.watchdog:
+            self.watchdog.stop()
+        if self.auth_monitor:
+            self.auth_monitor.stop()
+        if self.auth_manager:
+            self.auth_manager.stop_background_refresh()
+        if self.progress_stream:
+            self.progress_stream.stop()
+        if isinstance(plan, BatchPrefetcher):
+            plan.close()
+            self.logger.debug(f"[PREFETCH] {plan.prepared_count} batches read and encoded ahead of the workers")
+
+        # Drain queued artifacts before anything reads them back
+        persistence_stats = self.persistence.close()
+        if persistence_stats['written'] or persistence_stats['errors']:
+            self.logger.info(f"[PERSIST] Wrote {persistence_stats['written']} artifacts ({persistence_stats['bytes']:,} bytes), "
+                             f"{persistence_stats['errors']} errors, peak queue depth {persistence_stats['peak_queue_depth']}")
+        self._close_response_archive()
+        run_complete = plan_exhausted and not self.should_stop and tally['stopped'] == 0
+
+        # Workers are done - release their keep-alive connections
+        self.close_http_sessions()
+
+        if planned_batches == 0:
+            self._close_ledger(run_complete)
+            self.failed_customers_journal.close()
+            item_name_single = "household" if self.import_type == "households" else "customer"
+            self.logger.error(f"No {item_name_single} data found!")
+            return {'status': 'error', 'message': f'No {item_name_single} data found'}
+
         # Calculate final statistics
         end_time = datetime.now()
         duration = end_time - start_time
         
-        successful_batches = len([r for r in results if r.get('status') == 'success'])
-        failed_batches = len([r for r in results if r.get('status') == 'failed'])
-        stopped_batches = len([r for r in results if r.get('status') == 'stopped'])
-
-        # Calculate actual customer counts from results
-        successful_customers = sum(r.get('customers_count', 0) for r in results if r.get('status') == 'success')
-        failed_customers_count = sum(r.get('customers_count', 0) for r in results if r.get('status') == 'failed')
-        stopped_customers_count = sum(lazy_batches[r['batch_id']-1]['expected_size'] for r in results if r.get('status') == 'stopped')
+        total_customers = plan_stats['total_customers']
+        successful_batches = tally['success']
+        failed_batches = tally['failed']
+        stopped_batches = tally['stopped']
+        successful_customers = tally['success_customers']
+        failed_customers_count = tally['failed_customers']
+        stopped_customers_count = tally['stopped_customers']
+        attempted_customers = total_customers - tally['resumed_customers']
         
         summary = {
             'status': 'completed',
@@ -1320,7 +2122,25 @@ The structure helps organize failures by type for easier handling and retry.
             'failed_batches': failed_batches,
             'successful_customers': successful_customers,
             'failed_customers': failed_customers_count,
-            'success_rate': f"{(successful_customers/total_customers)*100:.1f}%" if total_customers > 0 else '0.0%'
+            'resumed_batches': tally['resumed'],
+            'responses_archived': self.response_policy.kept,
+            'responses_skipped': self.response_policy.skipped,
+            'response_bytes_written': self.response_archive_stats['bytes'],
+            'response_bytes_saved': self.response_policy.skipped_bytes,
+            'request_bytes_raw': self.compression_stats['raw_bytes'],
+            'request_bytes_sent': self.compression_stats['sent_bytes'],
+            'request_bytes_saved': self.compression_stats['raw_bytes'] - self.compression_stats['sent_bytes'],
+            # Only meaningful when gzip bodies were actually sent
+            'compression_ratio': (round(self.compression_stats['raw_bytes'] / self.compression_stats['sent_bytes'], 2)
+                                  if self.compression_stats['gzip_requests'] and self.compression_stats['sent_bytes'] else None),
+            'retries': self.retry_policy.retries,
+            'retries_denied': self.retry_policy.retries_denied,
+            'circuit_opened': self.circuit.opened_count if self.circuit else 0,
+            'stuck_attempts': self.watchdog.flagged_total if self.watchdog else 0,
+            'quarantined_batches': self.quarantined_batches,
+            'deferred_retries': self.deferred_stats['deferred'],
+            'recovered_by_deferred_retry': self.deferred_stats['recovered'],
+            'success_rate': f"{(successful_customers/attempted_customers)*100:.1f}%" if attempted_customers > 0 else '0.0%'
         }
         
         item_name = "households" if self.import_type == "households" else "customers"
@@ -1328,9 +2148,25 @@ The structure helps organize failures by type for easier handling and retry.
         self.logger.info(f"   Total {item_name}: {total_customers}")
         self.logger.info(f"   Successful: {successful_customers}")
         self.logger.info(f"   Failed: {failed_customers_count}")
-        if stopped_batches > 0:
+        if tally['resumed'] > 0:
+            self.logger.info(f"   Already done (resumed): {tally['resumed_customers']} in {tally['resumed']} batches")
+        if stopped_customers_count > 0:
             self.logger.info(f"   Stopped: {stopped_customers_count}")
         self.logger.info(f"   Success rate: {summary['success_rate']}")
+        if summary['request_bytes_saved'] > 0:
+            self.logger.info(f"   Request bodies: {summary['request_bytes_sent']:,} bytes sent for {summary['request_bytes_raw']:,} bytes of JSON "
+                             f"(ratio {summary['compression_ratio']}x, {summary['request_bytes_saved']:,} bytes saved)")
+        if summary['retries'] or summary['retries_denied']:
+            self.logger.info(f"   Retries: {summary['retries']} ({summary['retries_denied']} refused by the retry budget)")
+        if summary['deferred_retries']:
+            self.logger.info(f"   Deferred retries: {summary['deferred_retries']} ({summary['recovered_by_deferred_retry']} batches recovered)")
+        if summary['stuck_attempts']:
+            self.logger.info(f"   Stuck attempts flagged: {summary['stuck_attempts']} ({summary['quarantined_batches']} batches quarantined)")
+        if summary['circuit_opened']:
+            self.logger.info(f"   Endpoint circuit opened {summary['circuit_opened']} time(s)")
+        if self.response_policy.skipped:
+            self.logger.info(f"   Responses archived: {self.response_policy.kept} ({summary['response_bytes_written']:,} bytes), "
+                             f"skipped: {self.response_policy.skipped} ({summary['response_bytes_saved']:,} bytes not written)")
         self.logger.info(f"   Duration: {duration}")
 
         # Handle stopped import
@@ -1352,13 +2188,13 @@ The structure helps organize failures by type for easier handling and retry.
                 self.logger.info("   Use this file to resume the import later")
 
         # Check for auth service issues
-        if self.auth_service_down:
+        if self.auth_service_down or self.auth_outages:
             self.logger.error("[AUTH SERVICE DOWN] AUTH SERVICE WAS DOWN during import!")
             self.logger.error("   Some failures may be due to auth service issues")
             self.logger.error("   Check auth_service_down_* directories for affected batches")
 
         # Categorize failures by type
-        auth_failures = len([r for r in results if r.get('error_type') == 'auth_service_down'])
+        auth_failures = tally['auth_failures']
         api_failures = failed_batches - auth_failures
 
         if auth_failures > 0:
@@ -1385,12 +2221,26 @@ The structure helps organize failures by type for easier handling and retry.
                 self.logger.info(f"   UNKNOWN reason {item_name}: {unknown_count}")
             self.logger.info(f"   Individual {item_name} files saved in failed_{item_name}/single_failures/* directories")
 
-        # Save failed batches for retry
+        # Save failed batches for retry (this also records them in the ledger)
         if self.failed_batches:
             self.save_failed_batches()
+        self._close_ledger(run_complete)
+
+        # Consolidate the failed customers journal into the JSON file
+        if self.failed_customers_journal.count:
+            self.materialize_failed_customers()
+        self.failed_customers_journal.close()
         
         return summary
     
+    def _close_ledger(self, run_complete: bool) -> None:
+        """Close the progress ledger, archiving it when the whole plan finished"""
+        if not self.ledger:
+            return
+        self.ledger.close(completed=run_complete)
+        if run_complete:
+            self.logger.info(f"[LEDGER] Plan complete - ledger archived as {self.ledger.path}")
+
     def save_failed_batches(self):
         """Save failed batches in format suitable for immediate re-import"""
         if not self.failed_batches:
@@ -1422,7 +2272,14 @@ The structure helps organize failures by type for easier handling and retry.
 
             # Save the batch
             with open(retry_filepath, 'w', encoding='utf-8') as f:
-                json.dump(retry_batch, f, indent=2, ensure_ascii=False)
+                json_codec.dump(retry_batch, f)
+                if self.ledger:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            # Only now may a resume skip the batch - its customers are in the retry file
+            if self.ledger:
+                self.ledger.mark_finished(failed_batch['batch_id'], 'failed', retry_file=retry_filepath)
 
             retry_files.append(retry_filename)
 
@@ -1453,7 +2310,7 @@ The structure helps organize failures by type for easier handling and retry.
         }
 
         with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary_data, f, indent=2, ensure_ascii=False)
+            json_codec.dump(summary_data, f, pretty=True)
 
         # Create instructions file
         instructions_file = os.path.join(retry_dir, "RETRY_INSTRUCTIONS.md")
@@ -1501,7 +2358,7 @@ All retry files are formatted correctly for immediate import!
 
         # Notify GUI about retry files creation
         if hasattr(self, 'progress_callback') and self.progress_callback:
-            self.progress_callback({
+            self._emit_progress({
                 'type': 'retry_files_created',
                 'retry_directory': retry_dir,
                 'retry_files': retry_files,
@@ -1511,95 +2368,72 @@ All retry files are formatted correctly for immediate import!
                 'instructions_file': instructions_file
             })
 
-    def _save_api_response_to_file(self, batch_id: int, response_data: dict, status_code: int, headers: dict, response_type: str = "success"):
-        """Save full API response to file and return summary for memory efficiency"""
-        try:
-            with self.response_file_lock:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"batch_{batch_id:03d}_{response_type}_{timestamp}.json"
-                filepath = os.path.join(self.api_responses_dir, filename)
-                
-                # Full response data for file
-                full_response = {
-                    'timestamp': timestamp,
-                    'batch_id': batch_id,
-                    'status_code': status_code,
-                    'headers': headers,
-                    'response_data': response_data,
-                    'response_type': response_type
-                }
-                
-                # Save to file
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(full_response, f, indent=2, ensure_ascii=False)
-                
-                self.logger.debug(f"[API_LOG] Saved full response to: {filename}")
-                
-                # Return lightweight summary for GUI
-                summary = {
-                    'batch_id': batch_id,
-                    'status_code': status_code,
-                    'response_file': filename,
-                    'data_size': len(str(response_data)) if response_data else 0,
-                    'has_data': bool(response_data),
-                    'timestamp': timestamp
-                }
-                
-                # Add key response info without full data
-                if isinstance(response_data, dict):
-                    if 'data' in response_data and isinstance(response_data['data'], list):
-                        summary['customers_processed'] = len(response_data['data'])
-                    if 'message' in response_data:
-                        summary['message'] = response_data['message'][:100]  # First 100 chars
-                    if 'error' in response_data:
-                        summary['error_summary'] = response_data['error'][:200]  # First 200 chars
-                
-                return summary
-                
-        except Exception as e:
-            self.logger.error(f"[ERROR] Failed to save API response to file: {e}")
-            # Return basic summary even if file save fails
-            return {
+    def _get_response_archive(self) -> ResponseArchive:
+        """Archive for the current run, created on first use"""
+        with self.response_archive_lock:
+            if self.response_archive is None:
+                self.response_archive = ResponseArchive(self.api_responses_dir)
+            return self.response_archive
+
+    def _close_response_archive(self) -> None:
+        """Close the current run's archive (call after the persistence writer has drained)"""
+        with self.response_archive_lock:
+            archive, self.response_archive = self.response_archive, None
+        if archive is not None:
+            archive.close()
+            self.response_archive_stats['records'] += archive.records
+            self.response_archive_stats['bytes'] += archive.bytes_written
+            if archive.records:
+                self.logger.info(f"[ARCHIVE] {archive.records} responses archived in {archive.run_dir} "
+                                 f"({archive.bytes_written:,} bytes compressed)")
+
+    def _save_api_response_to_file(self, batch_id: int, response_data: dict, status_code: int, headers: dict, response_type: str = "success",
+                                   data_size: int = None, failure_count: int = 0):
+        """Queue the full API response for the response archive (subject to the response policy) and return a summary"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if data_size is None:
+            data_size = len(str(response_data)) if response_data else 0
+        parsed = not (isinstance(response_data, dict) and 'raw_response' in response_data)
+        keep = self.response_policy.should_keep(batch_id, status_code, failure_count, parsed, data_size)
+
+        if keep:
+            # Full response data for the archive
+            full_response = {
+                'timestamp': timestamp,
                 'batch_id': batch_id,
                 'status_code': status_code,
-                'response_file': 'save_failed',
-                'data_size': len(str(response_data)) if response_data else 0,
-                'error': f"File save failed: {e}"
+                'headers': headers,
+                'response_data': response_data,
+                'response_type': response_type
             }
+            archive = self._get_response_archive()
+            response_ref = archive.reference(batch_id, response_type)
+            # Compressed and appended by the persistence thread; errors are logged there
+            self.persistence.call(archive.append, batch_id, full_response, response_type, status_code)
+            self.logger.debug(f"[API_LOG] Queued full response for: {response_ref}")
+        else:
+            response_ref = None
+            self.logger.debug(f"[API_LOG] Batch {batch_id} response not archived ({self.response_policy.describe()})")
 
-    def _create_response_summary_for_gui(self, response_data: dict, failed_customers: list):
-        """Create memory-efficient summary for GUI display"""
-        summary = {}
-        
-        # Basic response info without full data
+        # Return lightweight summary for GUI
+        summary = {
+            'batch_id': batch_id,
+            'status_code': status_code,
+            'response_file': response_ref,
+            'data_size': data_size,
+            'has_data': bool(response_data),
+            'timestamp': timestamp
+        }
+
+        # Add key response info without full data
         if isinstance(response_data, dict):
-            # Count results without storing full data
             if 'data' in response_data and isinstance(response_data['data'], list):
-                summary['total_customers'] = len(response_data['data'])
-                
-                # Count successes/failures without storing details
-                success_count = 0
-                failure_count = 0
-                for customer in response_data['data']:
-                    if isinstance(customer, dict):
-                        result = customer.get('result', 'SUCCESS')
-                        if result in ['FAILED', 'ERROR', 'CONFLICT']:
-                            failure_count += 1
-                        else:
-                            success_count += 1
-                
-                summary['success_count'] = success_count
-                summary['failure_count'] = failure_count
-            
-            # Include error messages but not full data
-            if 'error' in response_data:
-                summary['api_error'] = str(response_data['error'])[:200]
+                summary['customers_processed'] = len(response_data['data'])
             if 'message' in response_data:
-                summary['api_message'] = str(response_data['message'])[:100]
-        
-        # Add failed customer count from our parsing
-        summary['parsed_failed_count'] = len(failed_customers) if failed_customers else 0
-        
+                summary['message'] = str(response_data['message'])[:100]  # First 100 chars
+            if 'error' in response_data:
+                summary['error_summary'] = str(response_data['error'])[:200]  # First 200 chars
+
         return summary
 
 # Example usage function
@@ -1633,7 +2467,7 @@ def main():
     print("\n" + "="*50)
     print("BULK IMPORT COMPLETED")
     print("="*50)
-    print(json.dumps(result, indent=2))
+    print(json_codec.dumps(result, pretty=True))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
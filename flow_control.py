@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+"""
+Flow control for Bulk Customer Import
+Rate limiting, adaptive concurrency, retry policy and circuit breaking shared by the import engine and the GUI presets
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, NamedTuple
+
+# GUI presets expressed as rate targets instead of raw delays between requests
+RATE_PRESETS: Dict[str, Dict[str, Any]] = {
+    'conservative': {
+        'batch_size': 50,
+        'max_workers': 2,
+        'requests_per_second': 1.0,
+        'records_per_second': 50.0,
+        'burst': 1,
+        'max_retries': 5
+    },
+    'balanced': {
+        'batch_size': 70,
+        'max_workers': 3,
+        'requests_per_second': 2.0,
+        'records_per_second': 140.0,
+        'burst': 3,
+        'max_retries': 3
+    },
+    'aggressive': {
+        'batch_size': 100,
+        'max_workers': 5,
+        'requests_per_second': 5.0,
+        'records_per_second': 500.0,
+        'burst': 5,
+        'max_retries': 2
+    }
+}
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket limiting requests/second and records/second, with burst capacity
+
+    Callers reserve tokens inside a short critical section and sleep outside of it,
+    so waiting threads never queue behind a sleeping lock holder. The bucket may go
+    into deficit; each reservation waits for its own share of that deficit.
+    """
+
+    def __init__(self,
+                 requests_per_second: Optional[float] = None,
+                 records_per_second: Optional[float] = None,
+                 burst: int = 1,
+                 records_burst: Optional[float] = None):
+        """
+        Initialize the rate limiter
+
+        Args:
+            requests_per_second: Sustained request rate (None or 0 = unlimited)
+            records_per_second: Sustained record rate (None or 0 = unlimited)
+            burst: Requests that may be sent back-to-back when the bucket is full
+            records_burst: Record capacity (defaults to one second of records_per_second)
+        """
+        self._lock = threading.Lock()
+        self.configure(requests_per_second, records_per_second, burst, records_burst)
+
+    @classmethod
+    def from_preset(cls, name: str) -> "TokenBucketRateLimiter":
+        """Create a limiter from one of the RATE_PRESETS"""
+        preset = RATE_PRESETS[name.lower()]
+        return cls(
+            requests_per_second=preset['requests_per_second'],
+            records_per_second=preset['records_per_second'],
+            burst=preset['burst']
+        )
+
+    def configure(self,
+                  requests_per_second: Optional[float] = None,
+                  records_per_second: Optional[float] = None,
+                  burst: int = 1,
+                  records_burst: Optional[float] = None) -> None:
+        """Change the rate targets; the buckets start full"""
+        with self._lock:
+            self.requests_per_second = requests_per_second if requests_per_second and requests_per_second > 0 else None
+            self.records_per_second = records_per_second if records_per_second and records_per_second > 0 else None
+            self.burst = max(1, int(burst or 1))
+            if self.records_per_second:
+                self.records_burst = max(1.0, float(records_burst or self.records_per_second))
+            else:
+                self.records_burst = 0.0
+
+            self._request_tokens = float(self.burst)
+            self._record_tokens = self.records_burst
+            self._last_refill = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_second:
+            self._request_tokens = min(float(self.burst), self._request_tokens + elapsed * self.requests_per_second)
+        if self.records_per_second:
+            self._record_tokens = min(self.records_burst, self._record_tokens + elapsed * self.records_per_second)
+
+    def reserve(self, records: int = 0) -> float:
+        """
+        Reserve one request (and `records` records) and return how long to wait before sending
+
+        Returns:
+            Seconds the caller must wait; 0.0 if it may send immediately
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            wait = 0.0
+            if self.requests_per_second:
+                self._request_tokens -= 1.0
+                if self._request_tokens < 0:
+                    wait = -self._request_tokens / self.requests_per_second
+            if self.records_per_second and records:
+                self._record_tokens -= records
+                if self._record_tokens < 0:
+                    wait = max(wait, -self._record_tokens / self.records_per_second)
+            return wait
+
+    def acquire(self, records: int = 0) -> float:
+        """Block until one request carrying `records` records may be sent; returns the time waited"""
+        wait = self.reserve(records)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def describe(self) -> str:
+        """Short human readable description of the rate targets"""
+        parts = [f"{self.requests_per_second:g} req/s" if self.requests_per_second else "unlimited req/s"]
+        if self.records_per_second:
+            parts.append(f"{self.records_per_second:g} records/s")
+        parts.append(f"burst {self.burst}")
+        return ", ".join(parts)
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD limit on the number of in-flight requests
+
+    The limit starts at initial_limit (by default a slow start at half of max_limit),
+    grows by one after every healthy window of samples (p95 latency and error rate within
+    bounds) and is cut multiplicatively on 429/5xx responses, transport errors or latency
+    spikes, always staying within [min_limit, max_limit]. Starting below the cap lets the
+    latency baseline be learned before full load and leaves room for the increase path.
+    """
+
+    def __init__(self,
+                 min_limit: int = 1,
+                 max_limit: int = 10,
+                 initial_limit: Optional[int] = None,
+                 latency_target_ms: Optional[float] = None,
+                 latency_tolerance: float = 2.0,
+                 max_error_rate: float = 0.05,
+                 decrease_factor: float = 0.5,
+                 window_size: int = 20,
+                 on_change=None):
+        """
+        Initialize the controller
+
+        Args:
+            min_limit: Lowest allowed number of in-flight requests
+            max_limit: Highest allowed number of in-flight requests
+            initial_limit: Starting limit (defaults to half of max_limit, at least min_limit)
+            latency_target_ms: p95 latency above which the limit is cut; when None the
+                               best healthy p95 seen so far times latency_tolerance is used
+            latency_tolerance: Allowed p95 growth over the baseline before cutting
+            max_error_rate: Error rate per window above which the limit is cut
+            decrease_factor: Multiplier applied to the limit on congestion
+            window_size: Samples per evaluation window
+            on_change: Optional callback(old_limit, new_limit, reason)
+        """
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = min(self.max_limit, max(self.min_limit, int(initial_limit or self.max_limit // 2)))
+        self.latency_target_ms = latency_target_ms
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+        self.decrease_factor = decrease_factor
+        self.window_size = max(1, int(window_size))
+        self.on_change = on_change
+
+        self.in_flight = 0
+        self.baseline_p95_ms: Optional[float] = None
+        self.last_p95_ms: Optional[float] = None
+        self._window_latencies = []
+        self._window_errors = 0
+        self._samples_since_decrease = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for an in-flight slot; returns False if the timeout expired first"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_flight < self.limit, timeout=timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency_seconds: float, status_code: Optional[int] = None) -> None:
+        """
+        Return a slot and record the outcome of the request
+
+        Args:
+            latency_seconds: Wall time of the request
+            status_code: HTTP status, or None if the request failed without a response
+        """
+        changes = []
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            congested = status_code is None or status_code == 429 or status_code >= 500
+
+            self._window_latencies.append(latency_seconds * 1000.0)
+            self._samples_since_decrease += 1
+            if congested:
+                self._window_errors += 1
+                # Cut at most once per "round trip" of in-flight requests
+                if self._samples_since_decrease >= self.limit:
+                    reason = f"HTTP {status_code}" if status_code else "request error"
+                    changes.append(self._decrease(reason))
+
+            if len(self._window_latencies) >= self.window_size:
+                changes.append(self._evaluate_window())
+
+            self._cond.notify_all()
+
+        if self.on_change:
+            for change in changes:
+                if change and change[0] != change[1]:
+                    self.on_change(*change)
+
+    def _decrease(self, reason: str):
+        old_limit = self.limit
+        self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        self._samples_since_decrease = 0
+        self._window_latencies = []
+        self._window_errors = 0
+        return old_limit, self.limit, reason
+
+    def _evaluate_window(self):
+        latencies = sorted(self._window_latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        error_rate = self._window_errors / len(latencies)
+        self.last_p95_ms = p95
+        self._window_latencies = []
+        self._window_errors = 0
+
+        threshold = self.latency_target_ms
+        if threshold is None and self.baseline_p95_ms is not None:
+            threshold = self.baseline_p95_ms * self.latency_tolerance
+
+        if error_rate > self.max_error_rate:
+            return self._decrease(f"error rate {error_rate:.0%}")
+        if threshold is not None and p95 > threshold:
+            return self._decrease(f"p95 latency {p95:.0f}ms > {threshold:.0f}ms")
+
+        if self.baseline_p95_ms is None or p95 < self.baseline_p95_ms:
+            self.baseline_p95_ms = p95
+        old_limit = self.limit
+        self.limit = min(self.max_limit, self.limit + 1)
+        return old_limit, self.limit, f"healthy window (p95 {p95:.0f}ms)"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current controller state for progress reporting"""
+        with self._cond:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'min_limit': self.min_limit,
+                'max_limit': self.max_limit,
+                'p95_ms': self.last_p95_ms,
+                'baseline_p95_ms': self.baseline_p95_ms
+            }
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is retried
+
+    Status codes are classified as retryable (5xx, 408, transport errors), throttled
+    (429) or non-retryable (other 4xx). Delays use decorrelated jitter so workers do
+    not retry in lockstep, and a Retry-After header always wins. A retry budget
+    shared by all workers caps retries at budget_ratio of the requests sent in the
+    last budget_window seconds (with a floor of min_retries), so an outage does not
+    multiply traffic.
+    """
+
+    RETRYABLE = "retryable"
+    THROTTLED = "throttled"
+    NON_RETRYABLE = "non_retryable"
+
+    RETRYABLE_4XX = (408, 425)
+    THROTTLE_STATUSES = (429,)
+    NON_RETRYABLE_5XX = (501, 505)
+
+    def __init__(self,
+                 base_delay: float = 1.0,
+                 max_delay: float = 60.0,
+                 budget_ratio: float = 0.2,
+                 min_retries: int = 10,
+                 budget_window: float = 60.0):
+        """
+        Initialize the retry policy
+
+        Args:
+            base_delay: Smallest backoff delay in seconds
+            max_delay: Largest backoff delay (and cap for Retry-After)
+            budget_ratio: Retries allowed as a share of all requests in the window
+            min_retries: Retries always allowed per window, however little traffic there is
+            budget_window: Sliding window for the retry budget in seconds
+        """
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.budget_ratio = max(0.0, budget_ratio)
+        self.min_retries = max(0, int(min_retries))
+        self.budget_window = budget_window
+
+        self.retries = 0
+        self.retries_denied = 0
+        self._requests = deque()
+        self._retry_times = deque()
+        self._lock = threading.Lock()
+
+    def classify(self, status_code: Optional[int]) -> str:
+        """Classify a response status (None = no response) as retryable, throttled or non-retryable"""
+        if status_code is None:
+            return self.RETRYABLE
+        if status_code in self.THROTTLE_STATUSES:
+            return self.THROTTLED
+        if status_code >= 500:
+            return self.NON_RETRYABLE if status_code in self.NON_RETRYABLE_5XX else self.RETRYABLE
+        if status_code in self.RETRYABLE_4XX:
+            return self.RETRYABLE
+        return self.NON_RETRYABLE
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def next_delay(self, previous_delay: Optional[float] = None, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before the next attempt
+
+        Args:
+            previous_delay: Delay used before the previous attempt (None for the first retry)
+            retry_after: Server-requested delay, honored (up to max_delay) when given
+        """
+        if retry_after is not None:
+            # Spread retries that were all told the same moment
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        previous = previous_delay if previous_delay else self.base_delay
+        return min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.budget_window
+        while self._requests and self._requests[0] < cutoff:
+            self._requests.popleft()
+        while self._retry_times and self._retry_times[0] < cutoff:
+            self._retry_times.popleft()
+
+    def record_request(self) -> None:
+        """Count one request (first attempt or retry) toward the budget window"""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            self._requests.append(now)
+
+    def try_acquire_retry(self) -> bool:
+        """Take one retry from the budget; False if retries already hit the cap"""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            allowed = max(self.min_retries, int(len(self._requests) * self.budget_ratio))
+            if len(self._retry_times) >= allowed:
+                self.retries_denied += 1
+                return False
+            self._retry_times.append(now)
+            self.retries += 1
+            return True
+
+    def describe(self) -> str:
+        """Short human readable description of the backoff and budget"""
+        return (f"jittered backoff {self.base_delay:g}-{self.max_delay:g}s, "
+                f"budget {self.budget_ratio:.0%} of requests (min {self.min_retries}) per {self.budget_window:g}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retry counters for progress reporting"""
+        with self._lock:
+            self._prune(time.monotonic())
+            return {
+                'retries': self.retries,
+                'retries_denied': self.retries_denied,
+                'window_requests': len(self._requests),
+                'window_retries': len(self._retry_times)
+            }
+
+
+class CircuitTicket(NamedTuple):
+    """Admission from CircuitBreaker.acquire(), handed back to record() with the outcome"""
+    generation: int
+    probe: bool
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around the import endpoint
+
+    Closed: requests flow and outcomes are tracked over the last window_size requests.
+    Once at least min_requests were seen and the share of 5xx/transport errors reaches
+    failure_rate, the circuit opens and requests wait. After open_seconds it goes
+    half-open and lets a single probe through; a successful probe closes the circuit
+    (full rate again), a failed one opens it for another open_seconds.
+
+    acquire() hands out a CircuitTicket stamped with the state generation (bumped on
+    every transition). record() only counts outcomes whose ticket belongs to the
+    current generation, so requests admitted before the circuit opened cannot decide
+    the probe when they finish late.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self,
+                 failure_rate: float = 0.5,
+                 min_requests: int = 10,
+                 window_size: int = 20,
+                 open_seconds: float = 30.0,
+                 on_change=None):
+        """
+        Initialize the breaker
+
+        Args:
+            failure_rate: Share of failed requests in the window that opens the circuit
+            min_requests: Requests needed in the window before the rate is judged
+            window_size: Number of most recent outcomes considered
+            open_seconds: Time the circuit stays open before a probe is sent
+            on_change: Optional callback(old_state, new_state, reason)
+        """
+        self.failure_rate = min(1.0, max(0.0, failure_rate))
+        self.window_size = max(1, int(window_size))
+        self.min_requests = min(self.window_size, max(1, int(min_requests)))
+        self.open_seconds = max(0.0, open_seconds)
+        self.on_change = on_change
+
+        self.state = self.CLOSED
+        self.opened_count = 0
+        self._outcomes = deque(maxlen=self.window_size)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._generation = 0
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def is_failure(status_code: Optional[int]) -> bool:
+        """Whether an outcome counts against the endpoint (5xx or no response)"""
+        return status_code is None or status_code >= 500
+
+    def _set_state(self, state: str, reason: str):
+        old_state = self.state
+        self.state = state
+        self._generation += 1
+        self._probe_in_flight = False
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            self.opened_count += 1
+        elif state == self.CLOSED:
+            self._outcomes.clear()
+        self._cond.notify_all()
+        return old_state, state, reason
+
+    def _try_pass(self):
+        """Admit one request if the current state allows it (lock held)"""
+        if self.state == self.CLOSED:
+            return CircuitTicket(self._generation, False), None
+        change = None
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                return None, None
+            change = self._set_state(self.HALF_OPEN, f"probing after {self.open_seconds:g}s open")
+        if self._probe_in_flight:
+            return None, change
+        self._probe_in_flight = True
+        return CircuitTicket(self._generation, True), change
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional["CircuitTicket"]:
+        """
+        Wait until a request may be sent
+
+        Returns:
+            The ticket to pass to record() with the outcome, or None if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changes = []
+        try:
+            with self._cond:
+                while True:
+                    ticket, change = self._try_pass()
+                    if change:
+                        changes.append(change)
+                    if ticket:
+                        return ticket
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    wait = remaining
+                    if self.state == self.OPEN:
+                        until_probe = self._opened_at + self.open_seconds - time.monotonic()
+                        wait = until_probe if wait is None else min(wait, until_probe)
+                    self._cond.wait(max(0.0, wait) if wait is not None else None)
+        finally:
+            self._notify(changes)
+
+    def record(self, status_code: Optional[int], ticket: "CircuitTicket") -> None:
+        """
+        Record the outcome of a request admitted by acquire()
+
+        Outcomes from an earlier generation are ignored, and while half-open only the
+        probe's own outcome counts.
+
+        Args:
+            status_code: HTTP status, or None if the request failed without a response
+            ticket: Ticket acquire() returned for the request
+        """
+        failed = self.is_failure(status_code)
+        change = None
+        with self._cond:
+            if ticket is None or ticket.generation != self._generation:
+                return
+            if self.state == self.HALF_OPEN:
+                if not ticket.probe:
+                    return
+                if failed:
+                    change = self._set_state(self.OPEN, "probe failed" + (f" (HTTP {status_code})" if status_code else ""))
+                else:
+                    change = self._set_state(self.CLOSED, "probe succeeded")
+            elif self.state == self.CLOSED:
+                self._outcomes.append(failed)
+                failures = sum(self._outcomes)
+                if len(self._outcomes) >= self.min_requests and failures >= self.failure_rate * len(self._outcomes):
+                    change = self._set_state(self.OPEN, f"{failures}/{len(self._outcomes)} recent requests failed")
+        self._notify([change] if change else [])
+
+    def _notify(self, changes) -> None:
+        if self.on_change:
+            for change in changes:
+                self.on_change(*change)
+
+    def describe(self) -> str:
+        """Short human readable description of the trip settings"""
+        return (f"opens at {self.failure_rate:.0%} failures of the last {self.window_size} requests "
+                f"(min {self.min_requests}), probes after {self.open_seconds:g}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current breaker state for progress reporting"""
+        with self._cond:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+            return {
+                'state': self.state,
+                'recent_failures': sum(self._outcomes),
+                'recent_requests': len(self._outcomes),
+                'opened_count': self.opened_count,
+                'probe_in': retry_in
+            }
@@ -3,7 +3,7 @@ Test Data Generator for Customers and Households
 Generates matching customer and household JSON files for testing import functionality
 """
 
-import json
+import json_codec
 import random
 from datetime import datetime, timedelta
 import argparse
@@ -69,7 +69,7 @@ def generate_household(household_id, primary_member_id, member_ids, primary_memb
         "memberIds": member_ids
     }
 
-def generate_test_data(num_customers=1000, start_id=60000000, output_prefix="generated"):
+def generate_test_data(num_customers=1000, start_id=60000000, output_prefix="generated", pretty=False):
     """
     Generate test customer and household data
     
@@ -139,14 +139,14 @@ def generate_test_data(num_customers=1000, start_id=60000000, output_prefix="gen
     
     # Write customer file
     with open(customer_file, 'w', encoding='utf-8') as f:
-        json.dump(customer_data, f, indent=2, ensure_ascii=False)
+        json_codec.dump(customer_data, f, pretty=pretty)
     
     print(f"✅ Created {customer_file}")
     print(f"   - {len(customers)} customers")
     
     # Write household file
     with open(household_file, 'w', encoding='utf-8') as f:
-        json.dump(household_data, f, indent=2, ensure_ascii=False)
+        json_codec.dump(household_data, f, pretty=pretty)
     
     print(f"✅ Created {household_file}")
     print(f"   - {len(households)} households")
@@ -174,13 +174,16 @@ def main():
                        help="Starting customer ID (default: 60000000)")
     parser.add_argument("-o", "--output-prefix", type=str, default="generated",
                        help="Output file prefix (default: generated)")
+    parser.add_argument("--pretty", action="store_true",
+                       help="Indent the output files (default: compact)")
     
     args = parser.parse_args()
     
     generate_test_data(
         num_customers=args.num_customers,
         start_id=args.start_id,
-        output_prefix=args.output_prefix
+        output_prefix=args.output_prefix,
+        pretty=args.pretty
     )
 
 if __name__ == "__main__":
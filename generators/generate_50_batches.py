@@ -5,11 +5,14 @@ Each customer will have a unique personalNumber and realistic Swedish data
 Optimized for bulk import testing with 50 batches
 """
 
-import json
 import random
 import os
+import sys
 from datetime import datetime, timedelta
 
+import _project_path  # noqa: F401 - project root on sys.path for json_codec
+import json_codec
+
 # Swedish first names
 FIRST_NAMES = [
     "Erik", "Lars", "Karl", "Anders", "Per", "Johan", "Nils", "Lennart", "Mikael", "Gunnar",
@@ -144,6 +147,8 @@ def generate_customer(personal_number, customer_id):
 
 def main():
     """Generate 5000 unique customers in 50 batches of 100 each"""
+    # --pretty writes indented batch files; compact is the default
+    pretty = "--pretty" in sys.argv[1:]
     print("=" * 60)
     print("GENERATING 5000 UNIQUE CUSTOMERS")
     print("50 batches × 100 customers each")
@@ -189,8 +194,8 @@ def main():
         filename = f"customers_100_batch_{batch_num:02d}.json"
         filepath = os.path.join(output_dir, filename)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(batch_data, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            json_codec.dump(batch_data, f, pretty=pretty)
         
         total_customers_generated += len(batch_customers)
         print(f"  [OK] Saved {len(batch_customers)} customers to {filename}")
@@ -213,7 +218,7 @@ def main():
     
     summary_file = os.path.join(output_dir, "generation_summary.json")
     with open(summary_file, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+        json_codec.dump(summary, f, pretty=True)
     
     # Create import instructions
     instructions_file = os.path.join(output_dir, "IMPORT_INSTRUCTIONS.md")
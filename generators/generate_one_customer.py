@@ -5,6 +5,9 @@ Generate just one customer with firstname and lastname using the test data
 
 import random
 
+import _project_path  # noqa: F401 - project root on sys.path for json_codec
+import json_codec
+
 # Swedish first names (from tests/generate_1000_customers.py)
 FIRST_NAMES = [
     "Erik", "Lars", "Karl", "Anders", "Per", "Johan", "Nils", "Lennart", "Mikael", "Gunnar",
@@ -67,14 +70,12 @@ def generate_one_customer_batch():
     return batch
 
 if __name__ == "__main__":
-    import json
-
     batch = generate_one_customer_batch()
 
     # Save to file
     filename = "single_customer_batch.json"
     with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(batch, f, indent=2, ensure_ascii=False)
+        json_codec.dump(batch, f, pretty=True)
 
     print(f"✅ Generated single customer batch file: {filename}")
     print(f"📋 Customer: {batch['data'][0]['person']['firstName']} {batch['data'][0]['person']['lastName']}")
@@ -82,4 +83,4 @@ if __name__ == "__main__":
 
     # Also display the content
     print(f"\n📄 File content:")
-    print(json.dumps(batch, indent=2, ensure_ascii=False))
+    print(json_codec.dumps(batch, pretty=True))
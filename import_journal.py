@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Import journals for Bulk Customer Import
+Durable, append-only records of run progress so an interrupted import can resume
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List
+import logging
+
+import json_codec
+
+LEDGER_SUFFIX = ".ledger.jsonl"
+COMPLETED_LEDGER_SUFFIX = ".completed.jsonl"
+
+
+class ProgressLedger:
+    """
+    Completion bitmap for one import plan, backed by an fsync'd JSONL ledger
+
+    The ledger stores the planned record count of every source file and one line
+    per finished batch. Reopening it restores the bitmap, so a killed process can
+    skip finished batches without rescanning the sources.
+    """
+
+    def __init__(self, path: str, fingerprint: str, fsync: bool = True):
+        """
+        Initialize the ledger (nothing is read or written until open())
+
+        Args:
+            path: Ledger file path
+            fingerprint: Plan fingerprint the ledger belongs to
+            fsync: Flush every line to disk before returning
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.fsync = fsync
+        self.planned_counts: Dict[str, int] = {}
+        self.finished_count = 0
+        self._bits = bytearray()
+        self._file = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def plan_fingerprint(file_paths: List[str], batch_size: int, data_key: str, api_url: str) -> str:
+        """Hash of everything that determines batch numbering and destination"""
+        sources = []
+        for file_path in file_paths:
+            stat = os.stat(file_path)
+            sources.append([os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns])
+        # stdlib json keeps the fingerprint identical whichever codec backend is installed
+        key = json.dumps([sources, batch_size, data_key, api_url], sort_keys=True)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def for_plan(cls, directory: str, file_paths: List[str], batch_size: int, data_key: str,
+                 api_url: str, fsync: bool = True) -> "ProgressLedger":
+        """Ledger for a plan, named after its fingerprint inside directory"""
+        fingerprint = cls.plan_fingerprint(file_paths, batch_size, data_key, api_url)
+        path = os.path.join(directory, f"progress_{fingerprint[:16]}{LEDGER_SUFFIX}")
+        return cls(path, fingerprint, fsync=fsync)
+
+    def open(self, resume: bool = True) -> int:
+        """
+        Open the ledger for appending, restoring earlier progress when resume is True
+
+        Returns:
+            Number of batches already finished
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if resume and os.path.exists(self.path):
+            self._load()
+        else:
+            self.planned_counts = {}
+            self.finished_count = 0
+            self._bits = bytearray()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._append({'event': 'start', 'fingerprint': self.fingerprint, 'time': datetime.now().isoformat()})
+        return self.finished_count
+
+    def _load(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json_codec.loads(line)
+                except ValueError:
+                    # Torn final write from a killed process
+                    self.logger.warning(f"[LEDGER] Ignoring unreadable line {line_number} in {self.path}")
+                    continue
+                event = entry.get('event')
+                if event == 'start' and entry.get('fingerprint') != self.fingerprint:
+                    raise ValueError(f"Ledger {self.path} belongs to a different import plan")
+                if event == 'plan':
+                    self.planned_counts[entry['file']] = entry['count']
+                elif event == 'done':
+                    self._set_bit(entry['batch'])
+
+    def _set_bit(self, batch_id: int) -> bool:
+        byte_index, bit = divmod(batch_id, 8)
+        if byte_index >= len(self._bits):
+            self._bits.extend(bytes(byte_index - len(self._bits) + 1))
+        if self._bits[byte_index] & (1 << bit):
+            return False
+        self._bits[byte_index] |= 1 << bit
+        self.finished_count += 1
+        return True
+
+    def _append(self, entry: dict) -> None:
+        self._file.write(json_codec.dumps(entry) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def is_finished(self, batch_id: int) -> bool:
+        """Check whether a batch was finished by this or an earlier run"""
+        byte_index, bit = divmod(batch_id, 8)
+        return byte_index < len(self._bits) and bool(self._bits[byte_index] & (1 << bit))
+
+    def record_plan(self, file_path: str, count: int) -> None:
+        """Remember a source file's record count so resume does not rescan it"""
+        with self._lock:
+            if self.planned_counts.get(file_path) == count:
+                return
+            self.planned_counts[file_path] = count
+            self._append({'event': 'plan', 'file': file_path, 'count': count})
+
+    def mark_finished(self, batch_id: int, status: str, **details) -> None:
+        """
+        Durably record that a batch reached a final status
+
+        Only call this once everything a resume needs about the batch is on disk;
+        a finished batch is skipped by every later run of the plan.
+
+        Args:
+            batch_id: Batch number in the plan
+            status: Final status ("success", or "failed" once its retry file exists)
+            details: Extra fields stored with the entry (e.g. retry_file)
+        """
+        with self._lock:
+            if self._set_bit(batch_id):
+                self._append({'event': 'done', 'batch': batch_id, 'status': status, **details})
+
+    def close(self, completed: bool = False) -> None:
+        """Close the ledger; a completed plan's ledger is renamed so the next run starts fresh"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+            if completed:
+                completed_path = self.path[:-len(LEDGER_SUFFIX)] + \
+                    f"_{datetime.now().strftime('%Y%m%d_%H%M%S')}{COMPLETED_LEDGER_SUFFIX}"
+                os.replace(self.path, completed_path)
+                self.path = completed_path
+
+
+class FailedCustomerJournal:
+    """
+    Append-only JSONL journal of failed customers
+
+    Each batch's failures are appended and flushed as one write. The consolidated
+    JSON array (the failed_customers file) is only materialized on demand, which
+    keeps per-failure I/O proportional to the failures being reported.
+    """
+
+    def __init__(self, json_path: str):
+        """
+        Initialize the journal (the .jsonl file is created on the first append)
+
+        Args:
+            json_path: Path of the consolidated JSON file; the journal sits next to it
+        """
+        self.json_path = json_path
+        self.path = os.path.splitext(json_path)[0] + ".jsonl"
+        self.count = 0
+        self.materialized_count = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def append(self, failed_customers: List[dict]) -> None:
+        """Append one batch worth of failures and flush them"""
+        if not failed_customers:
+            return
+        lines = "".join(json_codec.dumps(customer) + "\n" for customer in failed_customers)
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                # A new journal starts empty; reopening after close() keeps earlier entries
+                self._file = open(self.path, 'a' if self.count else 'w', encoding='utf-8')
+            self._file.write(lines)
+            self._file.flush()
+            self.count += len(failed_customers)
+
+    @staticmethod
+    def read_entries(path: str) -> List[dict]:
+        """Read every complete entry from a journal file"""
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json_codec.loads(line))
+                except ValueError:
+                    # Partial line still being written
+                    break
+        return entries
+
+    def materialize(self) -> str:
+        """
+        Write the consolidated JSON array from the journal
+
+        The output is the pretty-printed array (two space indent), streamed entry by entry.
+        Returns the JSON path.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            if self.materialized_count == self.count and os.path.exists(self.json_path):
+                return self.json_path
+
+            os.makedirs(os.path.dirname(self.json_path) or ".", exist_ok=True)
+            tmp_path = f"{self.json_path}.tmp"
+            written = 0
+            with open(tmp_path, 'w', encoding='utf-8') as out:
+                out.write("[")
+                if os.path.exists(self.path):
+                    for entry in self.read_entries(self.path):
+                        body = json_codec.dumps(entry, pretty=True).replace("\n", "\n  ")
+                        out.write(("," if written else "") + "\n  " + body)
+                        written += 1
+                out.write("\n]" if written else "]")
+            os.replace(tmp_path, self.json_path)
+            self.materialized_count = written
+            return self.json_path
+
+    def close(self) -> None:
+        """Close the journal file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
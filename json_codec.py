@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+JSON codec for Bulk Customer Import
+One entry point for encoding and decoding, backed by orjson or ujson when installed
+"""
+
+import json
+import os
+from typing import Any, Callable, Optional
+
+# Force a backend ("orjson", "ujson" or "json"); unset picks the fastest installed one
+BACKEND_ENV = "BULK_IMPORT_JSON_BACKEND"
+_PREFERENCE = ("orjson", "ujson", "json")
+
+# Raised by loads()/load() for bad input on every backend (orjson's error already subclasses it)
+JSONDecodeError = json.JSONDecodeError
+
+
+def _select_backend(preferred: Optional[str] = None):
+    candidates = _PREFERENCE
+    if preferred:
+        preferred = preferred.strip().lower()
+        candidates = (preferred,) + tuple(name for name in _PREFERENCE if name != preferred)
+    for name in candidates:
+        if name == "json":
+            return "json", json
+        try:
+            return name, __import__(name)
+        except ImportError:
+            continue
+    return "json", json
+
+
+backend, _module = _select_backend(os.environ.get(BACKEND_ENV))
+
+
+def _stdlib_dumps(obj: Any, pretty: bool, sort_keys: bool, default: Optional[Callable]) -> str:
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys, default=default)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, sort_keys=sort_keys, default=default)
+
+
+def dumps_bytes(obj: Any, pretty: bool = False, sort_keys: bool = False, default: Optional[Callable] = None) -> bytes:
+    """
+    Encode obj as UTF-8 JSON bytes (non-ASCII characters are not escaped)
+
+    Args:
+        obj: Object to encode
+        pretty: Indent by two spaces for human readers; compact otherwise
+        sort_keys: Sort object keys
+        default: Called for objects the encoder cannot handle
+    """
+    if backend == "orjson":
+        option = _module.OPT_NON_STR_KEYS
+        if pretty:
+            option |= _module.OPT_INDENT_2
+        if sort_keys:
+            option |= _module.OPT_SORT_KEYS
+        try:
+            return _module.dumps(obj, default=default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits - stdlib handles them
+            pass
+    elif backend == "ujson":
+        try:
+            return _module.dumps(obj, ensure_ascii=False, escape_forward_slashes=False,
+                                 indent=2 if pretty else 0, sort_keys=sort_keys,
+                                 **({'default': default} if default else {})).encode('utf-8')
+        except (TypeError, OverflowError):
+            pass
+    return _stdlib_dumps(obj, pretty, sort_keys, default).encode('utf-8')
+
+
+def dumps(obj: Any, pretty: bool = False, sort_keys: bool = False, default: Optional[Callable] = None) -> str:
+    """Encode obj as a JSON string (see dumps_bytes)"""
+    if backend == "json":
+        return _stdlib_dumps(obj, pretty, sort_keys, default)
+    return dumps_bytes(obj, pretty, sort_keys, default).decode('utf-8')
+
+
+def dump(obj: Any, fp, pretty: bool = False, sort_keys: bool = False, default: Optional[Callable] = None) -> None:
+    """Write obj as JSON to a text or binary file"""
+    if 'b' in getattr(fp, 'mode', ''):
+        fp.write(dumps_bytes(obj, pretty, sort_keys, default))
+    else:
+        fp.write(dumps(obj, pretty, sort_keys, default))
+
+
+def loads(data) -> Any:
+    """
+    Decode JSON from str, bytes, bytearray or memoryview
+
+    Raises:
+        JSONDecodeError: The input is not valid JSON (or not valid UTF-8)
+    """
+    try:
+        if backend == "json":
+            return json.loads(data if not isinstance(data, memoryview) else bytes(data))
+        if backend == "ujson" and isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        return _module.loads(data)
+    except JSONDecodeError:
+        raise
+    except ValueError as e:
+        # ujson errors and undecodable bytes are plain ValueErrors - give callers one type
+        raise JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from e
+
+
+def load(fp) -> Any:
+    """Decode JSON from a text or binary file"""
+    return loads(fp.read())
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON helpers for Bulk Customer Import
+Locates the records of the top-level data array by byte offset so batches
+can be read from disk without parsing the whole source file
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+import logging
+
+import json_codec
+
+# Characters that change nesting depth or start a string inside a value
+_STRUCTURAL = re.compile(rb'[{}\[\]"]')
+# Remainder of a JSON string after its opening quote (handles escapes)
+_STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+_WHITESPACE = re.compile(rb'[ \t\r\n]*')
+_SCALAR = re.compile(rb'[^,\]}\s]+')
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+# Record scanning runs the C JSON scanner over latin-1 text windows of this many bytes
+SCAN_WINDOW = 4 * 1024 * 1024
+_DECODER = json.JSONDecoder()
+_WHITESPACE_TEXT = re.compile(r'[ \t\r\n]*')
+
+# Sidecar index format version - bump when the on-disk layout changes
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+
+
+def _skip_ws(buf, pos: int) -> int:
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _skip_string(buf, pos: int) -> int:
+    """Return the position just after the string whose opening quote is at pos"""
+    match = _STRING_TAIL.match(buf, pos + 1)
+    if not match:
+        raise ValueError(f"Unterminated string at byte {pos}")
+    return match.end()
+
+
+def _skip_value(buf, pos: int) -> int:
+    """Return the position just after the JSON value starting at pos"""
+    first = buf[pos:pos + 1]
+    if first == b'"':
+        return _skip_string(buf, pos)
+
+    if first in (b'{', b'['):
+        depth = 0
+        while True:
+            match = _STRUCTURAL.search(buf, pos)
+            if not match:
+                raise ValueError(f"Unterminated container starting at byte {pos}")
+            char = match.group()
+            if char == b'"':
+                pos = _skip_string(buf, match.start())
+            elif char in (b'{', b'['):
+                depth += 1
+                pos = match.end()
+            else:
+                depth -= 1
+                pos = match.end()
+                if depth == 0:
+                    return pos
+
+    match = _SCALAR.match(buf, pos)
+    if not match:
+        raise ValueError(f"Expected a JSON value at byte {pos}")
+    return match.end()
+
+
+def _find_array(buf, data_key: str) -> Optional[int]:
+    """Return the offset just inside the '[' of the top-level data_key array, or None if absent"""
+    pos = 0
+    if buf[:3] == _UTF8_BOM:
+        pos = 3
+
+    pos = _skip_ws(buf, pos)
+    if buf[pos:pos + 1] != b'{':
+        raise ValueError("Top-level JSON value is not an object")
+    pos = _skip_ws(buf, pos + 1)
+    if buf[pos:pos + 1] == b'}':
+        return None
+
+    while True:
+        if buf[pos:pos + 1] != b'"':
+            raise ValueError(f"Expected object key at byte {pos}")
+        key_end = _skip_string(buf, pos)
+        key = json.loads(bytes(buf[pos:key_end]))
+
+        pos = _skip_ws(buf, key_end)
+        if buf[pos:pos + 1] != b':':
+            raise ValueError(f"Expected ':' at byte {pos}")
+        pos = _skip_ws(buf, pos + 1)
+
+        if key == data_key:
+            if buf[pos:pos + 1] != b'[':
+                raise ValueError(f"'{data_key}' is not an array")
+            return pos + 1
+
+        pos = _skip_ws(buf, _skip_value(buf, pos))
+        separator = buf[pos:pos + 1]
+        if separator == b'}':
+            return None
+        if separator != b',':
+            raise ValueError(f"Expected ',' or '}}' at byte {pos}")
+        pos = _skip_ws(buf, pos + 1)
+
+
+def iter_record_spans(buf, data_key: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) byte offsets of every element of the top-level data_key array
+
+    Elements are skipped by the C JSON scanner (json.JSONDecoder.raw_decode) over a
+    sliding latin-1 window of the buffer: latin-1 maps every byte to one character, so
+    character positions are byte offsets and multi-byte UTF-8 sequences, which never
+    contain structural characters, pass through string values untouched. Only one
+    window (SCAN_WINDOW bytes, or the largest record) is held as text at a time.
+
+    Args:
+        buf: bytes-like object (bytes, mmap) holding the whole JSON document
+        data_key: Name of the top-level array ("data" or "households")
+    """
+    pos = _find_array(buf, data_key)
+    if pos is None:
+        return
+
+    pos = _skip_ws(buf, pos)
+    if buf[pos:pos + 1] == b']':
+        return
+
+    size = len(buf)
+    window_start, text = pos, ""
+    window_size = SCAN_WINDOW
+    while True:
+        index = _WHITESPACE_TEXT.match(text, pos - window_start).end()
+        window_complete = window_start + len(text) >= size
+        try:
+            end_index = _DECODER.raw_decode(text, index)[1]
+            separator_index = _WHITESPACE_TEXT.match(text, end_index).end()
+            if separator_index >= len(text) and not window_complete:
+                raise ValueError("element runs past the scan window")
+        except ValueError as e:
+            if window_complete:
+                error_pos = window_start + getattr(e, 'pos', len(text))
+                raise ValueError(f"Invalid JSON value at byte {error_pos}") from e
+            # Slide the window to this element; grow it if the element alone did not fit
+            if window_start == pos and text:
+                window_size *= 2
+            window_start = pos
+            text = bytes(buf[pos:pos + window_size]).decode('latin-1')
+            continue
+
+        yield window_start + index, window_start + end_index
+
+        separator = text[separator_index:separator_index + 1]
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or ']' at byte {window_start + separator_index}")
+        pos = window_start + separator_index + 1
+
+
+class RecordIndex:
+    """Byte offsets of the records in one source file's data array"""
+
+    def __init__(self, file_path: str, data_key: str, size: int, mtime_ns: int, offsets: array):
+        self.file_path = file_path
+        self.data_key = data_key
+        self.size = size
+        self.mtime_ns = mtime_ns
+        # Flattened [start0, end0, start1, end1, ...]
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) // 2
+
+    def is_fresh(self) -> bool:
+        """Check the index still describes the file on disk"""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def byte_range(self, start_idx: int, end_idx: int) -> Tuple[int, int]:
+        """Byte range covering records [start_idx, end_idx), separators included"""
+        end_idx = min(end_idx, len(self))
+        if start_idx >= end_idx:
+            return 0, 0
+        return self.offsets[start_idx * 2], self.offsets[end_idx * 2 - 1]
+
+    def read_raw(self, start_idx: int, end_idx: int) -> bytes:
+        """Read the raw bytes of records [start_idx, end_idx) as a comma separated sequence"""
+        start, end = self.byte_range(start_idx, end_idx)
+        if start == end:
+            return b''
+        with open(self.file_path, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def read_records(self, start_idx: int, end_idx: int) -> List[dict]:
+        """Decode only records [start_idx, end_idx)"""
+        raw = self.read_raw(start_idx, end_idx)
+        if not raw:
+            return []
+        return json_codec.loads(b'[' + raw + b']')
+
+    @classmethod
+    def build(cls, file_path: str, data_key: str, validate: bool = False) -> "RecordIndex":
+        """
+        Scan the file once and record the byte span of every record
+
+        The scan already rejects malformed JSON syntax; records are not kept as objects.
+
+        Args:
+            file_path: Source JSON file
+            data_key: Name of the top-level array
+            validate: Also decode each record with the import codec (strict UTF-8) - slower,
+                      off for planning
+
+        Raises:
+            ValueError: The file is empty, not valid JSON, or (with validate) a record does not decode
+        """
+        stat = os.stat(file_path)
+        if stat.st_size == 0:
+            raise ValueError("File is empty")
+        offsets = array('Q')
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                for start, end in iter_record_spans(buf, data_key):
+                    if validate:
+                        try:
+                            json_codec.loads(buf[start:end])
+                        except ValueError as e:
+                            raise ValueError(f"Record {len(offsets) // 2} at byte {start} is not valid JSON: {e}") from e
+                    offsets.append(start)
+                    offsets.append(end)
+        return cls(file_path, data_key, stat.st_size, stat.st_mtime_ns, offsets)
+
+    def save(self, index_path: str) -> None:
+        """Write the index as a sidecar: one JSON header line followed by the raw offsets"""
+        header = {
+            'version': INDEX_VERSION,
+            'data_key': self.data_key,
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'records': len(self),
+            'itemsize': self.offsets.itemsize
+        }
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            self.offsets.tofile(f)
+        os.replace(tmp_path, index_path)
+
+    @staticmethod
+    def _read_fresh_header(f, data_key: str, stat: os.stat_result) -> Optional[dict]:
+        header = json.loads(f.readline())
+        if (header.get('version') != INDEX_VERSION or
+                header.get('data_key') != data_key or
+                header.get('size') != stat.st_size or
+                header.get('mtime_ns') != stat.st_mtime_ns):
+            return None
+        return header
+
+    @classmethod
+    def load(cls, file_path: str, data_key: str, index_path: str) -> Optional["RecordIndex"]:
+        """Load a sidecar index, returning None if it is missing or stale"""
+        try:
+            stat = os.stat(file_path)
+            with open(index_path, 'rb') as f:
+                header = cls._read_fresh_header(f, data_key, stat)
+                if header is None:
+                    return None
+                offsets = array('Q')
+                if header.get('itemsize') != offsets.itemsize:
+                    return None
+                offsets.fromfile(f, header['records'] * 2)
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+        return cls(file_path, data_key, stat.st_size, stat.st_mtime_ns, offsets)
+
+
+class RecordIndexCache:
+    """Thread-safe, per-file cache of record indexes backed by sidecar files"""
+
+    def __init__(self, data_key: str, use_sidecar: bool = True):
+        self.data_key = data_key
+        self.use_sidecar = use_sidecar
+        self._indexes: Dict[str, RecordIndex] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def sidecar_path(file_path: str) -> str:
+        return f"{file_path}{INDEX_SUFFIX}"
+
+    def count(self, file_path: str) -> int:
+        """
+        Number of records in a file
+
+        Counting goes through get(), so planning builds (or loads) the index the batches
+        are later read from and writes its sidecar - the file is scanned once, and
+        malformed JSON syntax fails here instead of at send time.
+        """
+        return len(self.get(file_path))
+
+    def get(self, file_path: str) -> RecordIndex:
+        """
+        Get the index for a file, loading or building it on first use
+
+        Only one thread builds the index for a given file; the others wait for it.
+        """
+        with self._lock:
+            index = self._indexes.get(file_path)
+            if index is not None and index.is_fresh():
+                return index
+            build_lock = self._build_locks.setdefault(file_path, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                index = self._indexes.get(file_path)
+            if index is not None and index.is_fresh():
+                return index
+
+            sidecar = self.sidecar_path(file_path)
+            index = RecordIndex.load(file_path, self.data_key, sidecar) if self.use_sidecar else None
+            if index is None:
+                index = RecordIndex.build(file_path, self.data_key)
+                self.logger.info(f"[INDEX] Indexed {len(index)} records in {file_path}")
+                if self.use_sidecar:
+                    try:
+                        index.save(sidecar)
+                    except OSError as e:
+                        # Read-only source directory - keep the index in memory only
+                        self.logger.debug(f"[INDEX] Could not write sidecar index {sidecar}: {e}")
+
+            with self._lock:
+                self._indexes[file_path] = index
+            return index
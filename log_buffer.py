@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Log ring buffer for the Bulk Customer Import GUI
+Keeps the newest entries of a log pane in memory and every entry in a text file on disk
+"""
+
+import os
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+import logging
+
+
+class LogRingBuffer:
+    """
+    Bounded in-memory log backed by an append-only text file
+
+    append() writes each entry to the file and keeps the newest max_entries in memory;
+    it returns the entries that fell out of memory so a widget showing the buffer can
+    drop them too. Older entries stay available from disk through read_older() and
+    search(), and copy_to() saves the log by streaming the file. clear() empties the
+    view: later reads and saves start after the clear while the file keeps everything.
+    """
+
+    def __init__(self, path: str, max_entries: int = 2000):
+        """
+        Initialize the buffer (the file is created on the first append)
+
+        Args:
+            path: Log file that receives every entry
+            max_entries: Entries kept in memory
+        """
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.logger = logging.getLogger(__name__)
+
+        self.entries = deque()  # (text, file offset)
+        self.entries_written = 0
+        self.size = 0  # Bytes in the file
+        self.start_offset = 0  # Reads and saves begin here (moved by clear())
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'ab+')
+            self.size = self._file.seek(0, os.SEEK_END)
+            if not self.entries_written:
+                self.start_offset = self.size  # An existing file's content is not part of this log
+        return self._file
+
+    def append(self, text: str) -> List[str]:
+        """
+        Add one entry (usually ending in a newline)
+
+        Returns:
+            Entries evicted from memory, oldest first
+        """
+        data = text.encode('utf-8')
+        with self._lock:
+            offset = self.size
+            try:
+                f = self._open()
+                f.write(data)
+                f.flush()
+                self.size += len(data)
+            except OSError as e:
+                # The pane keeps working from memory even if the disk copy fails
+                self.logger.warning(f"[GUI LOG] Could not write {self.path}: {e}")
+            self.entries.append((text, offset))
+            self.entries_written += 1
+            evicted = []
+            while len(self.entries) > self.max_entries:
+                evicted.append(self.entries.popleft()[0])
+            return evicted
+
+    @property
+    def older_offset(self) -> int:
+        """File offset where the in-memory entries begin (everything before is on disk only)"""
+        with self._lock:
+            return self.entries[0][1] if self.entries else self.size
+
+    @property
+    def has_older(self) -> bool:
+        """Whether entries since the last clear() dropped out of memory"""
+        return self.older_offset > self.start_offset
+
+    def _read_range(self, start: int, end: int) -> bytes:
+        with self._lock:
+            if self._file is None or end <= start:
+                return b""
+            self._file.flush()
+            with open(self.path, 'rb') as f:
+                f.seek(start)
+                return f.read(end - start)
+
+    def read_older(self, end: Optional[int] = None, max_bytes: int = 256 * 1024) -> Tuple[str, int]:
+        """
+        Read on-disk entries that are no longer in memory, newest chunk first
+
+        Args:
+            end: Read up to this offset (defaults to older_offset; pass the returned start to page back)
+            max_bytes: Chunk size
+
+        Returns:
+            (text, start offset of the text) - start equals start_offset when nothing older is left
+        """
+        end = self.older_offset if end is None else end
+        start = max(self.start_offset, end - max_bytes)
+        data = self._read_range(start, end)
+        if start > self.start_offset:
+            # Begin at a whole line
+            newline = data.find(b"\n")
+            if newline >= 0:
+                start += newline + 1
+                data = data[newline + 1:]
+        return data.decode('utf-8', errors='replace'), start
+
+    def search(self, query: str, max_matches: int = 1000) -> Tuple[List[str], bool]:
+        """
+        Case-insensitive search of the log on disk (since the last clear)
+
+        Returns:
+            (matching lines, True if max_matches cut the result short)
+        """
+        needle = query.lower()
+        matches = []
+        with self._lock:
+            if self._file is None:
+                return matches, False
+            self._file.flush()
+            start = self.start_offset
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            for raw in f:
+                line = raw.decode('utf-8', errors='replace').rstrip("\n")
+                if needle in line.lower():
+                    if len(matches) >= max_matches:
+                        return matches, True
+                    matches.append(line)
+        return matches, False
+
+    def copy_to(self, destination: str) -> int:
+        """
+        Stream the log (since the last clear) to destination
+
+        Returns:
+            Bytes written
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            start, end = self.start_offset, self.size
+        with open(destination, 'wb') as out:
+            if end > start:
+                with open(self.path, 'rb') as f:
+                    f.seek(start)
+                    remaining = end - start
+                    while remaining > 0:
+                        chunk = f.read(min(1024 * 1024, remaining))
+                        if not chunk:
+                            break
+                        out.write(chunk)
+                        remaining -= len(chunk)
+        return max(0, end - start)
+
+    def clear(self) -> None:
+        """Forget the in-memory entries; reads and saves start after this point"""
+        with self._lock:
+            self.entries.clear()
+            self.start_offset = self.size
+
+    def close(self) -> None:
+        """Close the log file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
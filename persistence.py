@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Write-behind persistence for Bulk Customer Import
+Moves artifact serialization and disk writes off the network worker threads
+"""
+
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
+import logging
+
+import json_codec
+
+_STOP = object()
+
+
+class PersistenceWriter:
+    """
+    Background writer fed by a bounded queue
+
+    Workers hand off JSON artifacts (or arbitrary write jobs) and return to
+    sending immediately. A single thread drains the queue in groups, serializes
+    and writes each artifact. When the queue is full, put() blocks, so workers
+    slow down to the disk's pace instead of buffering without limit. While the
+    writer is not running every job executes synchronously in the caller.
+    """
+
+    def __init__(self, max_queue: int = 256, drain_batch: int = 64, name: str = "persistence"):
+        """
+        Initialize the writer (call start() to run it in the background)
+
+        Args:
+            max_queue: Jobs that may wait before producers block
+            drain_batch: Jobs handled per wake-up of the writer thread
+            name: Writer thread name
+        """
+        self.max_queue = max(1, max_queue)
+        self.drain_batch = max(1, drain_batch)
+        self.name = name
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._known_dirs = set()
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {'written': 0, 'bytes': 0, 'errors': 0, 'peak_queue_depth': 0}
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background writer thread"""
+        if self.running:
+            return
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def write_json(self, path: str, data: Any, pretty: bool = False,
+                   log_message: Optional[str] = None, error_message: Optional[str] = None) -> None:
+        """
+        Write data as JSON to path (in the background when running)
+
+        Args:
+            path: Destination file; missing directories are created
+            data: JSON-serializable object (must not be mutated after hand-off)
+            pretty: Indent for human readers (machine-consumed artifacts stay compact)
+            log_message: Logged at INFO once the file is written
+            error_message: Logged at ERROR (with the exception) if the write fails
+        """
+        self._submit(('json', path, data, pretty, log_message, error_message))
+
+    def call(self, func: Callable, *args, **kwargs) -> None:
+        """Run an arbitrary write job on the writer thread"""
+        self._submit(('call', func, args, kwargs))
+
+    def _submit(self, job) -> None:
+        if not self.running:
+            self._execute(job)
+            return
+        self._queue.put(job)  # Blocks when full - backpressure on producers
+        depth = self._queue.qsize()
+        if depth > self.stats['peak_queue_depth']:
+            with self._stats_lock:
+                self.stats['peak_queue_depth'] = max(self.stats['peak_queue_depth'], depth)
+
+    def flush(self) -> None:
+        """Block until every queued job has been written"""
+        if self.running:
+            self._queue.join()
+
+    def close(self) -> Dict[str, int]:
+        """Write everything still queued, stop the thread and return write statistics"""
+        if self.running:
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+        return dict(self.stats)
+
+    def _run(self) -> None:
+        while True:
+            jobs = [self._queue.get()]
+            # Drain whatever else is already waiting so one wake-up handles a group of writes
+            while len(jobs) < self.drain_batch:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for job in jobs:
+                if job is _STOP:
+                    stop = True
+                else:
+                    self._execute(job)
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _execute(self, job) -> None:
+        kind = job[0]
+        if kind == 'call':
+            _, func, args, kwargs = job
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                with self._stats_lock:
+                    self.stats['errors'] += 1
+                self.logger.error(f"[PERSIST] Write job {getattr(func, '__name__', func)} failed: {e}")
+            return
+
+        _, path, data, pretty, log_message, error_message = job
+        try:
+            directory = os.path.dirname(path)
+            if directory and directory not in self._known_dirs:
+                os.makedirs(directory, exist_ok=True)
+                self._known_dirs.add(directory)
+            payload = json_codec.dumps_bytes(data, pretty=pretty)
+            with open(path, 'wb') as f:
+                f.write(payload)
+            with self._stats_lock:
+                self.stats['written'] += 1
+                self.stats['bytes'] += len(payload)
+            if log_message:
+                self.logger.info(log_message)
+        except Exception as e:
+            with self._stats_lock:
+                self.stats['errors'] += 1
+            self.logger.error(f"{error_message or f'[PERSIST] Error writing {path}'}: {e}")
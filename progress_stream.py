@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Progress stream for Bulk Customer Import
+Coalesces per-batch engine events into progress snapshots published at a fixed cadence
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+# Rare events that change what the user sees (states, retry files) - always forwarded
+STATE_EVENTS = ('circuit_state', 'auth_health', 'retry_files_created')
+
+# Per-batch events that carry an error summary
+ERROR_EVENTS = ('batch_error', 'batch_deferred', 'batch_stuck')
+
+
+class ProgressStream:
+    """
+    Aggregates engine events and publishes one snapshot per interval
+
+    record() is called by workers and only updates counters, so its cost does not
+    depend on the consumer. A single thread calls publish(snapshot) every interval
+    seconds with:
+
+    - counts / totals: events per type in this interval and since start()
+    - rates: batches per second and customers per minute over the interval
+    - latest_errors: up to error_limit error summaries from this interval
+    - events: state events (circuit, auth, retry files) in order
+    - details: the per-batch events themselves, only with include_details and at most
+      detail_limit per snapshot (details_dropped counts the rest)
+    - status: whatever status_provider() returns (engine counters, failed customers cursor)
+    """
+
+    def __init__(self,
+                 publish: Callable[[Dict[str, Any]], None],
+                 status_provider: Optional[Callable[[], Dict[str, Any]]] = None,
+                 interval: float = 0.5,
+                 include_details: bool = False,
+                 detail_limit: int = 20,
+                 error_limit: int = 5):
+        """
+        Initialize the stream (the thread starts with start())
+
+        Args:
+            publish: Receives each snapshot dict
+            status_provider: Optional callable whose dict is attached as 'status'
+            interval: Seconds between snapshots
+            include_details: Forward per-batch events inside the snapshots
+            detail_limit: Maximum per-batch events per snapshot
+            error_limit: Maximum error summaries per snapshot
+        """
+        self.publish = publish
+        self.status_provider = status_provider
+        self.interval = max(0.05, interval)
+        self.include_details = include_details
+        self.detail_limit = max(0, int(detail_limit))
+        self.error_limit = max(0, int(error_limit))
+        self.logger = logging.getLogger(__name__)
+
+        self.sequence = 0
+        self.totals: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reset_interval()
+
+    def _reset_interval(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._customers_sent = 0
+        self._new_failed_customers = 0
+        self._errors: List[Dict[str, Any]] = []
+        self._events: List[Dict[str, Any]] = []
+        self._details: List[Dict[str, Any]] = []
+        self._details_dropped = 0
+        self._interval_started = time.monotonic()
+
+    def record(self, event: Dict[str, Any]) -> None:
+        """Add one engine event to the current interval"""
+        event_type = event.get('type', 'unknown')
+        with self._lock:
+            self._counts[event_type] = self._counts.get(event_type, 0) + 1
+            self.totals[event_type] = self.totals.get(event_type, 0) + 1
+
+            if event_type in STATE_EVENTS:
+                self._events.append(event)
+                return
+
+            if event_type == 'batch_success':
+                self._customers_sent += event.get('customers_count', 0)
+                self._new_failed_customers += event.get('failed_customers_count', 0)
+            elif event_type in ERROR_EVENTS and len(self._errors) < self.error_limit:
+                self._errors.append({
+                    'type': event_type,
+                    'batch_id': event.get('batch_id'),
+                    'status_code': event.get('status_code'),
+                    'error_summary': event.get('error_summary', '')
+                })
+
+            if self.include_details:
+                if len(self._details) < self.detail_limit:
+                    self._details.append(event)
+                else:
+                    self._details_dropped += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Build the snapshot for the interval so far and start a new interval"""
+        with self._lock:
+            elapsed = max(time.monotonic() - self._interval_started, 1e-6)
+            batches = self._counts.get('batch_success', 0) + self._counts.get('batch_error', 0)
+            self.sequence += 1
+            snapshot = {
+                'type': 'progress_snapshot',
+                'sequence': self.sequence,
+                'interval_seconds': round(elapsed, 3),
+                'counts': self._counts,
+                'totals': dict(self.totals),
+                'rates': {
+                    'batches_per_second': round(batches / elapsed, 2),
+                    'customers_per_minute': round(self._customers_sent * 60 / elapsed, 1)
+                },
+                'customers_sent': self._customers_sent,
+                'new_failed_customers': self._new_failed_customers,
+                'latest_errors': self._errors,
+                'events': self._events,
+                'details': self._details,
+                'details_dropped': self._details_dropped
+            }
+            self._reset_interval()
+
+        if self.status_provider:
+            try:
+                snapshot['status'] = self.status_provider()
+            except Exception as e:
+                self.logger.debug(f"[PROGRESS] Status provider failed: {e}")
+        return snapshot
+
+    def flush(self) -> None:
+        """Publish a snapshot now"""
+        try:
+            self.publish(self.snapshot())
+        except Exception as e:
+            self.logger.warning(f"[PROGRESS] Publishing progress snapshot failed: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    @property
+    def running(self) -> bool:
+        """Whether snapshots are being published (events recorded otherwise wait for a flush)"""
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start publishing snapshots"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        with self._lock:
+            self._reset_interval()
+        self._thread = threading.Thread(target=self._run, name="progress-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread and publish what is left as a final snapshot"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Response archive for Bulk Customer Import
+Stores API responses as gzip-compressed JSONL segments with a batch index
+"""
+
+import gzip
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import json_codec
+
+SEGMENT_PREFIX = "segment_"
+SEGMENT_SUFFIX = ".jsonl.gz"
+INDEX_FILENAME = "index.jsonl"
+RUN_PREFIX = "run_"
+
+# Response persistence modes offered in the GUI
+RESPONSE_POLICY_MODES = ("all", "failures", "sampled")
+
+
+class ResponseArchive:
+    """
+    Rolling archive of API responses for one import run
+
+    Layout: <base_dir>/run_<timestamp>/segment_00001.jsonl.gz, ... plus index.jsonl.
+    Every response is one gzip member holding one JSON line, so a segment is a valid
+    gzip stream as a whole (zcat works) and a single response can be read back by
+    seeking to its offset. A new segment starts once the current one exceeds
+    segment_max_bytes.
+    """
+
+    def __init__(self, base_dir: str = "api_responses", run_name: Optional[str] = None,
+                 segment_max_bytes: int = 64 * 1024 * 1024, compresslevel: int = 6):
+        """
+        Initialize the archive (directories and files are created on the first append)
+
+        Args:
+            base_dir: Directory holding all runs
+            run_name: Run directory name (defaults to run_<timestamp>)
+            segment_max_bytes: Compressed size after which a new segment is started
+            compresslevel: gzip compression level
+        """
+        self.base_dir = base_dir
+        self.run_name = run_name or f"{RUN_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        self.run_dir = os.path.join(base_dir, self.run_name)
+        self.segment_max_bytes = segment_max_bytes
+        self.compresslevel = compresslevel
+
+        self.records = 0
+        self.bytes_written = 0
+        self._segment_number = 0
+        self._segment_file = None
+        self._segment_name = None
+        self._index_file = None
+        self._lock = threading.Lock()
+
+    def reference(self, batch_id: int, response_type: str = "success") -> str:
+        """Stable reference to a batch's response, resolved by ResponseArchiveReader.read_reference"""
+        return f"{self.run_name}/batch_{batch_id:05d}_{response_type}"
+
+    def _open_segment(self) -> None:
+        if self._segment_file is not None:
+            self._segment_file.close()
+        self._segment_number += 1
+        self._segment_name = f"{SEGMENT_PREFIX}{self._segment_number:05d}{SEGMENT_SUFFIX}"
+        self._segment_file = open(os.path.join(self.run_dir, self._segment_name), 'ab')
+
+    def append(self, batch_id: int, record: Dict[str, Any], response_type: str = "success",
+               status_code: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Compress and append one response; returns its index entry
+
+        Args:
+            batch_id: Batch the response belongs to
+            record: JSON-serializable response record
+            response_type: "success" or "error"
+            status_code: HTTP status (stored in the index for filtering)
+        """
+        member = gzip.compress(json_codec.dumps_bytes(record) + b"\n",
+                               compresslevel=self.compresslevel)
+        with self._lock:
+            if self._index_file is None:
+                os.makedirs(self.run_dir, exist_ok=True)
+                self._index_file = open(os.path.join(self.run_dir, INDEX_FILENAME), 'a', encoding='utf-8')
+                self._open_segment()
+            elif self._segment_file.tell() >= self.segment_max_bytes:
+                self._open_segment()
+
+            offset = self._segment_file.tell()
+            self._segment_file.write(member)
+            self._segment_file.flush()
+
+            entry = {
+                'batch_id': batch_id,
+                'response_type': response_type,
+                'status_code': status_code,
+                'segment': self._segment_name,
+                'offset': offset,
+                'length': len(member),
+                'timestamp': datetime.now().isoformat()
+            }
+            self._index_file.write(json_codec.dumps(entry) + "\n")
+            self._index_file.flush()
+
+            self.records += 1
+            self.bytes_written += len(member)
+            return entry
+
+    def close(self) -> None:
+        """Close the current segment and the index"""
+        with self._lock:
+            if self._segment_file is not None:
+                self._segment_file.close()
+                self._segment_file = None
+            if self._index_file is not None:
+                self._index_file.close()
+                self._index_file = None
+
+
+class ResponsePersistencePolicy:
+    """
+    Decides which API responses are archived in full
+
+    Responses with a non-200 status, unparseable bodies or failed records are always
+    kept. Clean successes are kept in "all" mode, dropped in "failures" mode and kept
+    for a deterministic sample_rate share of batch ids in "sampled" mode (the same
+    batches are sampled on every run). Dropped responses still reach the GUI and the
+    logs as counts.
+    """
+
+    def __init__(self, mode: str = "all", sample_rate: float = 0.1):
+        """
+        Initialize the policy
+
+        Args:
+            mode: "all", "failures" or "sampled"
+            sample_rate: Share of clean successes kept in "sampled" mode (0.0 - 1.0)
+        """
+        if mode not in RESPONSE_POLICY_MODES:
+            raise ValueError(f"Unknown response persistence mode: {mode}")
+        self.mode = mode
+        self.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+        self.kept = 0
+        self.skipped = 0
+        self.skipped_bytes = 0
+        self._lock = threading.Lock()
+
+    def _sampled(self, batch_id: int) -> bool:
+        # Knuth multiplicative hash spreads consecutive batch ids evenly
+        return (batch_id * 2654435761) % 10000 < self.sample_rate * 10000
+
+    def should_keep(self, batch_id: int, status_code: Optional[int], failure_count: int = 0,
+                    parsed: bool = True, data_size: int = 0) -> bool:
+        """
+        Decide whether to archive a response and count the decision
+
+        Args:
+            batch_id: Batch the response belongs to
+            status_code: HTTP status
+            failure_count: Records the response reported as failed
+            parsed: False when the body was not valid JSON
+            data_size: Body size in bytes (counted as saved when dropped)
+        """
+        if status_code != 200 or failure_count or not parsed or self.mode == "all":
+            keep = True
+        elif self.mode == "sampled":
+            keep = self._sampled(batch_id)
+        else:
+            keep = False
+
+        with self._lock:
+            if keep:
+                self.kept += 1
+            else:
+                self.skipped += 1
+                self.skipped_bytes += data_size or 0
+        return keep
+
+    def describe(self) -> str:
+        """Short human readable description of the policy"""
+        if self.mode == "sampled":
+            return f"failures + {self.sample_rate:.0%} of clean successes"
+        return "all responses" if self.mode == "all" else "failures only"
+
+
+class ResponseArchiveReader:
+    """Read access to one archived run through its index"""
+
+    def __init__(self, run_dir: str):
+        self.run_dir = run_dir
+        self.run_name = os.path.basename(os.path.normpath(run_dir))
+        self.entries: List[Dict[str, Any]] = []
+        index_path = os.path.join(run_dir, INDEX_FILENAME)
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    self.entries.append(json_codec.loads(line))
+                except ValueError:
+                    # Partial line from a run that is still writing
+                    break
+
+    @staticmethod
+    def list_runs(base_dir: str = "api_responses") -> List[str]:
+        """Run directories under base_dir, oldest first"""
+        if not os.path.isdir(base_dir):
+            return []
+        runs = [os.path.join(base_dir, name) for name in os.listdir(base_dir)
+                if name.startswith(RUN_PREFIX) and os.path.isfile(os.path.join(base_dir, name, INDEX_FILENAME))]
+        return sorted(runs)
+
+    @classmethod
+    def latest(cls, base_dir: str = "api_responses") -> Optional["ResponseArchiveReader"]:
+        """Reader for the most recent run, or None if there is none"""
+        runs = cls.list_runs(base_dir)
+        return cls(runs[-1]) if runs else None
+
+    def read_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Decompress the single response an index entry points at"""
+        with open(os.path.join(self.run_dir, entry['segment']), 'rb') as f:
+            f.seek(entry['offset'])
+            member = f.read(entry['length'])
+        return json_codec.loads(gzip.decompress(member))
+
+    def find(self, batch_id: int, response_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Index entries for a batch (all attempts), optionally filtered by response type"""
+        return [e for e in self.entries
+                if e['batch_id'] == batch_id and (response_type is None or e['response_type'] == response_type)]
+
+    def get(self, batch_id: int, response_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Latest archived response for a batch"""
+        matches = self.find(batch_id, response_type)
+        return self.read_entry(matches[-1]) if matches else None
+
+    def read_reference(self, reference: str) -> Optional[Dict[str, Any]]:
+        """Resolve a reference produced by ResponseArchive.reference within this run"""
+        run_name, _, name = reference.partition('/')
+        if run_name != self.run_name or not name.startswith("batch_"):
+            return None
+        batch_part, _, response_type = name[len("batch_"):].partition('_')
+        return self.get(int(batch_part), response_type or None)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Stream every archived response in write order"""
+        for name in sorted(n for n in os.listdir(self.run_dir) if n.startswith(SEGMENT_PREFIX)):
+            with gzip.open(os.path.join(self.run_dir, name), 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json_codec.loads(line)
+                    except ValueError:
+                        break
@@ -3,13 +3,13 @@
 Split a large JSON file with customers into individual customer files (1 customer per JSON)
 """
 
-import json
+import json_codec
 import os
 import math
 import sys
 from datetime import datetime
 
-def split_json_file(input_file, batch_size=1, output_dir="split_customers"):
+def split_json_file(input_file, batch_size=1, output_dir="split_customers", pretty=False):
     """
     Split a large JSON file into individual customer/household files
 
@@ -17,6 +17,7 @@ def split_json_file(input_file, batch_size=1, output_dir="split_customers"):
         input_file (str): Path to the input JSON file
         batch_size (int): Number of customers/households per file (default: 1)
         output_dir (str): Directory to save files
+        pretty (bool): Indent the output files for reading (default: compact)
     """
     
     print(f"SPLITTING LARGE JSON FILE")
@@ -37,8 +38,8 @@ def split_json_file(input_file, batch_size=1, output_dir="split_customers"):
     try:
         # Load the JSON file
         print(f"Loading JSON file... (this may take a moment for large files)")
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(input_file, 'rb') as f:
+            data = json_codec.load(f)
         
         print(f"JSON loaded successfully")
         
@@ -120,8 +121,8 @@ def split_json_file(input_file, batch_size=1, output_dir="split_customers"):
             customer_filepath = os.path.join(full_output_dir, customer_filename)
 
             # Save customer file
-            with open(customer_filepath, 'w', encoding='utf-8') as f:
-                json.dump(customer_data, f, indent=2, ensure_ascii=False)
+            with open(customer_filepath, 'wb') as f:
+                json_codec.dump(customer_data, f, pretty=pretty)
 
             customer_files.append({
                 'filename': customer_filename,
@@ -150,8 +151,8 @@ def split_json_file(input_file, batch_size=1, output_dir="split_customers"):
             'files': customer_files
         }
 
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary_data, f, indent=2, ensure_ascii=False)
+        with open(summary_file, 'wb') as f:
+            json_codec.dump(summary_data, f, pretty=True)
 
         print(f"\nSPLITTING COMPLETED SUCCESSFULLY!")
         print(f"Summary:")
@@ -165,7 +166,7 @@ def split_json_file(input_file, batch_size=1, output_dir="split_customers"):
         
         return True
         
-    except json.JSONDecodeError as e:
+    except json_codec.JSONDecodeError as e:
         print(f"JSON parsing error: {e}")
         return False
     except MemoryError:
@@ -184,9 +185,13 @@ if __name__ == "__main__":
     print("JSON BATCH SPLITTER (100 items per batch)")
     print("=" * 50)
     
+    # --pretty writes indented files; compact is the default
+    PRETTY = '--pretty' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--pretty']
+
     # Check for command line arguments (drag and drop support)
-    if len(sys.argv) > 1:
-        INPUT_FILE = sys.argv[1]
+    if args:
+        INPUT_FILE = args[0]
         print(f"File dropped: {INPUT_FILE}")
     else:
         # Fallback to interactive mode
@@ -207,7 +212,7 @@ if __name__ == "__main__":
                 sys.exit(1)
     
     # Run the splitting
-    success = split_json_file(INPUT_FILE, BATCH_SIZE, OUTPUT_DIR)
+    success = split_json_file(INPUT_FILE, BATCH_SIZE, OUTPUT_DIR, pretty=PRETTY)
     
     if success:
         print(f"\nAll done! Your batch files are ready for import.")
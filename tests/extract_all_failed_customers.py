@@ -1,28 +1,38 @@
 #!/usr/bin/env python3
 """
 Extract ALL 68 failed customers from the actual response.log file
+(falls back to the latest run in the api_responses archive)
 """
 
 import json
 import re
 import os
+import sys
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from response_archive import ResponseArchiveReader
+
 def extract_all_failed_customers_from_response_log():
     """Extract all failed customers from the actual response.log file"""
     
     print("🔍 EXTRACTING ALL FAILED CUSTOMERS FROM RESPONSE.LOG")
     print("=" * 60)
     
-    if not os.path.exists("response.log"):
-        print("❌ response.log file not found!")
-        return
-    
-    print("📖 Reading response.log file...")
-    with open("response.log", 'r', encoding='utf-8') as f:
-        response_content = f.read()
-    
-    print(f"✅ Loaded response.log ({len(response_content)} characters)")
+    if os.path.exists("response.log"):
+        print("📖 Reading response.log file...")
+        with open("response.log", 'r', encoding='utf-8') as f:
+            response_content = f.read()
+        print(f"✅ Loaded response.log ({len(response_content)} characters)")
+    else:
+        reader = ResponseArchiveReader.latest("api_responses")
+        if reader is None:
+            print("❌ response.log file not found and no api_responses archive!")
+            return
+        print(f"📖 Reading archived responses from {reader.run_dir}...")
+        response_content = "\n".join(json.dumps(record.get('response_data'), ensure_ascii=False)
+                                     for record in reader.iter_records())
+        print(f"✅ Loaded {len(reader.entries)} archived responses ({len(response_content)} characters)")
     
     # Method 1: Extract using regex pattern for failed customers
     failed_pattern = r'"customerId":\s*"([^"]+)"[^}]*"username":\s*"([^"]+)"[^}]*"result":\s*"(?:FAILED|ERROR|CONFLICT)"'
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the background auth health monitor and the auto-pause it drives
+"""
+
+import sys
+import os
+import time
+import tempfile
+import shutil
+import threading
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth_health import AuthHealthMonitor, is_service_down_error
+from bulk_import_multithreaded import BulkCustomerImporter
+
+
+def test_monitor_states_and_schedule():
+    """Probe results and worker reports move the state; the thread probes on its own schedule"""
+    print("🧪 Testing auth health monitor")
+
+    assert is_service_down_error("Token refresh failed: HTTP 503 - Service Unavailable")
+    assert not is_service_down_error("Token refresh failed: HTTP 401 - invalid_grant")
+
+    results = [{'healthy': False, 'error': 'HTTP 401 - invalid_grant'}, {'healthy': True}]
+    changes = []
+    monitor = AuthHealthMonitor(probe=lambda: results.pop(0) if results else {'healthy': True},
+                                interval=0.05, recovery_interval=0.05,
+                                on_change=lambda old, new, message: changes.append((old, new)))
+
+    monitor.report_failure("Token refresh network error: Read timed out")
+    assert monitor.state == AuthHealthMonitor.DOWN
+    assert not monitor.wait_until_up(timeout=0.05), "Readers wait while the service is down"
+
+    released = []
+    waiter = threading.Thread(target=lambda: released.append(monitor.wait_until_up(timeout=2.0)))
+    waiter.start()
+    monitor.start()
+    deadline = time.monotonic() + 2.0
+    while monitor.state != AuthHealthMonitor.HEALTHY and time.monotonic() < deadline:
+        time.sleep(0.01)
+    waiter.join()
+    monitor.stop()
+
+    assert changes == [("healthy", "down"), ("down", "degraded"), ("degraded", "healthy")], changes
+    assert released == [True] and monitor.checks >= 2
+    print("✅ Monitor switches down -> degraded -> healthy on its own schedule")
+
+
+def test_reports_do_not_postpone_checks():
+    """A steady stream of worker reports brings the check forward but never keeps pushing it back"""
+    print("🧪 Testing auth health checks under constant failure reports")
+
+    monitor = AuthHealthMonitor(probe=lambda: {'healthy': True}, interval=60.0, recovery_interval=0.2)
+    monitor.start()
+    try:
+        deadline = time.monotonic() + 0.7
+        while time.monotonic() < deadline:
+            monitor.report_failure("Token refresh failed: HTTP 503 - Service Unavailable")
+            time.sleep(0.02)
+        assert monitor.checks >= 2, f"Checks postponed by reports ({monitor.checks} ran)"
+    finally:
+        monitor.stop()
+    print(f"✅ {monitor.checks} checks ran while workers kept reporting failures")
+
+
+def test_monitor_drives_auto_pause_and_resume():
+    """Workers never probe inline; a reported outage pauses the import and recovery resumes it"""
+    print("🧪 Testing auth auto-pause and auto-resume")
+
+    test_dir = tempfile.mkdtemp(prefix="test_auth_health_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        events = []
+        importer = BulkCustomerImporter(
+            api_url="http://127.0.0.1:9/unused",
+            auth_url="http://127.0.0.1:9/token",
+            username="importer",
+            password="secret",
+            use_auto_auth=True,
+            batch_size=10,
+            max_workers=1,
+            delay_between_requests=0,
+            prewarm_connections=False,
+            write_behind=False,
+            progress_callback=events.append
+        )
+        probes = []
+        auth_up = {'value': False}
+
+        def fake_test_authentication():
+            probes.append(time.monotonic())
+            if auth_up['value']:
+                return {'success': True}
+            return {'success': False, 'error': 'Token refresh failed: HTTP 503 - Service Unavailable'}
+
+        def fake_headers():
+            if not auth_up['value']:
+                raise Exception("Token refresh failed: HTTP 503 - Service Unavailable")
+            return {'Authorization': 'Bearer ok', 'Content-Type': 'application/json'}
+
+        class FakeResponse:
+            status_code = 200
+            headers = {}
+            content = b'{"data": []}'
+
+        importer.auth_manager.test_authentication = fake_test_authentication
+        importer.auth_manager.get_auth_headers = fake_headers
+        importer._post_batch = lambda headers, body: FakeResponse()
+        batch = [{"person": {"customerId": "C1"}}]
+
+        result = importer.send_batch(batch, 1)
+        assert result['error_type'] == 'auth_service_down'
+        assert importer.is_paused and importer.auth_service_down
+        assert importer.get_import_status()['auth_state'] == "down"
+        assert probes == [], "Workers must not run health checks"
+
+        auth_up['value'] = True
+        importer.auth_monitor.check()
+        assert not importer.is_paused and not importer.auth_service_down
+        assert importer.send_batch(batch, 2)['status'] == 'success'
+        assert len(probes) == 1
+        assert [(e['previous_state'], e['auth_state']) for e in events if e['type'] == 'auth_health'] == \
+            [("healthy", "down"), ("down", "healthy")]
+
+        # A user pause is not undone by a recovery
+        importer.auth_monitor.report_failure("HTTP 502 - Bad Gateway")
+        importer.resume_import()
+        importer.pause_import()
+        importer.auth_monitor.check()
+        assert importer.is_paused, "Only auto-pauses are auto-resumed"
+        print("✅ Outage auto-paused the import and recovery resumed it without inline checks")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_monitor_states_and_schedule()
+    test_reports_do_not_postpone_checks()
+    test_monitor_drives_auto_pause_and_resume()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the batch identity index used to match API failures to batch records
+"""
+
+import sys
+import os
+import json
+import tempfile
+import shutil
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_identity import BatchIdentityIndex
+from bulk_import_multithreaded import BulkCustomerImporter
+
+
+def _customer(customer_id, first, last, personal_number, cards=()):
+    return {
+        "person": {
+            "customerId": customer_id,
+            "firstName": first,
+            "lastName": last,
+            "personalNumber": personal_number,
+            "customerCards": [{"number": card} if i % 2 == 0 else {"cardNumber": card} for i, card in enumerate(cards)]
+        }
+    }
+
+
+def test_index_resolves_every_key():
+    """customerId, any card number, personal number and name all resolve to the right record"""
+    print("🧪 Testing batch identity index keys")
+
+    batch = [
+        _customer("C001", "ANNA", "ANDERSSON", "19900115-1234", cards=["2000001", "2000002"]),
+        _customer("C002", "ERIK", "ERIKSSON", "198505203456", cards=["2000003"]),
+        _customer("C003", "LISA", "LARSSON", "7012245678"),
+    ]
+    index = BatchIdentityIndex(batch)
+
+    assert index.match("C002") == (batch[1], 'customerId')
+    assert index.match("2000002") == (batch[0], 'cardNumber'), "Second card must be indexed too"
+    assert index.match(2000003) == (batch[1], 'cardNumber')
+    assert index.match("UNKNOWN", "ANNA ANDERSSON-199001151234") == (batch[0], 'personalNumber')
+    assert index.match(None, "LISA LARSSON-197012245678") == (batch[2], 'personalNumber')
+    assert index.match(None, "Erik Eriksson-000", use_name=True) == (batch[1], 'name')
+    assert index.match(None, "Erik Eriksson-000") == (None, None)
+
+    households = [{"householdId": "H1"}, {"householdId": 2}]
+    household_index = BatchIdentityIndex(households, "households")
+    assert household_index.match("2") == (households[1], 'householdId')
+    assert household_index.match(None, "H1") == (None, None)
+    print("✅ All identity keys resolve")
+
+
+def test_parser_records_match_key():
+    """Failures parsed from an API response carry the key that matched them"""
+    print("🧪 Testing matchedBy in parsed failures")
+
+    test_dir = tempfile.mkdtemp(prefix="test_identity_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        importer = BulkCustomerImporter(api_url="http://127.0.0.1:9/unused", auth_token="test", delay_between_requests=0)
+        batch = [_customer(f"C{i:03d}", "A", f"B{i}", f"19900101{i:04d}", cards=[f"9{i:06d}"]) for i in range(50)]
+        response = {"data": [
+            {"customerId": "C007", "username": "A B7-199001010007", "result": "CONFLICT"},
+            {"customerId": "9000011", "username": "x", "result": "FAILED"},
+            {"customerId": "C999", "username": "A B20-199001010020", "result": "ERROR"},
+            {"customerId": "C001", "username": "A B1", "result": "SUCCESS"},
+        ]}
+
+        failures = importer._parse_api_response_for_failures(json.dumps(response), batch)
+        matched = {f['customerId']: (f['originalData'], f['matchedBy']) for f in failures}
+        assert len(failures) == 3, f"Expected 3 failures, got {len(failures)}"
+        assert matched["C007"] == (batch[7], 'customerId')
+        assert matched["9000011"] == (batch[11], 'cardNumber')
+        assert matched["C999"] == (batch[20], 'personalNumber')
+        print("✅ Parsed failures record matchedBy")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_index_resolves_every_key()
+    test_parser_records_match_key()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the batch prefetch pipeline and pre-encoded request bodies
+"""
+
+import sys
+import os
+import json
+import time
+import gzip
+import tempfile
+import shutil
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_pipeline import BatchPrefetcher
+from bulk_import_multithreaded import BulkCustomerImporter
+
+
+def test_prefetcher_bounds_and_numbering():
+    """Batches are numbered in plan order, skipped ones stay unprepared, read-ahead is bounded"""
+    print("🧪 Testing batch prefetcher")
+
+    prepared_items = []
+
+    def prepare(item):
+        prepared_items.append(item)
+        return f"body-{item}"
+
+    prefetcher = BatchPrefetcher(iter(range(10, 30)), prepare, depth=3, skip=lambda batch_id: batch_id == 2)
+    time.sleep(0.2)
+    # depth queued plus the one the producer is blocked on
+    assert len(prepared_items) <= 4, f"Read ahead too far: {len(prepared_items)}"
+
+    first = [next(prefetcher) for _ in range(3)]
+    assert first == [(1, 10, "body-10"), (2, 11, None), (3, 12, "body-12")]
+
+    prefetcher.stop_preparing()
+    rest = list(prefetcher)
+    assert [batch_id for batch_id, _, _ in rest] == list(range(4, 21))
+    assert rest[-1][2] is None, "Batches after stop_preparing() are passed through"
+    assert list(prefetcher) == []
+    prefetcher.close()
+
+    def failing_source():
+        yield 1
+        raise ValueError("planning failed")
+
+    prefetcher = BatchPrefetcher(failing_source(), prepare, depth=2)
+    assert next(prefetcher)[0] == 1
+    try:
+        next(prefetcher)
+        assert False, "Planning errors should reach the consumer"
+    except ValueError:
+        pass
+    prefetcher.close()
+    print("✅ Prefetcher numbers, skips, bounds and propagates errors")
+
+
+def test_prepared_body_reuses_source_bytes():
+    """The request body wraps the source bytes and is sent unchanged on every attempt"""
+    print("🧪 Testing pre-encoded request bodies")
+
+    test_dir = tempfile.mkdtemp(prefix="test_batch_pipeline_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        source = os.path.join(test_dir, "customers.json")
+        records = [{"person": {"customerId": f"C{i}", "lastName": "Åström"}} for i in range(25)]
+        with open(source, 'w', encoding='utf-8') as f:
+            json.dump({"data": records}, f, ensure_ascii=False)
+
+        importer = BulkCustomerImporter(
+            api_url="http://127.0.0.1:9/unused",
+            auth_token="test",
+            batch_size=10,
+            max_workers=2,
+            max_retries=3,
+            delay_between_requests=0,
+            prewarm_connections=False,
+            retry_base_delay=0.01
+        )
+        prepared = importer.prepare_lazy_batch({'file_path': source, 'start_idx': 10, 'end_idx': 20})
+        assert prepared['records'] == records[10:20]
+        assert json.loads(prepared['body']) == {"data": records[10:20]}
+
+        bodies = []
+
+        class FakeResponse:
+            status_code = 503
+            content = b'{"error": "busy"}'
+            headers = {}
+
+        def fake_post(headers, body):
+            bodies.append(body)
+            return FakeResponse()
+
+        importer._post_batch = fake_post
+        result = importer.send_batch(prepared['records'], 1, body=prepared['body'])
+        assert result['status'] == 'failed'
+        assert len(bodies) == 3 and all(body is prepared['body'] for body in bodies)
+        print("✅ Body built once from source bytes and reused by retries")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_gzip_bodies_and_415_fallback():
+    """Compressed bodies are built once; a 415 switches the run to uncompressed bodies"""
+    print("🧪 Testing gzip request bodies")
+
+    test_dir = tempfile.mkdtemp(prefix="test_batch_pipeline_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        source = os.path.join(test_dir, "customers.json")
+        records = [{"person": {"customerId": f"C{i}", "address": {"city": "Stockholm"}}} for i in range(30)]
+        with open(source, 'w', encoding='utf-8') as f:
+            json.dump({"data": records}, f)
+
+        importer = BulkCustomerImporter(
+            api_url="http://127.0.0.1:9/unused",
+            auth_token="test",
+            batch_size=10,
+            max_workers=2,
+            max_retries=1,
+            delay_between_requests=0,
+            prewarm_connections=False,
+            compress_requests=True,
+            compression_level=9
+        )
+        prepared = importer.prepare_lazy_batch({'file_path': source, 'start_idx': 0, 'end_idx': 30})
+        assert gzip.decompress(prepared['gzip_body']) == prepared['body']
+        assert len(prepared['gzip_body']) < len(prepared['body'])
+
+        posts = []
+
+        class FakeResponse:
+            def __init__(self, status_code):
+                self.status_code = status_code
+                self.content = b'{"data": []}'
+                self.headers = {}
+
+        def fake_post(headers, body):
+            compressed = headers.get('Content-Encoding') == 'gzip'
+            posts.append(compressed)
+            return FakeResponse(415 if compressed and len(posts) > 1 else 200)
+
+        importer._post_batch = fake_post
+        assert importer.send_batch(prepared['records'], 1, prepared['body'], prepared['gzip_body'])['status'] == 'success'
+        assert importer.send_batch(prepared['records'], 2, prepared['body'], prepared['gzip_body'])['status'] == 'success'
+        assert importer.send_batch(prepared['records'], 3, prepared['body'], prepared['gzip_body'])['status'] == 'success'
+        # gzip accepted, gzip rejected then resent plain, plain from then on
+        assert posts == [True, True, False, False]
+        assert importer.compress_requests is False
+        assert 'gzip_body' not in importer.prepare_lazy_batch({'file_path': source, 'start_idx': 0, 'end_idx': 10})
+
+        stats = importer.compression_stats
+        # The rejected gzip attempt counts as sent bytes that delivered nothing
+        assert stats['requests'] == 4 and stats['gzip_requests'] == 2
+        assert stats['raw_bytes'] == 3 * len(prepared['body'])
+        assert stats['sent_bytes'] == 2 * len(prepared['gzip_body']) + 2 * len(prepared['body'])
+        print("✅ gzip bodies sent until the server answered 415, then plain")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_prefetcher_bounds_and_numbering()
+    test_prepared_body_reuses_source_bytes()
+    test_gzip_bodies_and_415_fallback()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script to verify request deadlines and the stuck batch watchdog
+"""
+
+import sys
+import os
+import time
+import socket
+import tempfile
+import shutil
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_watchdog import BatchWatchdog
+from bulk_import_multithreaded import BulkCustomerImporter
+
+
+def test_watchdog_threshold_and_flags():
+    """The threshold follows the p99 of recent attempts and each stuck attempt is flagged once"""
+    print("🧪 Testing watchdog threshold")
+
+    flagged = []
+    watchdog = BatchWatchdog(min_threshold=0.01, multiplier=3.0, min_samples=5, initial_threshold=10.0,
+                             on_stuck=lambda *stuck: flagged.append(stuck))
+    assert watchdog.threshold() == 10.0, "Initial threshold until enough samples"
+    for batch_id in range(5):
+        watchdog.begin(batch_id, 0)
+        time.sleep(0.01)
+        assert watchdog.end(batch_id) is False
+    assert 0.03 <= watchdog.threshold() < 0.2, watchdog.threshold()
+
+    watchdog.begin(7, 0)
+    time.sleep(watchdog.threshold() + 0.05)
+    watchdog.begin(8, 0)
+    assert [stuck[0] for stuck in watchdog.check()] == [7]
+    assert watchdog.check() == [], "An attempt is flagged only once"
+    snapshot = watchdog.snapshot()
+    assert snapshot['stuck_in_flight'] == 1 and snapshot['in_flight'] == 2
+    assert watchdog.end(7) is True
+    assert watchdog.stuck_count(7) == 1 and len(flagged) == 1
+    print("✅ Threshold tracks the p99 and flags stuck attempts once")
+
+
+def test_read_timeout_and_quarantine():
+    """A silent server times out instead of pinning the worker; repeatedly stuck batches are quarantined"""
+    print("🧪 Testing read deadline and quarantine")
+
+    test_dir = tempfile.mkdtemp(prefix="test_watchdog_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    # Accepts connections (backlog) but never answers
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen(8)
+    try:
+        events = []
+        importer = BulkCustomerImporter(
+            api_url=f"http://127.0.0.1:{silent.getsockname()[1]}/import",
+            auth_token="test",
+            batch_size=10,
+            max_workers=1,
+            max_retries=3,
+            delay_between_requests=0,
+            prewarm_connections=False,
+            write_behind=False,
+            retry_base_delay=0.01,
+            connect_timeout=1.0,
+            read_timeout=0.3,
+            quarantine_after_stuck=2,
+            progress_callback=events.append
+        )
+        importer.watchdog = BatchWatchdog(min_threshold=0.05, initial_threshold=0.05, check_interval=0.02,
+                                          on_stuck=importer._on_batch_stuck)
+        importer.watchdog.start()
+        batch = [{"person": {"customerId": f"C{i}"}} for i in range(10)]
+
+        started = time.monotonic()
+        result = importer.send_batch(batch, 1)
+        elapsed = time.monotonic() - started
+        importer.watchdog.stop()
+
+        assert result['status'] == 'failed' and result['error_type'] == 'quarantined', result
+        assert elapsed < 2.0, f"Deadline not applied ({elapsed:.1f}s)"
+        assert [event['attempt'] for event in events if event['type'] == 'batch_stuck'] == [1, 2]
+        assert importer.quarantined_batches == 1
+
+        quarantine_dirs = [d for d in os.listdir(importer.failed_items_dir) if d.startswith("quarantine_")]
+        assert len(quarantine_dirs) == 1
+        assert os.listdir(os.path.join(importer.failed_items_dir, quarantine_dirs[0])) == ["batch_00001_stuck.json"]
+        print("✅ Silent server timed out and the batch was quarantined after 2 stuck attempts")
+    finally:
+        silent.close()
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_watchdog_threshold_and_flags()
+    test_read_timeout_and_quarantine()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
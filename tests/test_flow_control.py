@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the flow control primitives used by the import engine
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flow_control import TokenBucketRateLimiter, AdaptiveConcurrencyController, RetryPolicy, CircuitBreaker, RATE_PRESETS
+
+
+def test_token_bucket_reservations():
+    """Reservations beyond the burst wait for their own share of the deficit"""
+    print("🧪 Testing token bucket reservations")
+
+    limiter = TokenBucketRateLimiter(requests_per_second=10, burst=2)
+    waits = [limiter.reserve() for _ in range(5)]
+    assert waits[0] == 0 and waits[1] == 0, f"Burst should be free: {waits}"
+    assert 0.09 <= waits[2] <= 0.11 and 0.19 <= waits[3] <= 0.21 and 0.29 <= waits[4] <= 0.31, waits
+
+    # Records bucket: 100 records/s with one second of capacity
+    limiter = TokenBucketRateLimiter(requests_per_second=None, records_per_second=100)
+    assert limiter.reserve(records=100) == 0
+    assert 0.49 <= limiter.reserve(records=50) <= 0.51
+    print("✅ Reservations are paced correctly")
+
+
+def test_waiting_threads_do_not_serialize():
+    """Concurrent waiters sleep in parallel, so total time is set by the rate, not by the thread count"""
+    print("🧪 Testing concurrent acquire")
+
+    limiter = TokenBucketRateLimiter(requests_per_second=20, burst=1)
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(8)]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+
+    # 1 free + 7 paced at 50ms each
+    assert 0.3 <= elapsed < 0.6, f"Unexpected elapsed time {elapsed:.3f}s"
+    print(f"✅ 8 threads finished in {elapsed:.3f}s")
+
+
+def test_presets_build_limiters():
+    """Every GUI preset maps to a working limiter"""
+    for name in RATE_PRESETS:
+        limiter = TokenBucketRateLimiter.from_preset(name)
+        assert limiter.requests_per_second == RATE_PRESETS[name]['requests_per_second']
+        assert limiter.burst == RATE_PRESETS[name]['burst']
+
+
+def _run_window(controller, latency_seconds, status_code=200):
+    for _ in range(controller.window_size):
+        assert controller.acquire(timeout=1)
+        controller.release(latency_seconds, status_code)
+
+
+def test_adaptive_concurrency_aimd():
+    """Healthy windows add one slot; throttling and latency spikes cut the limit in half"""
+    print("🧪 Testing adaptive concurrency (AIMD)")
+
+    changes = []
+    assert AdaptiveConcurrencyController(min_limit=2, max_limit=6).limit == 3, "Slow start at half of max_limit"
+    assert AdaptiveConcurrencyController(min_limit=1, max_limit=1).limit == 1
+    controller = AdaptiveConcurrencyController(min_limit=2, max_limit=6, initial_limit=2, window_size=10,
+                                               on_change=lambda old, new, reason: changes.append((old, new)))
+    assert controller.limit == 2
+
+    for _ in range(6):
+        _run_window(controller, 0.1)
+    assert controller.limit == 6, "Limit should grow additively up to max_limit"
+
+    # 429 cuts multiplicatively, but only once per round of in-flight requests
+    for _ in range(3):
+        controller.acquire(timeout=1)
+    for _ in range(3):
+        controller.release(0.1, 429)
+    assert controller.limit == 3
+
+    # p95 far above the healthy baseline counts as congestion
+    _run_window(controller, 1.0)
+    assert controller.limit == 2, "Latency spike should cut the limit, bounded by min_limit"
+    assert (6, 3) in changes
+
+    # Slots are enforced
+    assert controller.acquire(timeout=0.1) and controller.acquire(timeout=0.1)
+    assert not controller.acquire(timeout=0.1)
+    print("✅ AIMD adjustments stay within bounds")
+
+
+def test_adaptive_concurrency_latency_target():
+    """An explicit latency target overrides the learned baseline"""
+    controller = AdaptiveConcurrencyController(min_limit=1, max_limit=4, initial_limit=4,
+                                               latency_target_ms=200, window_size=5)
+    _run_window(controller, 0.3)
+    assert controller.limit == 2
+    _run_window(controller, 0.15)
+    assert controller.limit == 3
+    assert controller.snapshot()['in_flight'] == 0
+
+
+def test_retry_policy():
+    """Statuses are classified, Retry-After wins, jitter stays in bounds and the budget caps retries"""
+    print("🧪 Testing retry policy")
+
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, budget_ratio=0.1, min_retries=2)
+    assert policy.classify(None) == RetryPolicy.RETRYABLE
+    assert policy.classify(503) == policy.classify(500) == policy.classify(408) == RetryPolicy.RETRYABLE
+    assert policy.classify(429) == RetryPolicy.THROTTLED
+    assert policy.classify(400) == policy.classify(409) == policy.classify(501) == RetryPolicy.NON_RETRYABLE
+
+    assert RetryPolicy.parse_retry_after("7") == 7.0
+    assert RetryPolicy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert RetryPolicy.parse_retry_after("soon") is None and RetryPolicy.parse_retry_after(None) is None
+
+    delays = [policy.next_delay(4.0) for _ in range(200)]
+    assert all(1.0 <= d <= 10.0 for d in delays) and len(set(delays)) > 100, "Delays should be jittered"
+    assert all(7.0 <= policy.next_delay(2.0, retry_after=7.0) <= 8.0 for _ in range(20))
+    assert policy.next_delay(None, retry_after=300) <= 11.0, "Retry-After is capped at max_delay"
+
+    # Floor of 2 retries, then 10% of traffic
+    assert policy.try_acquire_retry() and policy.try_acquire_retry()
+    assert not policy.try_acquire_retry()
+    for _ in range(30):
+        policy.record_request()
+    assert policy.try_acquire_retry() and not policy.try_acquire_retry()
+    snapshot = policy.snapshot()
+    assert snapshot['retries'] == 3 and snapshot['retries_denied'] == 2 and snapshot['window_requests'] == 30
+    print("✅ Retry policy classifies, jitters and budgets retries")
+
+
+def test_circuit_breaker():
+    """The circuit opens on sustained failures, probes once when half-open and closes on recovery"""
+    print("🧪 Testing circuit breaker")
+
+    changes = []
+    breaker = CircuitBreaker(failure_rate=0.5, min_requests=4, window_size=4, open_seconds=0.2,
+                             on_change=lambda old, new, reason: changes.append((old, new)))
+    for status in (200, 503, 400, None):
+        ticket = breaker.acquire(timeout=0)
+        assert ticket
+        breaker.record(status, ticket)
+    assert breaker.state == CircuitBreaker.OPEN, "2 of 4 failures should open the circuit"
+    assert not breaker.acquire(timeout=0.05), "Open circuit holds requests"
+
+    # One probe after open_seconds; a second caller waits for its outcome
+    probe = breaker.acquire(timeout=1.0)
+    assert probe and probe.probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.acquire(timeout=0.05)
+    breaker.record(502, probe)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    probe = breaker.acquire(timeout=1.0)
+    assert probe
+    released = []
+    waiter = threading.Thread(target=lambda: released.append(breaker.acquire(timeout=2.0)))
+    waiter.start()
+    time.sleep(0.05)
+    breaker.record(200, probe)
+    waiter.join()
+    assert released and released[0] and not released[0].probe, "Waiting callers are released when the circuit closes"
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.opened_count == 2
+    assert changes == [("closed", "open"), ("open", "half_open"), ("half_open", "open"),
+                       ("open", "half_open"), ("half_open", "closed")]
+    assert breaker.snapshot()['recent_requests'] == 0
+    print("✅ Circuit opens, probes and closes")
+
+
+
+def test_circuit_breaker_ignores_stale_outcomes():
+    """Requests admitted before the circuit opened cannot decide the half-open probe"""
+    print("🧪 Testing circuit breaker with stale outcomes")
+
+    breaker = CircuitBreaker(failure_rate=0.5, min_requests=2, window_size=2, open_seconds=0.1)
+    slow = breaker.acquire(timeout=0)
+    for status in (503, 503):
+        breaker.record(status, breaker.acquire(timeout=0))
+    assert breaker.state == CircuitBreaker.OPEN
+
+    probe = breaker.acquire(timeout=1.0)
+    assert probe and probe.probe and breaker.state == CircuitBreaker.HALF_OPEN
+
+    # The slow request from before the trip fails late: the probe still decides
+    breaker.record(503, slow)
+    assert breaker.state == CircuitBreaker.HALF_OPEN and breaker.opened_count == 1
+    assert not breaker.acquire(timeout=0.05), "The probe is still in flight"
+
+    breaker.record(200, probe)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    # Late outcomes from the half-open generation do not count against the closed window
+    breaker.record(503, probe)
+    breaker.record(503, slow)
+    assert breaker.snapshot()['recent_requests'] == 0
+    print("✅ Only the probe's outcome decides the half-open circuit")
+
+if __name__ == "__main__":
+    test_token_bucket_reservations()
+    test_waiting_threads_do_not_serialize()
+    test_presets_build_limiters()
+    test_adaptive_concurrency_aimd()
+    test_adaptive_concurrency_latency_target()
+    test_retry_policy()
+    test_circuit_breaker()
+    test_circuit_breaker_ignores_stale_outcomes()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the durable progress ledger used for crash-safe resume
+"""
+
+import sys
+import os
+import json
+import tempfile
+import shutil
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from import_journal import ProgressLedger, FailedCustomerJournal
+from bulk_import_multithreaded import BulkCustomerImporter
+
+
+def _source(directory, name="customers.json", count=10):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"data": [{"id": i} for i in range(count)]}, f)
+    return path
+
+
+def test_ledger_restores_finished_batches():
+    """A reopened ledger skips finished batches and keeps planned counts, even after a torn write"""
+    print("🧪 Testing progress ledger resume")
+
+    test_dir = tempfile.mkdtemp(prefix="test_ledger_")
+    try:
+        source = _source(test_dir)
+        ledger_dir = os.path.join(test_dir, "ledgers")
+
+        ledger = ProgressLedger.for_plan(ledger_dir, [source], 5, "data", "http://api")
+        assert ledger.open() == 0
+        ledger.record_plan(source, 10)
+        for batch_id in (1, 2, 9, 2):
+            ledger.mark_finished(batch_id, "success")
+        ledger.close()
+
+        # Simulate a process killed mid-write
+        with open(ledger.path, 'a', encoding='utf-8') as f:
+            f.write('{"event": "done", "bat')
+
+        resumed = ProgressLedger.for_plan(ledger_dir, [source], 5, "data", "http://api")
+        assert resumed.path == ledger.path
+        assert resumed.open() == 3
+        assert resumed.is_finished(1) and resumed.is_finished(9)
+        assert not resumed.is_finished(3) and not resumed.is_finished(1000)
+        assert resumed.planned_counts == {source: 10}
+
+        # A completed plan is archived so the next run starts fresh
+        resumed.close(completed=True)
+        assert not os.path.exists(ledger.path) and os.path.exists(resumed.path)
+        fresh = ProgressLedger.for_plan(ledger_dir, [source], 5, "data", "http://api")
+        assert fresh.open() == 0
+        fresh.close()
+        print("✅ Ledger restores progress and archives completed plans")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_ledger_is_bound_to_plan():
+    """Changing the source file or batch size selects a different ledger"""
+    print("🧪 Testing ledger plan fingerprint")
+
+    test_dir = tempfile.mkdtemp(prefix="test_ledger_")
+    try:
+        source = _source(test_dir)
+        first = ProgressLedger.plan_fingerprint([source], 5, "data", "http://api")
+        assert first == ProgressLedger.plan_fingerprint([source], 5, "data", "http://api")
+        assert first != ProgressLedger.plan_fingerprint([source], 7, "data", "http://api")
+
+        _source(test_dir, count=11)
+        assert first != ProgressLedger.plan_fingerprint([source], 5, "data", "http://api")
+
+        # Opening with resume disabled discards earlier progress
+        ledger = ProgressLedger.for_plan(test_dir, [source], 5, "data", "http://api")
+        ledger.open()
+        ledger.mark_finished(4, "failed")
+        ledger.close()
+        again = ProgressLedger.for_plan(test_dir, [source], 5, "data", "http://api")
+        assert again.open(resume=False) == 0 and not again.is_finished(4)
+        again.close()
+        print("✅ Ledger fingerprint tracks the plan")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_failed_customer_journal_materializes_json():
+    """Journal entries consolidate into the same JSON the old full rewrite produced"""
+    print("🧪 Testing failed customer journal")
+
+    test_dir = tempfile.mkdtemp(prefix="test_journal_")
+    try:
+        json_path = os.path.join(test_dir, "failed_customers", "failed_customers.json")
+        journal = FailedCustomerJournal(json_path)
+        journal.materialize()
+        with open(json_path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == []
+
+        first = [{"customerId": "C1", "result": "CONFLICT", "originalData": {"person": {"firstName": "ÅSA"}}}]
+        second = [{"customerId": "C2", "result": "FAILED", "error": None}, {"customerId": "C3", "tags": []}]
+        journal.append(first)
+        journal.append(second)
+        assert FailedCustomerJournal.read_entries(journal.path) == first + second
+
+        journal.materialize()
+        with open(json_path, 'r', encoding='utf-8') as f:
+            assert f.read() == json.dumps(first + second, indent=2, ensure_ascii=False)
+
+        # Appending after close keeps earlier entries
+        journal.close()
+        journal.append([{"customerId": "C4"}])
+        journal.close()
+        assert len(FailedCustomerJournal.read_entries(journal.path)) == 4
+        print("✅ Journal appends and materializes correctly")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_failed_batch_survives_crash_before_retry_files():
+    """A crash between dispatch and save_failed_batches must not let a resume skip the failed batch"""
+    print("🧪 Testing ledger with a crash before retry files are written")
+
+    test_dir = tempfile.mkdtemp(prefix="test_journal_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        path = os.path.join(test_dir, "customers.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"data": [{"person": {"customerId": f"C{i}"}} for i in range(30)]}, f)
+
+        def make_importer():
+            importer = BulkCustomerImporter(api_url="http://127.0.0.1:9/unused", auth_token="test",
+                                            batch_size=10, max_workers=1, delay_between_requests=0,
+                                            prewarm_connections=False, deferred_retry_passes=0)
+            sent = []
+
+            def fake_send(lazy_batch, batch_id, prepared=None):
+                sent.append(batch_id)
+                if batch_id == 2:
+                    importer.failed_batches.append({'batch_id': batch_id, 'customers': importer.load_lazy_batch(lazy_batch),
+                                                    'error': "HTTP 400"})
+                    return {'batch_id': batch_id, 'status': 'failed', 'customers_count': lazy_batch['expected_size']}
+                return {'batch_id': batch_id, 'status': 'success', 'customers_count': lazy_batch['expected_size']}
+
+            importer.send_lazy_batch = fake_send
+            return importer, sent
+
+        # Crash after every batch reached its final status but before the retry files exist
+        crashed, _ = make_importer()
+
+        def crash():
+            raise KeyboardInterrupt("simulated crash")
+
+        crashed.save_failed_batches = crash
+        try:
+            crashed.import_customers([path])
+            assert False, "The simulated crash should propagate"
+        except KeyboardInterrupt:
+            pass
+        assert not [d for d in os.listdir(test_dir) if d.startswith("retry_batches_")]
+
+        # The resume skips the successful batches and sends the failed one again
+        resumed, sent = make_importer()
+        resumed.save_failed_batches = crash
+        try:
+            resumed.import_customers([path])
+        except KeyboardInterrupt:
+            pass
+        assert sent == [2], f"Resume must re-dispatch only the failed batch, sent {sent}"
+
+        # Once the retry file is written the batch is recorded as finished with a pointer to it
+        finished, sent = make_importer()
+        summary = finished.import_customers([path])
+        assert sent == [2] and summary['failed_batches'] == 1
+        ledgers = [os.path.join(finished.ledger_dir, name) for name in os.listdir(finished.ledger_dir)]
+        entries = [json.loads(line) for ledger in ledgers for line in open(ledger, encoding='utf-8')]
+        failed = [entry for entry in entries if entry.get('event') == 'done' and entry['batch'] == 2]
+        assert failed and failed[-1]['status'] == 'failed' and os.path.exists(failed[-1]['retry_file'])
+        print("✅ Failed batch re-dispatched after a crash and recorded once its retry file exists")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_empty_plan_releases_resources():
+    """An import with no records returns early without leaving sessions or files open"""
+    print("🧪 Testing cleanup on an empty plan")
+
+    test_dir = tempfile.mkdtemp(prefix="test_journal_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        path = os.path.join(test_dir, "empty.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"data": []}, f)
+        importer = BulkCustomerImporter(api_url="http://127.0.0.1:9/unused", auth_token="test",
+                                        delay_between_requests=0, prewarm_connections=True)
+        importer.failed_customers_journal.append([{"customerId": "C0"}])
+
+        assert importer.import_customers([path])['status'] == 'error'
+        assert importer.http_sessions == {}, "Pooled sessions must be closed"
+        assert importer.failed_customers_journal._file is None, "Journal handle must be closed"
+        assert importer.ledger._file is None
+        print("✅ Empty plan closed sessions, journal and ledger")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_failed_customers_cursor():
+    """Incremental readers get only the failures recorded since their cursor"""
+    print("🧪 Testing failed customers cursor")
+
+    test_dir = tempfile.mkdtemp(prefix="test_journal_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        importer = BulkCustomerImporter(api_url="http://127.0.0.1:9/unused", auth_token="test",
+                                        prewarm_connections=False, write_behind=False)
+        assert importer.get_failed_customers_since(0) == ([], 0)
+
+        importer._save_failed_customers([{"customerId": "C1"}, {"customerId": "C2"}])
+        entries, cursor = importer.get_failed_customers_since(0)
+        assert [e["customerId"] for e in entries] == ["C1", "C2"] and cursor == 2
+
+        importer._save_failed_customers([{"customerId": "C3"}])
+        entries, cursor = importer.get_failed_customers_since(cursor)
+        assert [e["customerId"] for e in entries] == ["C3"] and cursor == 3
+        assert importer.get_failed_customers_since(cursor) == ([], 3)
+
+        # After a clear a stale cursor starts over
+        importer.clear_failed_customers()
+        importer._save_failed_customers([{"customerId": "C4"}])
+        entries, cursor = importer.get_failed_customers_since(3)
+        assert [e["customerId"] for e in entries] == ["C4"] and cursor == 1
+        print("✅ Cursor returns only new failures")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_ledger_restores_finished_batches()
+    test_ledger_is_bound_to_plan()
+    test_failed_customer_journal_materializes_json()
+    test_failed_batch_survives_crash_before_retry_files()
+    test_empty_plan_releases_resources()
+    test_failed_customers_cursor()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
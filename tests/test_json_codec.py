@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the pluggable JSON codec on every installed backend
+"""
+
+import sys
+import os
+import io
+import json
+import importlib
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec
+
+SAMPLE = {"data": [{"person": {"customerId": "C1", "lastName": "Åström", "cards": [1, 2]}, "id": 7}]}
+
+
+def _backends():
+    """Load the codec once per installed backend"""
+    previous = os.environ.get(json_codec.BACKEND_ENV)
+    loaded = {}
+    try:
+        for name in ("orjson", "ujson", "json"):
+            os.environ[json_codec.BACKEND_ENV] = name
+            codec = importlib.reload(json_codec)
+            if codec.backend == name:
+                loaded[name] = (codec.dumps, codec.dumps_bytes, codec.dump, codec.loads, codec.load)
+    finally:
+        if previous is None:
+            os.environ.pop(json_codec.BACKEND_ENV, None)
+        else:
+            os.environ[json_codec.BACKEND_ENV] = previous
+        importlib.reload(json_codec)
+    return loaded
+
+
+def test_codec_roundtrip_on_all_backends():
+    """Compact and pretty output decode to the same data and keep non-ASCII text"""
+    print("🧪 Testing JSON codec backends")
+
+    backends = _backends()
+    assert "json" in backends
+    for name, (dumps, dumps_bytes, dump, loads, load) in backends.items():
+        compact = dumps(SAMPLE)
+        assert ": " not in compact and ", " not in compact, f"{name} compact output has spaces"
+        assert "Åström" in compact
+        assert loads(compact) == SAMPLE
+        assert loads(dumps_bytes(SAMPLE)) == SAMPLE
+        assert loads(memoryview(dumps_bytes(SAMPLE))) == SAMPLE
+
+        assert dumps(SAMPLE, pretty=True) == json.dumps(SAMPLE, indent=2, ensure_ascii=False), f"{name} pretty layout differs"
+        assert dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+        assert loads(dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+        text, binary = io.StringIO(), io.BytesIO()
+        binary.mode = 'wb'
+        dump(SAMPLE, text)
+        dump(SAMPLE, binary)
+        assert load(io.StringIO(text.getvalue())) == load(io.BytesIO(binary.getvalue())) == SAMPLE
+
+        for bad in (b'{"data": [', b'{"a": "\xff"}'):
+            try:
+                loads(bad)
+                assert False, f"{name} should reject {bad!r}"
+            except json.JSONDecodeError:
+                pass
+        print(f"✅ {name} backend round trips")
+
+
+if __name__ == "__main__":
+    test_codec_roundtrip_on_all_backends()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the byte-offset record index used by lazy batch loading
+"""
+
+import sys
+import os
+import json
+import tempfile
+import shutil
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_stream
+from json_stream import RecordIndex, RecordIndexCache, iter_record_spans
+
+
+def _write_json(directory, name, data, indent=2):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    return path
+
+
+def test_record_spans_match_json_load():
+    """Offsets found by the scanner decode to exactly the records json.load sees"""
+    print("🧪 Testing record spans against json.load")
+
+    records = [
+        {"person": {"customerId": f"C{i:03d}", "firstName": "ÅSA", "note": 'brace } and "quote" [x]'}}
+        for i in range(25)
+    ]
+    document = {"meta": {"data": ["not", "this"]}, "data": records, "trailer": True}
+
+    for indent in (None, 2):
+        raw = json.dumps(document, indent=indent, ensure_ascii=False).encode('utf-8')
+        spans = list(iter_record_spans(raw, "data"))
+        decoded = [json.loads(raw[start:end]) for start, end in spans]
+        assert decoded == records, f"Mismatch with indent={indent}"
+
+    assert list(iter_record_spans(b'{"households": []}', "households")) == []
+    assert list(iter_record_spans(b'{"other": [1, 2]}', "data")) == []
+    print("✅ Record spans decode to the original records")
+
+
+def test_index_reads_batch_slices_and_sidecar():
+    """Batches read through the index equal slices of the full array; sidecar is reused until the file changes"""
+    print("🧪 Testing RecordIndex slices and sidecar reuse")
+
+    test_dir = tempfile.mkdtemp(prefix="test_json_stream_")
+    try:
+        records = [{"householdId": f"H{i}", "members": [{"id": i}]} for i in range(103)]
+        path = _write_json(test_dir, "households.json", {"households": records})
+
+        cache = RecordIndexCache("households")
+        index = cache.get(path)
+        assert len(index) == 103
+        for start in range(0, 103, 10):
+            assert index.read_records(start, start + 10) == records[start:start + 10]
+
+        sidecar = RecordIndexCache.sidecar_path(path)
+        assert os.path.exists(sidecar), "Sidecar index was not written"
+        reloaded = RecordIndex.load(path, "households", sidecar)
+        assert reloaded is not None and list(reloaded.offsets) == list(index.offsets)
+
+        # Rewriting the source invalidates the sidecar (size/mtime key)
+        _write_json(test_dir, "households.json", {"households": records[:5]}, indent=None)
+        os.utime(path, ns=(index.mtime_ns + 10**9, index.mtime_ns + 10**9))
+        assert RecordIndex.load(path, "households", sidecar) is None
+        assert len(cache.get(path)) == 5
+        print("✅ Index slices, sidecar reuse and invalidation work")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_streaming_record_count():
+    """Index counts agree with len(json.load(...)[key]), tolerate missing keys and reject broken files"""
+    print("🧪 Testing streaming record counter")
+
+    test_dir = tempfile.mkdtemp(prefix="test_json_stream_")
+    try:
+        records = [{"person": {"customerId": str(i), "tags": [[], {}, "]"]}} for i in range(71)]
+        path = _write_json(test_dir, "customers.json", {"data": records})
+        assert RecordIndexCache("data", use_sidecar=False).count(path) == 71
+        assert RecordIndexCache("households", use_sidecar=False).count(path) == 0
+
+        broken = os.path.join(test_dir, "broken.json")
+        with open(broken, 'w', encoding='utf-8') as f:
+            f.write('{"data": [{"a": 1}, ')
+        try:
+            RecordIndex.build(broken, "data")
+            assert False, "Truncated file should not count cleanly"
+        except ValueError:
+            pass
+
+        # Bad UTF-8 inside a string passes the syntax scan; opt-in validation decodes every record
+        bad_utf8 = os.path.join(test_dir, "bad_utf8.json")
+        with open(bad_utf8, 'wb') as f:
+            f.write(b'{"data": [{"a": "ok"}, {"a": "\xff"}]}')
+        assert len(RecordIndex.build(bad_utf8, "data")) == 2
+        try:
+            RecordIndex.build(bad_utf8, "data", validate=True)
+            assert False, "Validation should reject the record"
+        except ValueError:
+            pass
+        print("✅ Streaming counter works")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_scan_window_boundaries():
+    """Records that straddle or exceed the scan window are found exactly"""
+    print("🧪 Testing scan window boundaries")
+
+    records = [{"id": i, "name": "Å" * (i % 7), "blob": "x" * (i * 13 % 150), "n": i * 1.5} for i in range(120)]
+    records += [12345, "tail", None]
+    original_window = json_stream.SCAN_WINDOW
+    try:
+        for window in (16, 64, 257):
+            json_stream.SCAN_WINDOW = window
+            for indent in (None, 2):
+                raw = json.dumps({"data": records}, indent=indent, ensure_ascii=False).encode('utf-8')
+                decoded = [json.loads(raw[start:end]) for start, end in iter_record_spans(raw, "data")]
+                assert decoded == records, f"Mismatch with window={window}, indent={indent}"
+    finally:
+        json_stream.SCAN_WINDOW = original_window
+    print("✅ Window boundaries handled")
+
+
+def test_count_builds_index_once():
+    """Counting a file builds and caches its index and sidecar; malformed records fail the count"""
+    print("🧪 Testing count through the record index")
+
+    test_dir = tempfile.mkdtemp(prefix="test_json_stream_")
+    original_build = RecordIndex.__dict__['build']
+    builds = []
+
+    def counting_build(file_path, data_key, validate=False):
+        assert not validate, "Planning must not decode records"
+        builds.append(file_path)
+        return original_build.__func__(RecordIndex, file_path, data_key, validate)
+
+    RecordIndex.build = staticmethod(counting_build)
+    try:
+        records = [{"person": {"customerId": str(i)}} for i in range(40)]
+        path = _write_json(test_dir, "customers.json", {"data": records})
+        cache = RecordIndexCache("data")
+        assert cache.count(path) == 40
+        assert os.path.exists(RecordIndexCache.sidecar_path(path)), "Counting writes the sidecar"
+        assert cache.get(path).read_records(30, 40) == records[30:]
+        assert builds == [path], "The file must be scanned only once"
+
+        # A new cache reuses the sidecar instead of scanning again
+        assert RecordIndexCache("data").count(path) == 40
+        assert builds == [path]
+
+        for name, content in (("invalid.json", '{"data": [{"a": 1}, {"a": tru}]}'),
+                              ("empty.json", '')):
+            bad = os.path.join(test_dir, name)
+            with open(bad, 'w', encoding='utf-8') as f:
+                f.write(content)
+            try:
+                cache.count(bad)
+                assert False, f"{name} should not count cleanly"
+            except ValueError:
+                pass
+        print("✅ One scan per file, sidecar written, malformed JSON reported while planning")
+    finally:
+        RecordIndex.build = original_build
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_record_spans_match_json_load()
+    test_index_reads_batch_slices_and_sidecar()
+    test_streaming_record_count()
+    test_scan_window_boundaries()
+    test_count_builds_index_once()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
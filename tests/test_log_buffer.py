@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the bounded GUI log panes and their on-disk session logs
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_buffer import LogRingBuffer
+
+
+def test_ring_buffer_spills_to_disk():
+    """Only the newest entries stay in memory; older ones are read back, searched and saved from disk"""
+    print("🧪 Testing log ring buffer")
+
+    test_dir = tempfile.mkdtemp(prefix="test_log_buffer_")
+    try:
+        buffer = LogRingBuffer(os.path.join(test_dir, "gui_logs", "import_log.txt"), max_entries=3)
+        assert not buffer.has_older and buffer.search("anything") == ([], False)
+
+        evicted = []
+        for i in range(10):
+            evicted.extend(buffer.append(f"[12:00:{i:02d}] entry {i} ✅\nsecond line {i}\n"))
+        assert [text for text, _ in buffer.entries] == [f"[12:00:{i:02d}] entry {i} ✅\nsecond line {i}\n" for i in (7, 8, 9)]
+        assert evicted[0].startswith("[12:00:00]") and len(evicted) == 7
+        assert buffer.has_older
+
+        # Older entries come back from disk in pages that start at a whole line
+        older, start = buffer.read_older()
+        assert older.startswith("[12:00:00]") and older.endswith("second line 6\n") and start == 0
+        page, page_start = buffer.read_older(max_bytes=40)
+        assert page.endswith("second line 6\n") and page_start > 0
+        assert older.endswith(page)
+
+        matches, truncated = buffer.search("ENTRY 1")
+        assert matches == ["[12:00:01] entry 1 ✅"] and not truncated
+        matches, truncated = buffer.search("second", max_matches=4)
+        assert len(matches) == 4 and truncated
+
+        saved = os.path.join(test_dir, "saved.txt")
+        buffer.copy_to(saved)
+        with open(saved, 'r', encoding='utf-8') as f:
+            assert f.read() == "".join(f"[12:00:{i:02d}] entry {i} ✅\nsecond line {i}\n" for i in range(10))
+
+        # Clearing starts a new view; the session file keeps everything
+        buffer.clear()
+        buffer.append("after clear\n")
+        buffer.copy_to(saved)
+        with open(saved, 'r', encoding='utf-8') as f:
+            assert f.read() == "after clear\n"
+        assert not buffer.has_older and buffer.search("entry") == ([], False)
+        buffer.close()
+        assert os.path.getsize(buffer.path) == buffer.size
+        print("✅ Bounded memory, older entries paged, searched and saved from disk")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_ring_buffer_spills_to_disk()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
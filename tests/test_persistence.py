@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the write-behind persistence stage
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import shutil
+import threading
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from persistence import PersistenceWriter
+
+
+def test_writes_in_background_and_on_close():
+    """Queued artifacts all land on disk by close(); synchronous when not started"""
+    print("🧪 Testing write-behind persistence")
+
+    test_dir = tempfile.mkdtemp(prefix="test_persistence_")
+    try:
+        writer = PersistenceWriter(max_queue=8)
+
+        # Not started - written immediately in the caller
+        sync_path = os.path.join(test_dir, "sync", "a.json")
+        writer.write_json(sync_path, {"a": 1})
+        assert os.path.exists(sync_path)
+
+        writer.start()
+        for i in range(50):
+            writer.write_json(os.path.join(test_dir, "run", f"batch_{i:03d}.json"), {"data": [i]})
+        calls = []
+        writer.call(calls.append, "done")
+        writer.write_json(os.path.join(test_dir, "bad\0name.json"), {}, error_message="[TEST] expected failure")
+        stats = writer.close()
+
+        assert calls == ["done"]
+        assert stats['written'] == 51 and stats['errors'] == 1
+        with open(os.path.join(test_dir, "run", "batch_049.json"), 'r', encoding='utf-8') as f:
+            assert json.load(f) == {"data": [49]}
+        assert not writer.running
+        print("✅ All artifacts written, errors counted")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_full_queue_applies_backpressure():
+    """Producers block once max_queue jobs are waiting"""
+    print("🧪 Testing persistence backpressure")
+
+    writer = PersistenceWriter(max_queue=2, drain_batch=1)
+    gate = threading.Event()
+    writer.start()
+    writer.call(gate.wait)       # Occupies the writer thread
+    time.sleep(0.05)
+    writer.call(lambda: None)
+    writer.call(lambda: None)    # Queue is now full
+
+    producer = threading.Thread(target=writer.call, args=(lambda: None,))
+    producer.start()
+    producer.join(timeout=0.2)
+    assert producer.is_alive(), "Producer should block while the queue is full"
+
+    gate.set()
+    producer.join(timeout=2)
+    assert not producer.is_alive()
+    writer.close()
+    print("✅ Full queue blocks producers until the writer catches up")
+
+
+if __name__ == "__main__":
+    test_writes_in_background_and_on_close()
+    test_full_queue_applies_backpressure()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script to verify coalesced progress snapshots between the importer and the GUI
+"""
+
+import sys
+import os
+import time
+import tempfile
+import shutil
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_stream import ProgressStream
+from bulk_import_multithreaded import BulkCustomerImporter
+
+
+def test_snapshot_aggregation_and_caps():
+    """Events are counted per interval; state events always pass, per-batch details are opt-in and capped"""
+    print("🧪 Testing progress snapshot aggregation")
+
+    published = []
+    stream = ProgressStream(published.append, status_provider=lambda: {'completed_batches': 7},
+                            interval=10.0, include_details=False, error_limit=2)
+    for batch_id in range(50):
+        stream.record({'type': 'batch_success', 'batch_id': batch_id, 'customers_count': 10, 'failed_customers_count': 1})
+    for batch_id in range(3):
+        stream.record({'type': 'batch_error', 'batch_id': batch_id, 'status_code': 500, 'error_summary': 'boom'})
+    stream.record({'type': 'circuit_state', 'circuit_state': 'open'})
+    stream.flush()
+
+    snapshot = published[-1]
+    assert snapshot['type'] == 'progress_snapshot' and snapshot['sequence'] == 1
+    assert snapshot['counts'] == {'batch_success': 50, 'batch_error': 3, 'circuit_state': 1}
+    assert snapshot['customers_sent'] == 500 and snapshot['new_failed_customers'] == 50
+    assert [error['batch_id'] for error in snapshot['latest_errors']] == [0, 1], "Errors are capped"
+    assert [event['type'] for event in snapshot['events']] == ['circuit_state']
+    assert snapshot['details'] == [] and snapshot['details_dropped'] == 0, "Details are opt-in"
+    assert snapshot['status'] == {'completed_batches': 7}
+    assert snapshot['rates']['customers_per_minute'] > 0
+
+    # The next interval starts empty, totals keep going
+    stream.flush()
+    assert published[-1]['counts'] == {} and published[-1]['totals']['batch_success'] == 50
+
+    detailed = ProgressStream(published.append, interval=10.0, include_details=True, detail_limit=5)
+    for batch_id in range(12):
+        detailed.record({'type': 'batch_success', 'batch_id': batch_id, 'customers_count': 1})
+    snapshot = detailed.snapshot()
+    assert [detail['batch_id'] for detail in snapshot['details']] == [0, 1, 2, 3, 4]
+    assert snapshot['details_dropped'] == 7
+    print("✅ Snapshots aggregate counts, cap errors and details, forward state events")
+
+
+def test_importer_publishes_snapshots():
+    """With progress_interval the callback gets snapshots instead of one call per batch"""
+    print("🧪 Testing importer progress snapshots")
+
+    test_dir = tempfile.mkdtemp(prefix="test_progress_stream_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        events = []
+        importer = BulkCustomerImporter(
+            api_url="http://127.0.0.1:9/unused",
+            auth_token="test",
+            batch_size=10,
+            max_workers=1,
+            delay_between_requests=0,
+            prewarm_connections=False,
+            write_behind=False,
+            progress_callback=events.append,
+            progress_interval=0.05
+        )
+
+        class FakeResponse:
+            status_code = 200
+            headers = {}
+            content = b'{"data": []}'
+
+        importer._post_batch = lambda headers, body: FakeResponse()
+        importer.total_batches = 20
+        importer.progress_stream.start()
+        for batch_id in range(1, 21):
+            assert importer.send_batch([{"person": {"customerId": f"C{batch_id}"}}], batch_id)['status'] == 'success'
+        importer._save_failed_customers([{"customerId": "C3"}])
+        time.sleep(0.15)
+        importer.progress_stream.stop()
+
+        assert events and all(event['type'] == 'progress_snapshot' for event in events)
+        assert len(events) < 20, "Events must be coalesced"
+        assert sum(event['counts'].get('batch_success', 0) for event in events) == 20
+        final = events[-1]['status']
+        assert final['completed_batches'] == 20 and final['total_batches'] == 20
+        assert final['failed_customers_cursor'] == 1
+
+        # Once the stream is stopped events go straight to the callback again
+        importer._emit_progress({'type': 'retry_files_created'})
+        assert events[-1] == {'type': 'retry_files_created'}
+        print(f"✅ 20 batches reported in {len(events) - 1} snapshots")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_snapshot_aggregation_and_caps()
+    test_importer_publishes_snapshots()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the segmented, compressed API response archive
+"""
+
+import sys
+import os
+import gzip
+import json
+import tempfile
+import shutil
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_archive import ResponseArchive, ResponseArchiveReader, ResponsePersistencePolicy
+
+
+def test_archive_roundtrip_and_rolling():
+    """Responses are readable by batch id, reference and full scan across segments"""
+    print("🧪 Testing response archive round trip")
+
+    test_dir = tempfile.mkdtemp(prefix="test_response_archive_")
+    try:
+        archive = ResponseArchive(test_dir, run_name="run_test", segment_max_bytes=300)
+        for batch_id in range(1, 1201):
+            record = {'batch_id': batch_id, 'response_data': {'data': [{'customerId': str(batch_id), 'result': 'CREATED'}]}}
+            archive.append(batch_id, record, "success", 200)
+        archive.append(7, {'batch_id': 7, 'response_data': {'retry': True}}, "error", 500)
+        archive.close()
+
+        segments = sorted(n for n in os.listdir(archive.run_dir) if n.endswith(".jsonl.gz"))
+        assert len(segments) > 1, "Small segment size should roll over to new segments"
+
+        reader = ResponseArchiveReader.latest(test_dir)
+        assert reader.run_name == "run_test"
+        assert len(reader.entries) == 1201
+        assert reader.get(1000)['response_data']['data'][0]['customerId'] == "1000"
+        assert reader.get(7)['response_data'] == {'retry': True}, "Latest attempt wins"
+        assert reader.get(7, "success")['batch_id'] == 7
+        assert reader.get(5000) is None
+
+        reference = archive.reference(1150)
+        assert reference == "run_test/batch_01150_success"
+        assert reader.read_reference(reference)['batch_id'] == 1150
+
+        assert sum(1 for _ in reader.iter_records()) == 1201
+
+        # Each segment is an ordinary gzip stream as a whole
+        with gzip.open(os.path.join(archive.run_dir, segments[0]), 'rt', encoding='utf-8') as f:
+            assert json.loads(f.readline())['batch_id'] == 1
+        print("✅ Index lookups, references and segment scans agree")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_reader_ignores_partial_index_line():
+    """A run that is still writing can be read up to its last complete entry"""
+    print("🧪 Testing reader on a partially written index")
+
+    test_dir = tempfile.mkdtemp(prefix="test_response_archive_")
+    try:
+        archive = ResponseArchive(test_dir, run_name="run_partial")
+        archive.append(1, {'batch_id': 1}, "success", 200)
+        archive.close()
+        with open(os.path.join(archive.run_dir, "index.jsonl"), 'a', encoding='utf-8') as f:
+            f.write('{"batch_id": 2, "segm')
+
+        reader = ResponseArchiveReader(archive.run_dir)
+        assert [e['batch_id'] for e in reader.entries] == [1]
+        assert ResponseArchiveReader.list_runs(os.path.join(test_dir, "missing")) == []
+        print("✅ Torn index line is ignored")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_persistence_policy():
+    """Failures are always kept; clean successes follow the mode and a stable sample"""
+    print("🧪 Testing response persistence policy")
+
+    failures_only = ResponsePersistencePolicy("failures")
+    assert failures_only.should_keep(1, 500, data_size=10)
+    assert failures_only.should_keep(2, 200, failure_count=3, data_size=10)
+    assert failures_only.should_keep(3, 200, parsed=False, data_size=10)
+    assert not failures_only.should_keep(4, 200, data_size=1000)
+    assert (failures_only.kept, failures_only.skipped, failures_only.skipped_bytes) == (3, 1, 1000)
+
+    sampled = ResponsePersistencePolicy("sampled", sample_rate=0.1)
+    kept = [batch_id for batch_id in range(1, 10001) if sampled.should_keep(batch_id, 200)]
+    assert 800 <= len(kept) <= 1200, f"Expected ~10% sampled, got {len(kept)}"
+    again = ResponsePersistencePolicy("sampled", sample_rate=0.1)
+    assert kept == [batch_id for batch_id in range(1, 10001) if again.should_keep(batch_id, 200)]
+
+    assert all(ResponsePersistencePolicy("all").should_keep(i, 200) for i in range(100))
+    try:
+        ResponsePersistencePolicy("none")
+        assert False, "Unknown mode should be rejected"
+    except ValueError:
+        pass
+    print("✅ Policy keeps failures, samples deterministically and counts skipped bytes")
+
+
+if __name__ == "__main__":
+    test_archive_roundtrip_and_rolling()
+    test_reader_ignores_partial_index_line()
+    test_persistence_policy()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
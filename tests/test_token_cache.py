@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the on-disk token cache shared by authentication managers
+"""
+
+import sys
+import os
+import stat
+import time
+import tempfile
+import shutil
+import threading
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth_manager import AuthenticationManager
+from token_cache import TokenCache
+
+
+class FakeAuthServer:
+    """Stands in for the token endpoint and counts token requests; optionally failing"""
+
+    def __init__(self, expires_in=3600, delay=0.0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.fail = False
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        with self.lock:
+            self.requests += 1
+            token = f"token-{self.requests}"
+        time.sleep(self.delay)
+        server = self
+
+        class Response:
+            status_code = 503 if server.fail else 200
+            text = "Service Unavailable" if server.fail else ""
+
+            def json(self):
+                return {'access_token': token, 'expires_in': server.expires_in}
+
+        return Response()
+
+
+def _manager(server, cache_path, username="importer", password="secret", client_id=None):
+    return AuthenticationManager(mode="Engage", environment="dev", username=username, password=password,
+                                 client_id=client_id, session_provider=lambda: server, token_cache=True,
+                                 token_cache_path=cache_path)
+
+
+def test_token_reused_across_managers():
+    """A second manager (a new run) reuses the cached token; other credentials get their own"""
+    print("🧪 Testing token reuse across runs")
+
+    cache_dir = tempfile.mkdtemp(prefix="test_token_cache_")
+    try:
+        cache_path = os.path.join(cache_dir, "cache", "token_cache.json")
+        server = FakeAuthServer()
+
+        assert _manager(server, cache_path).get_valid_token() == "token-1"
+        assert _manager(server, cache_path).get_valid_token() == "token-1"
+        assert server.requests == 1, "Warm restart should not request a new token"
+        assert _manager(server, cache_path, username="other").get_valid_token() == "token-2"
+        # Other credentials for the same user, or another client, never get the cached token
+        assert _manager(server, cache_path, password="changed").get_valid_token() == "token-3"
+        assert _manager(server, cache_path, client_id="other-client").get_valid_token() == "token-4"
+        assert _manager(server, cache_path).get_valid_token() == "token-1"
+
+        if os.name == "posix":
+            assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+            # A cache other users can read is not trusted
+            os.chmod(cache_path, 0o644)
+            assert _manager(server, cache_path).get_valid_token() == "token-5"
+            assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+        manager = _manager(server, cache_path)
+        manager.force_refresh()
+        assert manager.current_token == f"token-{server.requests}"
+        assert _manager(server, cache_path).get_valid_token() == manager.current_token
+        print("✅ Cached token reused, keyed by credentials, owner-only file")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def test_expiry_and_single_flight():
+    """Tokens inside the refresh buffer are not reused; parallel managers wait for one refresh"""
+    print("🧪 Testing cache expiry and single-flight refresh")
+
+    cache_dir = tempfile.mkdtemp(prefix="test_token_cache_")
+    try:
+        cache_path = os.path.join(cache_dir, "token_cache.json")
+
+        # expires_in shorter than the refresh buffer - never good enough to reuse
+        short = FakeAuthServer(expires_in=60)
+        _manager(short, cache_path).get_valid_token()
+        _manager(short, cache_path).get_valid_token()
+        assert short.requests == 2
+
+        server = FakeAuthServer(delay=0.2)
+        key = _manager(server, cache_path, "parallel").token_cache_key
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(_manager(server, cache_path, "parallel").get_valid_token()))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert server.requests == 1, f"Expected one token request, got {server.requests}"
+        assert tokens == ["token-1"] * 4
+        assert TokenCache(cache_path).get(key)['access_token'] == "token-1"
+
+        # Another process holds the lock too long - refresh without reading or writing the cache
+        manager = _manager(server, cache_path, "busy")
+        manager.token_cache.lock_timeout = 0.2
+        with TokenCache(cache_path).locked() as held:
+            assert held
+            assert manager.get_valid_token() == "token-2"
+        assert TokenCache(cache_path).get(manager.token_cache_key) is None, "Cache written without the lock"
+        print("✅ Short-lived tokens refreshed, parallel managers shared one request, busy lock bypassed")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def test_rejected_token_dropped():
+    """A forced refresh removes the rejected token from the cache, but adopts a newer one"""
+    print("🧪 Testing rejected token removal")
+
+    cache_dir = tempfile.mkdtemp(prefix="test_token_cache_")
+    try:
+        cache_path = os.path.join(cache_dir, "token_cache.json")
+        server = FakeAuthServer()
+        stale = _manager(server, cache_path)
+        assert stale.get_valid_token() == "token-1"
+
+        # Another run already replaced the rejected token - no new request
+        fresh = _manager(server, cache_path)
+        fresh.force_refresh()
+        assert fresh.current_token == "token-2"
+        stale.force_refresh(rejected_token="token-1")
+        assert stale.current_token == "token-2" and server.requests == 2
+
+        # The refresh fails - the rejected token must not stay cached for the next run
+        server.fail = True
+        try:
+            stale.force_refresh()
+            assert False, "Refresh should have failed"
+        except Exception as e:
+            assert "503" in str(e)
+        assert TokenCache(cache_path).get(stale.token_cache_key) is None, "Rejected token still cached"
+
+        # Removal only drops the entry while it still holds the given token
+        cache = TokenCache(cache_path)
+        cache.put(stale.token_cache_key, "token-9", time.time() + 3600)
+        cache.remove(stale.token_cache_key, access_token="token-1")
+        assert cache.get(stale.token_cache_key)['access_token'] == "token-9"
+        print("✅ Rejected token removed from the cache, newer cached token reused")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_token_reused_across_managers()
+    test_expiry_and_single_flight()
+    test_rejected_token_dropped()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
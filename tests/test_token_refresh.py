@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test script to verify background token refresh and lock-free token reads
+"""
+
+import sys
+import os
+import time
+import tempfile
+import shutil
+import threading
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth_manager import AuthenticationManager
+from bulk_import_multithreaded import BulkCustomerImporter
+
+
+class FakeAuthServer:
+    """Stands in for the token endpoint; slow and optionally failing"""
+
+    def __init__(self, expires_in=3600, delay=0.0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.fail = False
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        with self.lock:
+            self.requests += 1
+            token = f"token-{self.requests}"
+        time.sleep(self.delay)
+        server = self
+
+        class Response:
+            status_code = 503 if server.fail else 200
+            text = "Service Unavailable" if server.fail else ""
+
+            def json(self):
+                return {'access_token': token, 'expires_in': server.expires_in}
+
+        return Response()
+
+
+def _manager(server):
+    return AuthenticationManager(mode="Engage", environment="dev", username="importer", password="secret",
+                                 session_provider=lambda: server)
+
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+def test_readers_never_wait_for_background_refresh():
+    """While the refresher renews the token, readers keep getting the current one at once"""
+    print("🧪 Testing background token refresh")
+
+    server = FakeAuthServer()
+    manager = _manager(server)
+    assert manager.get_valid_token() == "token-1"
+
+    # The token is now due for renewal but still valid for an hour
+    manager.refresh_buffer_seconds = 3700
+    manager.refresh_retry_seconds = 0.3
+    server.delay = 0.5
+    manager.start_background_refresh()
+    try:
+        _wait_for(lambda: server.requests == 2)
+        assert manager.token_lock.locked(), "The refresh should be in flight"
+        started = time.monotonic()
+        tokens = [manager.get_valid_token() for _ in range(100)]
+        assert time.monotonic() - started < 0.1, "Readers must not wait for the refresh"
+        assert tokens == ["token-1"] * 100, "The old token stays in use until the new one lands"
+
+        _wait_for(lambda: manager.current_token == "token-2")
+        assert manager.get_valid_token() == "token-2"
+
+        # A failed refresh keeps the current token and is retried later, not in a loop
+        server.fail = True
+        server.delay = 0
+        _wait_for(lambda: manager.last_refresh_error is not None)
+        assert manager.get_valid_token() == "token-2"
+        assert manager.get_token_info()['background_refresh']
+        requests_after_failure = server.requests
+        time.sleep(0.1)
+        assert server.requests == requests_after_failure, "Retries wait refresh_retry_seconds"
+
+        server.fail = False
+        _wait_for(lambda: manager.last_refresh_error is None and manager.current_token != "token-2")
+    finally:
+        manager.stop_background_refresh()
+    assert not manager.background_refresh_running
+    print("✅ Token renewed in the background, readers never blocked, failures retried")
+
+
+def test_single_flight_without_token():
+    """Without a usable token, parallel readers share one refresh"""
+    print("🧪 Testing single-flight refresh")
+
+    server = FakeAuthServer(delay=0.2)
+    manager = _manager(server)
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(manager.get_valid_token())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.requests == 1, f"Expected one token request, got {server.requests}"
+    assert tokens == ["token-1"] * 8
+
+    # A rejected token is dropped at once; readers wait for its replacement
+    manager.force_refresh()
+    assert manager.get_valid_token() == "token-2" and server.requests == 2
+    print("✅ One token request for all waiting readers")
+
+
+
+def test_importer_renews_rejected_token():
+    """On HTTP 401 the importer renews the token once and repeats the attempt"""
+    print("🧪 Testing token renewal after HTTP 401")
+
+    test_dir = tempfile.mkdtemp(prefix="test_token_refresh_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        importer = BulkCustomerImporter(
+            api_url="http://127.0.0.1:9/unused",
+            auth_url="http://127.0.0.1:9/token",
+            username="importer",
+            password="secret",
+            use_auto_auth=True,
+            batch_size=10,
+            max_workers=1,
+            delay_between_requests=0,
+            prewarm_connections=False,
+            write_behind=False
+        )
+        server = FakeAuthServer()
+        importer.auth_manager.session_provider = lambda: server
+        rejected = {"Bearer token-1"}
+        sent_with = []
+
+        class FakeResponse:
+            headers = {}
+
+            def __init__(self, status_code):
+                self.status_code = status_code
+                self.content = b'{"data": []}' if status_code == 200 else b'{"error": "invalid token"}'
+
+        def fake_post(headers, body):
+            sent_with.append(headers['Authorization'])
+            return FakeResponse(401 if headers['Authorization'] in rejected else 200)
+
+        importer._post_batch = fake_post
+        batch = [{"person": {"customerId": "C1"}}]
+        assert importer.send_batch(batch, 1)['status'] == 'success'
+        assert sent_with == ["Bearer token-1", "Bearer token-2"] and server.requests == 2
+
+        # A token that is rejected again is not renewed in a loop
+        rejected.update({"Bearer token-3", "Bearer token-4"})
+        importer.auth_manager.force_refresh()
+        sent_with.clear()
+        result = importer.send_batch(batch, 2)
+        assert result['status'] == 'failed' and result['status_code'] == 401
+        assert sent_with == ["Bearer token-3", "Bearer token-4"] and server.requests == 4
+        importer.close_http_sessions()
+        print("✅ Rejected token renewed once, the attempt repeated with the new one")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_readers_never_wait_for_background_refresh()
+    test_single_flight_without_token()
+    test_importer_renews_rejected_token()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the bounded dispatch window in import_customers
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import shutil
+import threading
+
+# Add parent directory to path to import the project modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulk_import_multithreaded import BulkCustomerImporter
+
+
+def _make_importer(test_dir, **kwargs):
+    importer = BulkCustomerImporter(
+        api_url="http://127.0.0.1:9/unused",
+        auth_token="test",
+        batch_size=10,
+        max_workers=2,
+        delay_between_requests=0,
+        prewarm_connections=False,
+        **kwargs
+    )
+    return importer
+
+
+def _write_source(test_dir, count):
+    path = os.path.join(test_dir, "customers.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"data": [{"person": {"customerId": f"C{i}"}} for i in range(count)]}, f)
+    return path
+
+
+def test_window_bounds_outstanding_batches():
+    """Never more than dispatch_window batches are submitted but unfinished"""
+    print("🧪 Testing dispatch window bound")
+
+    test_dir = tempfile.mkdtemp(prefix="test_dispatch_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        source = _write_source(test_dir, 200)
+        importer = _make_importer(test_dir, dispatch_window=3)
+
+        # remaining_batches holds exactly the dispatched, unfinished batches
+        observed = []
+        lock = threading.Lock()
+
+        def fake_send(lazy_batch, batch_id, prepared=None):
+            with lock:
+                observed.append(len(importer.remaining_batches))
+            time.sleep(0.01)
+            return {'batch_id': batch_id, 'status': 'success', 'customers_count': lazy_batch['expected_size']}
+
+        importer.send_lazy_batch = fake_send
+        summary = importer.import_customers([source])
+
+        assert summary['total_batches'] == 20
+        assert summary['successful_customers'] == 200
+        assert max(observed) <= 3, f"Window exceeded: {max(observed)}"
+        assert len(importer.remaining_batches) == 0
+        print("✅ Outstanding batches stay within the window")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_stop_saves_undispatched_batches():
+    """Stopping mid-run records every batch that was not sent"""
+    print("🧪 Testing stop with undispatched batches")
+
+    test_dir = tempfile.mkdtemp(prefix="test_dispatch_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        source = _write_source(test_dir, 300)
+        importer = _make_importer(test_dir, dispatch_window=2)
+        sent = []
+
+        def fake_send(lazy_batch, batch_id, prepared=None):
+            if importer.should_stop:
+                return {'batch_id': batch_id, 'status': 'stopped'}
+            sent.append(batch_id)
+            if len(sent) == 5:
+                importer.stop_import()
+            return {'batch_id': batch_id, 'status': 'success', 'customers_count': lazy_batch['expected_size']}
+
+        importer.send_lazy_batch = fake_send
+        summary = importer.import_customers([source])
+
+        assert summary['successful_batches'] == len(sent)
+        assert len(sent) + len(importer.remaining_batches) == 30
+        assert summary['total_batches'] == 30
+        print("✅ Remaining work covers every unsent batch")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_failed_batches_get_deferred_pass():
+    """Batches that exhaust their retries are retried after fresh work; only final failures are saved"""
+    print("🧪 Testing deferred retry pass")
+
+    test_dir = tempfile.mkdtemp(prefix="test_dispatch_")
+    previous_cwd = os.getcwd()
+    os.chdir(test_dir)
+    try:
+        source = _write_source(test_dir, 100)
+        importer = _make_importer(test_dir, max_retries=2, retry_base_delay=0.001,
+                                  deferred_retry_passes=1, deferred_retry_delay=0.05, circuit_breaker=False)
+        posted = []
+        lock = threading.Lock()
+
+        class FakeResponse:
+            def __init__(self, status_code, records):
+                self.status_code = status_code
+                self.headers = {}
+                self.content = json.dumps({"data": [{"customerId": r["person"]["customerId"], "result": "SUCCESS"}
+                                                    for r in records]}).encode() if status_code == 200 else b'{"error": "busy"}'
+
+        def fake_post(headers, body):
+            records = json.loads(body)["data"]
+            first = records[0]["person"]["customerId"]
+            with lock:
+                posted.append(first)
+                first_pass = first == "C30" and posted.count(first) <= 2
+            # Batch 4 recovers on its deferred pass, batch 7 never does
+            failing = first == "C60" or first_pass
+            return FakeResponse(503 if failing else 200, records)
+
+        importer._post_batch = fake_post
+        summary = importer.import_customers([source])
+
+        assert summary['successful_batches'] == 9 and summary['failed_batches'] == 1, summary
+        assert summary['deferred_retries'] == 2 and summary['recovered_by_deferred_retry'] == 1
+        # Deferred passes start only after every fresh batch was sent
+        fresh = ["C%d" % (i * 10) for i in range(10)]
+        first_deferred = [i for i, cid in enumerate(posted) if cid == "C30"][2]
+        assert all(posted.index(cid) < first_deferred for cid in fresh)
+        assert posted.count("C30") == 3 and posted.count("C60") == 4
+
+        nok_dirs = [d for d in os.listdir(importer.failed_items_dir) if d.startswith("response_nok_")]
+        nok_files = [f for d in nok_dirs for f in os.listdir(os.path.join(importer.failed_items_dir, d))]
+        assert nok_files == ["batch_00007_status_503.json"], nok_files
+        assert [b['batch_id'] for b in importer.failed_batches] == [7]
+        print("✅ Batch 4 recovered on its deferred pass, batch 7 saved as the only failure")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_window_bounds_outstanding_batches()
+    test_stop_saves_undispatched_batches()
+    test_failed_batches_get_deferred_pass()
+    print("\n🎯 TEST RESULT: ✅ SUCCESS")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Token cache for Bulk Customer Import
+Shares OAuth tokens between runs and processes through an owner-only JSON file
+"""
+
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+import logging
+import json_codec
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".customer_import", "token_cache.json")
+LOCK_SUFFIX = ".lock"
+
+
+class TokenCache:
+    """
+    File-backed OAuth token cache
+
+    Entries are keyed by a hash of mode, environment, auth_url, username, client_id and
+    the credential material (password, basic auth), so changed credentials never pick up
+    a token issued for the old ones. Each entry holds the access token with its absolute
+    expiry (epoch seconds). The file is replaced atomically and created owner-only
+    (0600, directory 0700); a cache file readable by other users is ignored. An
+    exclusive lock on a sidecar .lock file lets one process refresh while the others
+    wait (up to lock_timeout) and then reuse its token.
+    """
+
+    def __init__(self, path: Optional[str] = None, lock_timeout: float = 10.0):
+        """
+        Initialize the cache
+
+        Args:
+            path: Cache file (defaults to ~/.customer_import/token_cache.json)
+            lock_timeout: Seconds to wait for another process holding the lock
+        """
+        self.path = path or DEFAULT_CACHE_PATH
+        self.lock_path = self.path + LOCK_SUFFIX
+        self.lock_timeout = lock_timeout
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def make_key(mode: str, environment: str, auth_url: str, username: str,
+                 client_id: Optional[str] = None, password: Optional[str] = None,
+                 basic_auth: Optional[str] = None) -> str:
+        """
+        Cache key for one set of credentials (secrets only enter it as a hash)
+
+        Args:
+            mode, environment, auth_url, username, client_id: Token request identity
+            password, basic_auth: Credential material
+        """
+        secret_hash = hashlib.sha256(f"{password or ''}\0{basic_auth or ''}".encode('utf-8')).hexdigest()
+        raw = "|".join([mode or "", environment or "", auth_url or "", username or "", client_id or "", secret_hash])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+    def _ensure_dir(self) -> None:
+        directory = os.path.dirname(self.path) or "."
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    @contextmanager
+    def locked(self):
+        """
+        Hold the cross-process cache lock
+
+        Yields True when the lock was taken, False if it could not be taken within
+        lock_timeout; the caller then must not read or write the cache.
+        """
+        self._ensure_dir()
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        acquired = False
+        try:
+            deadline = time.monotonic() + self.lock_timeout
+            while True:
+                try:
+                    if fcntl:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    else:
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                    acquired = True
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        self.logger.warning(f"[TOKEN CACHE] Lock {self.lock_path} busy for {self.lock_timeout:g}s - bypassing the cache")
+                        break
+                    time.sleep(0.1)
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    if fcntl:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                    else:
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                except OSError:
+                    pass
+            os.close(fd)
+
+    def _read_all(self) -> Dict[str, Any]:
+        try:
+            if fcntl and os.stat(self.path).st_mode & 0o077:
+                self.logger.warning(f"[TOKEN CACHE] Ignoring {self.path} - it is accessible to other users")
+                return {}
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json_codec.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"[TOKEN CACHE] Could not read {self.path}: {e}")
+            return {}
+
+    def get(self, key: str, min_valid_seconds: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Cached entry for key if it stays valid for at least min_valid_seconds
+
+        Returns a dict with access_token and expires_at (epoch seconds), or None.
+        """
+        entry = self._read_all().get(key)
+        if not entry or not entry.get('access_token'):
+            return None
+        if entry.get('expires_at', 0) - time.time() <= min_valid_seconds:
+            return None
+        return entry
+
+    def _write_all(self, entries: Dict[str, Any]) -> None:
+        try:
+            self._ensure_dir()
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json_codec.dump(entries, f)
+            os.replace(tmp_path, self.path)
+            if fcntl:
+                os.chmod(self.path, 0o600)
+        except OSError as e:
+            self.logger.warning(f"[TOKEN CACHE] Could not write {self.path}: {e}")
+
+    def put(self, key: str, access_token: str, expires_at: float) -> None:
+        """Store a token (expired entries of other keys are dropped on the way)"""
+        now = time.time()
+        entries = {k: v for k, v in self._read_all().items() if v.get('expires_at', 0) > now}
+        entries[key] = {'access_token': access_token, 'expires_at': expires_at, 'saved_at': now}
+        self._write_all(entries)
+
+    def remove(self, key: str, access_token: Optional[str] = None) -> None:
+        """
+        Drop the entry for key (e.g. its token was rejected)
+
+        Args:
+            key: Cache key
+            access_token: Only drop the entry if it still holds this token
+        """
+        entries = self._read_all()
+        entry = entries.get(key)
+        if entry is None or (access_token and entry.get('access_token') != access_token):
+            return
+        del entries[key]
+        self._write_all(entries)
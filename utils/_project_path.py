@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Puts the project root on sys.path so the scripts in this folder can import the shared
+modules (e.g. json_codec) when run directly: python <folder>/<script>.py
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
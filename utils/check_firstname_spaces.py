@@ -4,12 +4,14 @@ Check for spaces in firstName fields across batch files.
 This script will scan all batch files and identify customers with spaces in their firstName.
 """
 
-import json
 import os
 import sys
 from datetime import datetime
 import glob
 
+import _project_path  # noqa: F401 - project root on sys.path for json_codec
+import json_codec
+
 def check_firstname_spaces(batch_dir="customer_batches", output_file="firstname_spaces_report.json"):
     """
     Check all batch files for firstName fields containing spaces.
@@ -53,7 +55,7 @@ def check_firstname_spaces(batch_dir="customer_batches", output_file="firstname_
     for batch_file in batch_files:
         try:
             with open(batch_file, 'r', encoding='utf-8') as f:
-                batch_data = json.load(f)
+                batch_data = json_codec.load(f)
             
             # Extract customers array
             if isinstance(batch_data, dict) and 'data' in batch_data:
@@ -136,7 +138,7 @@ def check_firstname_spaces(batch_dir="customer_batches", output_file="firstname_
     
     # Save report
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+        json_codec.dump(report, f, pretty=True)
     
     # Print summary
     print("\n" + "=" * 60)
@@ -4,11 +4,13 @@ Quick checker for spaces in firstName fields.
 This script provides immediate console output for quick verification.
 """
 
-import json
 import os
 import sys
 import glob
 
+import _project_path  # noqa: F401 - project root on sys.path for json_codec
+import json_codec
+
 def quick_check_firstname_spaces(batch_dir="customer_batches", max_examples=20):
     """
     Quick check for firstName fields containing spaces with console output.
@@ -46,7 +48,7 @@ def quick_check_firstname_spaces(batch_dir="customer_batches", max_examples=20):
     for batch_file in batch_files:
         try:
             with open(batch_file, 'r', encoding='utf-8') as f:
-                batch_data = json.load(f)
+                batch_data = json_codec.load(f)
             
             # Extract customers
             if isinstance(batch_data, dict) and 'data' in batch_data:
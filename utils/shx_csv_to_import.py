@@ -1,7 +1,10 @@
 import csv
-import json
+import sys
 from pathlib import Path
 
+import _project_path  # noqa: F401 - project root on sys.path for json_codec
+import json_codec
+
 SRC_CSV = Path("SHX_TestData_MemberHousehold_Krokek_4 more.csv")
 OUT_JSON = Path("batches_to_retry/batch_from_shx.json")
 
@@ -53,8 +56,8 @@ def main() -> None:
             })
 
     payload = {"data": data}
-    with OUT_JSON.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    with OUT_JSON.open("wb") as f:
+        json_codec.dump(payload, f, pretty="--pretty" in sys.argv[1:])
 
     print(f"Wrote {len(data)} records to {OUT_JSON}")
 
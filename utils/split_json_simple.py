@@ -4,12 +4,14 @@ Simple JSON splitter that reads the file in chunks to handle large files.
 This version uses only standard library and processes the file line by line.
 """
 
-import json
 import os
 import sys
 from datetime import datetime
 
-def split_json_simple(input_file, batch_size=100, output_dir="customer_batches"):
+import _project_path  # noqa: F401 - project root on sys.path for json_codec
+import json_codec
+
+def split_json_simple(input_file, batch_size=100, output_dir="customer_batches", pretty=False):
     """
     Split a large JSON file (customers or households) by reading it in chunks.
     Auto-detects format and preserves the data key.
@@ -61,7 +63,7 @@ def split_json_simple(input_file, batch_size=100, output_dir="customer_batches")
             if first_chars.strip().startswith('['):
                 # It's a JSON array
                 print("Detected JSON array format")
-                customers_data = json.load(f)
+                customers_data = json_codec.load(f)
                 input_key = 'array'
                 output_key = 'data'  # Default to 'data' for arrays
                 item_type = 'items'
@@ -69,7 +71,7 @@ def split_json_simple(input_file, batch_size=100, output_dir="customer_batches")
             elif '"households"' in first_chars:
                 # It's a households import file
                 print("Detected JSON object with 'households' key")
-                full_data = json.load(f)
+                full_data = json_codec.load(f)
                 customers_data = full_data.get('households')
                 input_key = 'households'
                 output_key = 'households'
@@ -79,7 +81,7 @@ def split_json_simple(input_file, batch_size=100, output_dir="customer_batches")
                 # It's a customers file with 'customers' key - needs conversion
                 print("Detected JSON object with 'customers' key")
                 print("Note: Converting 'customers' key to 'data' key for import compatibility")
-                full_data = json.load(f)
+                full_data = json_codec.load(f)
                 customers_data = full_data.get('customers')
                 input_key = 'customers'
                 output_key = 'data'  # Convert to 'data' for import system
@@ -88,7 +90,7 @@ def split_json_simple(input_file, batch_size=100, output_dir="customer_batches")
             elif '"data"' in first_chars:
                 # It's likely wrapped in a data object (customers)
                 print("Detected JSON object with 'data' key")
-                full_data = json.load(f)
+                full_data = json_codec.load(f)
                 customers_data = full_data.get('data', full_data)
                 input_key = 'data'
                 output_key = 'data'
@@ -97,7 +99,7 @@ def split_json_simple(input_file, batch_size=100, output_dir="customer_batches")
             else:
                 # Try to load as-is and detect
                 print("Attempting to parse as generic JSON object")
-                full_data = json.load(f)
+                full_data = json_codec.load(f)
                 
                 # Try to find the data array
                 if isinstance(full_data, list):
@@ -144,7 +146,7 @@ def split_json_simple(input_file, batch_size=100, output_dir="customer_batches")
             
             # When batch is full, save it
             if len(current_batch) >= batch_size:
-                save_batch_simple(current_batch, batch_num, output_dir, output_key)
+                save_batch_simple(current_batch, batch_num, output_dir, output_key, pretty)
                 print(f"Batch {batch_num:04d}: Saved {len(current_batch)} {item_type} (Total: {total_customers:,})")
                 
                 current_batch = []
@@ -157,7 +159,7 @@ def split_json_simple(input_file, batch_size=100, output_dir="customer_batches")
         
         # Save remaining items in the last batch
         if current_batch:
-            save_batch_simple(current_batch, batch_num, output_dir, output_key)
+            save_batch_simple(current_batch, batch_num, output_dir, output_key, pretty)
             print(f"Batch {batch_num:04d}: Saved {len(current_batch)} {item_type} (Final batch)")
         
         # Generate summary
@@ -185,7 +187,7 @@ def split_json_simple(input_file, batch_size=100, output_dir="customer_batches")
         print("3. Split the file manually into smaller chunks first")
         return False
         
-    except json.JSONDecodeError as e:
+    except json_codec.JSONDecodeError as e:
         print(f"\nERROR: Invalid JSON format: {str(e)}")
         print("The file might be corrupted or not in valid JSON format")
         return False
@@ -194,8 +196,8 @@ def split_json_simple(input_file, batch_size=100, output_dir="customer_batches")
         print(f"\nERROR: Failed to process file: {str(e)}")
         return False
 
-def save_batch_simple(customers, batch_num, output_dir, data_key='data'):
-    """Save a batch of customers/households to a JSON file"""
+def save_batch_simple(customers, batch_num, output_dir, data_key='data', pretty=False):
+    """Save a batch of customers/households to a JSON file (compact unless pretty)"""
     batch_data = {
         data_key: customers
     }
@@ -203,8 +205,8 @@ def save_batch_simple(customers, batch_num, output_dir, data_key='data'):
     filename = f"batch_{batch_num:04d}.json"
     filepath = os.path.join(output_dir, filename)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(batch_data, f, indent=2, ensure_ascii=False)
+    with open(filepath, 'wb') as f:
+        json_codec.dump(batch_data, f, pretty=pretty)
 
 def generate_summary_simple(output_dir, total_customers, total_batches, batch_size, data_key='data', item_type='items'):
     """Generate a summary file with statistics"""
@@ -227,20 +229,22 @@ def generate_summary_simple(output_dir, total_customers, total_batches, batch_si
     
     summary_file = os.path.join(output_dir, "split_summary.json")
     with open(summary_file, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+        json_codec.dump(summary, f, pretty=True)
 
 def main():
     """Main function with command line argument support"""
     if len(sys.argv) < 2:
-        print("Usage: python split_json_simple.py <input_file> [batch_size] [output_dir]")
+        print("Usage: python split_json_simple.py <input_file> [batch_size] [output_dir] [--pretty]")
         print("Example: python split_json_simple.py Output_new.json 100 customer_batches")
         return
     
-    input_file = sys.argv[1]
-    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else "customer_batches"
+    pretty = '--pretty' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != '--pretty']
+    input_file = args[0]
+    batch_size = int(args[1]) if len(args) > 1 else 100
+    output_dir = args[2] if len(args) > 2 else "customer_batches"
     
-    success = split_json_simple(input_file, batch_size, output_dir)
+    success = split_json_simple(input_file, batch_size, output_dir, pretty=pretty)
     
     if success:
         print(f"\n✅ Successfully split {input_file} into batches!")
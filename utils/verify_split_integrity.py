@@ -3,11 +3,13 @@
 Verify that all customers from the original JSON file are present in the split batch files
 """
 
-import json
 import os
 import glob
 from collections import defaultdict
 
+import _project_path  # noqa: F401 - project root on sys.path for json_codec
+import json_codec
+
 def verify_split_integrity(original_file, batch_directory):
     """
     Compare original file with split batch files to ensure data integrity
@@ -35,7 +37,7 @@ def verify_split_integrity(original_file, batch_directory):
         # Load original file
         print(f"📖 Loading original file...")
         with open(original_file, 'r', encoding='utf-8') as f:
-            original_data = json.load(f)
+            original_data = json_codec.load(f)
         
         if not isinstance(original_data, dict) or 'data' not in original_data:
             print(f"❌ Error: Original file has invalid structure")
@@ -63,7 +65,7 @@ def verify_split_integrity(original_file, batch_directory):
         for i, batch_file in enumerate(batch_files, 1):
             try:
                 with open(batch_file, 'r', encoding='utf-8') as f:
-                    batch_data = json.load(f)
+                    batch_data = json_codec.load(f)
                 
                 if not isinstance(batch_data, dict) or 'data' not in batch_data:
                     print(f"⚠️ Warning: Batch file '{batch_file}' has invalid structure")
@@ -182,7 +184,7 @@ def verify_split_integrity(original_file, batch_directory):
         }
         
         with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+            json_codec.dump(report_data, f, pretty=True)
         
         print(f"\n✅ VERIFICATION COMPLETED SUCCESSFULLY!")
         print(f"📄 Verification report saved: {report_file}")